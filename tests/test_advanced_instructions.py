@@ -187,6 +187,129 @@ def test_push_pop_instructions():
     print("✓ push/pop instruction test passed")
 
 
+def test_regs_only_taint_forward():
+    """测试关闭内存污点时的仅寄存器内核（结果应与完整内核的寄存器部分一致）"""
+    parser = TraceParser()
+
+    # 模拟trace:
+    # add r1, r0, #1  ; r0为污点源
+    # str r1, [r5]    ; 关闭内存污点：不标记内存
+    # ldr r2, [r5]    ; 不应从内存传播
+    # mov r1, #0      ; 立即数清洗
+    # add r3, r1, r4  ; r1已清洗，不应命中
+    # mov r6, r2      ; r2未从内存获得污点，不应命中
+
+    parser.events = [
+        create_mock_trace_event(1, 0x1000, "add r1, r0, #1", reads={'r0': 0x10}, writes={'r1': 0x11}),
+        create_mock_trace_event(2, 0x1004, "str r1, [r5]", reads={'r1': 0x11, 'r5': 0x8000}, writes={}),
+        create_mock_trace_event(3, 0x1008, "ldr r2, [r5]", reads={'r5': 0x8000}, writes={'r2': 0x11}),
+        create_mock_trace_event(4, 0x100C, "mov r1, #0", reads={}, writes={'r1': 0}),
+        create_mock_trace_event(5, 0x1010, "add r3, r1, r4", reads={'r1': 0, 'r4': 1}, writes={'r3': 1}),
+        create_mock_trace_event(6, 0x1014, "mov r6, r2", reads={'r2': 0x11}, writes={'r6': 0x11}),
+    ]
+    parser.events[1].effaddr = 0x8000
+    parser.events[2].effaddr = 0x8000
+
+    hits = parser.taint_forward(start_idx=0, source_regs=['r0'], enable_memory_taint=False)
+    assert 0 in hits and 1 in hits, f"add/str should read tainted r1: {hits}"
+    assert 4 not in hits, "r1 was cleaned by mov #0"
+    assert 5 not in hits, "regs-only kernel must not propagate through memory"
+
+    full = parser.taint_forward(start_idx=0, source_regs=['r0'], enable_memory_taint=True)
+    assert 5 in full, "full kernel should propagate through memory"
+    print("✓ regs-only taint_forward test passed")
+
+
+def test_mem_accesses_in_range():
+    """测试按有效地址区间查询访存事件（排序地址索引）"""
+    parser = TraceParser()
+
+    parser.events = [
+        create_mock_trace_event(1, 0x1000, "str r1, [r5]", reads={'r1': 0x11, 'r5': 0x8004}, writes={}),
+        create_mock_trace_event(2, 0x1004, "add r2, r1, #1", reads={'r1': 0x11}, writes={'r2': 0x12}),
+        create_mock_trace_event(3, 0x1008, "ldr r3, [r6]", reads={'r6': 0x8000}, writes={'r3': 0x7}),
+        create_mock_trace_event(4, 0x100C, "ldr r4, [r5]", reads={'r5': 0x8004}, writes={'r4': 0x11}),
+        create_mock_trace_event(5, 0x1010, "str r2, [r7]", reads={'r2': 0x12, 'r7': 0x9000}, writes={}),
+        create_mock_trace_event(6, 0x1014, "vldr d0, [r5]", reads={'r5': 0x8004}, writes={'d0': 0x11}),
+        create_mock_trace_event(7, 0x1018, "vstr d1, [r7]", reads={'d1': 0x0, 'r7': 0x9000}, writes={}),
+    ]
+    parser.events[0].effaddr = 0x8004
+    parser.events[2].effaddr = 0x8000
+    parser.events[3].effaddr = 0x8004
+    parser.events[4].effaddr = 0x9000
+    parser.events[5].effaddr = 0x8004
+    parser.events[6].effaddr = 0x9000
+
+    # vldr/vstr 不在 effective_address 覆盖的助记符内，与原先的内存搜索一样不计入
+    assert parser.mem_accesses_in_range(0x8004, 0x8004) == [0, 3]
+    assert parser.mem_accesses_in_range(0x8000, 0x8fff) == [0, 2, 3]
+    assert parser.mem_accesses_in_range(0x8005, 0x8fff) == []
+    assert parser.mem_accesses_in_range(0, 0xffffffff) == [0, 2, 3, 4]
+
+    assert [parser.mem_rw_kind(i) for i in range(7)] == ['W', '', 'R', 'R', 'W', '', '']
+
+    # 事件列表变化后索引应重建
+    parser.events = parser.events[:3]
+    assert parser.mem_accesses_in_range(0, 0xffffffff) == [0, 2]
+    print("✓ mem_accesses_in_range test passed")
+
+
+def test_reg_value_postings():
+    """测试寄存器值倒排表与按值查找上一次写入"""
+    parser = TraceParser()
+
+    for ev in [
+        create_mock_trace_event(1, 0x1000, "mov r0, #5", reads={}, writes={'r0': 0x5}),
+        create_mock_trace_event(2, 0x1004, "add r1, r0, #1", reads={'r0': 0x5}, writes={'r1': 0x6}),
+        create_mock_trace_event(3, 0x1008, "mov r0, #7", reads={}, writes={'r0': 0x7}),
+        create_mock_trace_event(4, 0x100C, "mov r0, #5", reads={}, writes={'r0': 0x5}),
+    ]:
+        parser._index_event(ev)
+    parser._freeze_reg_indices()
+
+    postings = parser.reg_value_postings('r0', writes=True)
+    assert list(postings[0x5]) == [0, 3]
+    assert list(postings[0x7]) == [2]
+    assert list(parser.reg_value_postings('r0')[0x5]) == [1]
+
+    assert parser.find_prev_write_with_value('r0', 3, 0x5) == 0
+    assert parser.find_prev_write_with_value('r0', 4, 0x5) == 3
+    assert parser.find_prev_write_with_value('r0', 0, 0x5) is None
+    assert parser.find_prev_write_with_value('r0', 4, 0x9) is None
+
+    assert [i for i, _ in parser.find_value_candidates('r0', 0x5)] == [0, 1, 3]
+    assert [i for i, _ in parser.find_value_candidates('r0', 0x5, side='执行前')] == [1]
+    print("✓ reg_value_postings test passed")
+
+
+def test_iter_reg_states():
+    """测试增量寄存器状态迭代与逐行复原一致"""
+    parser = TraceParser()
+
+    for ev in [
+        create_mock_trace_event(1, 0x1000, "mov r0, #5", reads={}, writes={'r0': 0x5}),
+        create_mock_trace_event(2, 0x1004, "add r1, r0, #1", reads={'r0': 0x5}, writes={'r1': 0x6}),
+        create_mock_trace_event(3, 0x1008, "add r2, r3, #1", reads={'r3': 0x9}, writes={'r2': 0xA}),
+        create_mock_trace_event(4, 0x100C, "mov r0, #7", reads={}, writes={'r0': 0x7}),
+    ]:
+        parser._index_event(ev)
+
+    states = list(parser.iter_reg_states(1, 10))
+    assert [i for i, _, _ in states] == [1, 2, 3]
+    for i, before, after in states:
+        assert before == parser.reconstruct_regs_at(i - 1)
+        assert after == parser.reconstruct_regs_at(i)
+    assert states[1][2]['r3'] == 0x9
+    assert states[2][1] is states[1][2]
+    assert list(parser.iter_reg_states(3, 3)) == []
+
+    for i in range(4):
+        before, after = parser.reconstruct_regs_pair_at(i)
+        assert before == (parser.reconstruct_regs_at(i - 1) if i else {})
+        assert after == parser.reconstruct_regs_at(i)
+    print("✓ iter_reg_states test passed")
+
+
 def test_register_list_parsing():
     """测试寄存器列表解析功能"""
     parser = TraceParser()
@@ -265,6 +388,27 @@ def test_advanced_taint_with_new_instructions():
     print("✓ advanced taint analysis with new instructions test passed")
 
 
+def test_advanced_taint_stop_on_target():
+    """测试 stop_on_target：污点到达目标寄存器后立即停止"""
+    parser = TraceParser()
+
+    parser.events = [
+        create_mock_trace_event(1, 0x1000, "add r1, r0, #1", reads={'r0': 0x10}, writes={'r1': 0x11}),
+        create_mock_trace_event(2, 0x1004, "mov r2, r1", reads={'r1': 0x11}, writes={'r2': 0x11}),
+        create_mock_trace_event(3, 0x1008, "mov r3, r2", reads={'r2': 0x11}, writes={'r3': 0x11}),
+        create_mock_trace_event(4, 0x100C, "mov r4, r3", reads={'r3': 0x11}, writes={'r4': 0x11}),
+    ]
+
+    full = parser.advanced_taint_analysis(start_idx=0, source_regs=['r0'], target_regs=['r2'])
+    early = parser.advanced_taint_analysis(start_idx=0, source_regs=['r0'], target_regs=['r2'], stop_on_target=True)
+
+    assert full['target_reached'] and early['target_reached'], "target r2 should be reached"
+    assert full['hits'] == [0, 1, 2, 3], f"Expected full run over all events, got {full['hits']}"
+    assert early['hits'] == [0, 1], f"Expected early stop at event 1, got {early['hits']}"
+    assert early['statistics']['total_steps'] == 2, f"Expected 2 steps, got {early['statistics']}"
+    print("✓ advanced taint stop_on_target test passed")
+
+
 def test_instruction_type_detection():
     """测试指令类型检测函数"""
     parser = TraceParser()
@@ -308,7 +452,12 @@ def run_all_tests():
         ("UMULL Instruction", test_umull_instruction),
         ("STRD/LDRD Instructions", test_strd_ldrd_instructions),
         ("PUSH/POP Instructions", test_push_pop_instructions),
+        ("Regs-only Taint Forward", test_regs_only_taint_forward),
+        ("Memory Access Range Query", test_mem_accesses_in_range),
+        ("Register Value Postings", test_reg_value_postings),
+        ("Register State Iterator", test_iter_reg_states),
         ("Advanced Taint Analysis", test_advanced_taint_with_new_instructions),
+        ("Advanced Taint Stop On Target", test_advanced_taint_stop_on_target),
     ]
     
     passed = 0
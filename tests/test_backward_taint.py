@@ -257,6 +257,34 @@ def test_termination_detection():
     return True
 
 
+def test_backward_taint_should_stop():
+    """测试反向污点分析的取消回调"""
+    print("\n" + "=" * 60)
+    print("测试4: 取消回调")
+    print("=" * 60)
+
+    parser = TraceParser()
+    for i, (asm, writes, reads) in enumerate([
+        ("movs r1, #4", {'r1': 4}, {}),
+        ("add r2, r1, #1", {'r2': 5}, {'r1': 4}),
+        ("mov r3, r1", {'r3': 4}, {'r1': 4}),
+    ]):
+        parser._index_event(TraceEvent(
+            line_no=100 + i, timestamp='', module='libtest.so', module_offset='',
+            encoding='', pc=0x1000 + 2 * i, asm=asm, raw='',
+            writes=writes, reads=reads, call_id=1))
+
+    full = parser.taint_backward(start_idx=2, target_reg='r1', target_value=4)
+    assert parser.taint_backward(start_idx=2, target_reg='r1', target_value=4,
+                                 should_stop=lambda: False) == full
+    # 第 0 步就询问取消：一条事件也不处理
+    assert parser.taint_backward(start_idx=2, target_reg='r1', target_value=4,
+                                 should_stop=lambda: True) == []
+
+    print("✓ 测试通过！")
+    return True
+
+
 def main():
     """运行所有测试"""
     print("开始测试反向污点分析功能...\n")
@@ -265,6 +293,7 @@ def main():
         test_basic_backward_taint()
         test_find_value_candidates()
         test_termination_detection()
+        test_backward_taint_should_stop()
         
         print("\n" + "=" * 60)
         print("✅ 所有测试通过！")
@@ -0,0 +1,126 @@
+"""测试导出代码的指令翻译（伪C / Python）
+
+测试覆盖：
+- 位域指令：带移位的操作数不生成语句
+- asr 移位操作数内联为 asr32
+- 移位融合：单独移位 + 紧随的消费指令合并为带移位操作数的一条
+- 伪C 寄存器数组：声明为 R[N]，表达式中的寄存器名按整词改写为 R[i]
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from trace_viewer.code_export import (_bitop_py_stmt_cached, _bitop_c_expr_cached, _fuse_shift_operands,
+                                     _c_reg_slots, _c_replay_lines)
+
+
+def test_bitfield_export_with_shifted_operand():
+    """测试位域指令导出：带移位的操作数不生成语句（不产生非法代码）"""
+    ok = _bitop_py_stmt_cached("ubfx r0, r1, #3, #4")
+    assert ok == "r0 = u32((r1 >> 3) & ((1 << 4) - 1))", ok
+    compile(ok, "<export>", "exec")
+    for asm in ("ubfx r0, r1, #3, asr #4", "sbfx r0, r1, #3, lsl #2", "bfi r0, r1, #8, lsr #1"):
+        assert _bitop_py_stmt_cached(asm) == "", asm
+        assert _bitop_c_expr_cached(asm) == "", asm
+    # 非位域指令的 asr 移位仍内联为 asr32
+    assert _bitop_py_stmt_cached("add r0, r1, r2, asr #3") == "r0 = u32(r1 + asr32(r2, 3))"
+
+    print("✓ bitfield export with shifted operand test passed")
+
+
+def test_fuse_shift_operands():
+    """测试移位融合：临时寄存器只作消费指令第三操作数且随即被覆盖时才合并"""
+    fused = _fuse_shift_operands(["lsl r1, r2, #3", "orr r1, r0, r1", "mov r3, r1"])
+    assert fused == [
+        ("orr r1, r0, r2, lsl #3", "lsl r1, r2, #3; orr r1, r0, r1"),
+        ("mov r3, r1", "mov r3, r1"),
+    ], fused
+    assert _bitop_c_expr_cached(fused[0][0]) == "r1 = r0 | (r2 << 3);"
+
+    # 消费指令的 rn 就是临时寄存器：不能合并
+    kept = ["lsl r1, r2, #3", "orr r1, r1, r0"]
+    assert _fuse_shift_operands(kept) == [(a, a) for a in kept]
+    # 消费指令没有覆盖临时寄存器（临时值之后仍可能被读）：不能合并
+    kept = ["lsl r1, r2, #3", "orr r2, r0, r1"]
+    assert _fuse_shift_operands(kept) == [(a, a) for a in kept]
+    # 移位量不是立即数：不能合并
+    kept = ["lsl r1, r2, r3", "orr r1, r0, r1"]
+    assert _fuse_shift_operands(kept) == [(a, a) for a in kept]
+
+    print("✓ fuse shift operands test passed")
+
+
+def test_c_reg_slots():
+    """测试伪C 导出的 R[] 改写：只替换整词寄存器名，十六进制立即数与 __mask 临时量保持原样"""
+    reg_idx, to_slots = _c_reg_slots(["x0", "x1", "x10"])
+    assert reg_idx == {"x0": 0, "x1": 1, "x10": 2}
+    assert to_slots("x10 = x1 & 0x1f;") == "R[2] = R[1] & 0x1f;"
+    assert to_slots("x0 = x1 + 0x10;") == "R[0] = R[1] + 0x10;"
+
+    _, no_regs = _c_reg_slots([])
+    assert no_regs("r0 = r1;") == "r0 = r1;"
+
+    lines = _c_replay_lines(["and r0, r1, #0x1f", "bfi r0, r1, #8, #4", "ldr r2, [r1]"], ["r0", "r1", "r2"])
+    assert lines == [
+        "uint32_t R[3] = {0};",
+        "/* R[0]=r0 R[1]=r1 R[2]=r2 */",
+        "",
+        "void replay(void) {",
+        "    R[0] = R[1] & 0x1f;  // and r0, r1, #0x1f",
+        "    { uint32_t __mask = ((1u << 4) - 1) << 8; R[0] = (R[0] & ~__mask) | (((R[1]) << 8) & __mask); }"
+        "  // bfi r0, r1, #8, #4",
+        "    // ldr r2, [r1]",
+        "}",
+    ], lines
+
+    # 超过 8 个寄存器时对照注释分行
+    regs = [f"r{i}" for i in range(10)]
+    lines = _c_replay_lines([], regs)
+    assert lines[:3] == [
+        "uint32_t R[10] = {0};",
+        "/* " + " ".join(f"R[{i}]=r{i}" for i in range(8)) + " */",
+        "/* R[8]=r8 R[9]=r9 */",
+    ], lines
+    assert lines[3:] == ["", "void replay(void) {", "}"]
+
+    print("✓ C register slots test passed")
+
+
+def run_all_tests():
+    """运行所有测试"""
+    print("\n" + "="*60)
+    print("Running Code Export Tests")
+    print("="*60 + "\n")
+
+    tests = [
+        ("Bitfield Export With Shifted Operand", test_bitfield_export_with_shifted_operand),
+        ("Fuse Shift Operands", test_fuse_shift_operands),
+        ("C Register Slots", test_c_reg_slots),
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_name, test_func in tests:
+        try:
+            print(f"\nRunning: {test_name}")
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_name} FAILED: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test_name} ERROR: {e}")
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("="*60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
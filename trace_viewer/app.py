@@ -17,6 +17,10 @@ try:
     from .value_flow import ValueFlowDock, ChainWorker
 except Exception:
     from value_flow import ValueFlowDock, ChainWorker  # type: ignore
+try:
+    from .code_export import _reg_sort_key, _c_replay_lines
+except Exception:
+    from code_export import _reg_sort_key, _c_replay_lines  # type: ignore
 try:
     from .mem_diff import MemoryDiffDock
 except Exception:
@@ -154,6 +158,7 @@ class TraceViewer(QtWidgets.QMainWindow):
         self._chain_req_id = 0
         # 异步寄存器复原
         self._regs_worker = None
+        self._regs_req_id = 0
         # 忙碌光标计数器，避免不成对的 restore 导致一直处于忙碌形态
         self._busy_count: int = 0
 
@@ -185,8 +190,10 @@ class TraceViewer(QtWidgets.QMainWindow):
 
     def closeEvent(self, event: QtGui.QCloseEvent) -> None:
         # 确保后台线程安全退出，避免 QThread 警告
+        # 线程池中的寄存器复原任务：推进请求号即可让其放弃结果
+        self._regs_req_id = getattr(self, '_regs_req_id', 0) + 1
         try:
-            for t in [getattr(self, '_regs_worker', None), getattr(self, '_chain_worker', None), getattr(self, '_worker', None)]:
+            for t in [getattr(self, '_chain_worker', None), getattr(self, '_worker', None)]:
                 if t and t.isRunning():
                     t.requestInterruption()
                     t.wait(200)
@@ -767,36 +774,16 @@ class TraceViewer(QtWidgets.QMainWindow):
         if end_idx < start_idx:
             start_idx, end_idx = end_idx, start_idx
         indices = list(range(start_idx, end_idx + 1))
-        # 生成伪C：重用值流面板的表达式转换（使用顶部已导入的 ValueFlowDock）
-        vf = getattr(self, '_vf_helper_for_export', None)
-        if vf is None:
-            vf = ValueFlowDock(self)
-            vf.attach(self.parser, lambda idx: self.parser.effective_address(idx))
-            self._vf_helper_for_export = vf
-        used_regs = set()
-        for idx in indices:
-            ev = self.parser.events[idx]
-            used_regs.update(ev.reads.keys())
-            used_regs.update(ev.writes.keys())
-        reg_list = sorted(used_regs, key=lambda x: (x[0], int(x[1:]) if x[1:].isdigit() else 99))
+        # 生成伪C：与值流面板共用同一生成器（模块级纯函数，无需实例化面板）
+        evs = [self.parser.events[i] for i in indices]
+        used_regs = set().union(*[ev.reads_keys for ev in evs], *[ev.writes_keys for ev in evs])
+        reg_list = sorted(used_regs, key=_reg_sort_key)
         lines = [
             '/* 从代码区导出（伪C） */',
             '#include <stdint.h>',
             '',
         ]
-        if reg_list:
-            decls = ', '.join(f'uint32_t {r}=0' for r in reg_list)
-            lines.append(f'{decls};')
-            lines.append('')
-        lines.append('void replay(void) {')
-        for idx in indices:
-            ev = self.parser.events[idx]
-            expr = vf._bitop_c_expr(ev.asm)
-            if expr:
-                lines.append(f'    {expr}  // {ev.asm}')
-            else:
-                lines.append(f'    // {ev.asm}')
-        lines.append('}')
+        lines += _c_replay_lines([ev.asm for ev in evs], reg_list)
         code = '\n'.join(lines)
         dlg = QtWidgets.QDialog(self)
         dlg.setWindowTitle('导出伪C代码（代码区）')
@@ -829,21 +816,20 @@ class TraceViewer(QtWidgets.QMainWindow):
     def _rebuild_regs_async(self, ev_idx: int) -> None:
         if not self.parser:
             return
-        try:
-            if self._regs_worker and self._regs_worker.isRunning():
-                self._regs_worker.requestInterruption()
-                self._regs_worker.wait(50)
-        except Exception:
-            pass
         # 不设置忙碌光标，因为这是异步后台操作，不应影响用户交互
         # _busy(self, True)  # 已禁用
-        self._regs_worker = RegsWorker(self.parser, ev_idx, self)
+        # 旧任务无需等待退出：请求号前进后它会在复原前自行放弃
+        self._regs_req_id += 1
+        self._regs_worker = RegsWorker(self.parser, ev_idx, self._regs_req_id,
+                                       is_current=lambda rid: rid == self._regs_req_id)
         self._regs_worker.finishedWithIndex.connect(self._on_regs_ready)
-        self._regs_worker.start()
+        QtCore.QThreadPool.globalInstance().start(self._regs_worker)
 
-    def _on_regs_ready(self, before: dict, after: dict, ev_idx: int) -> None:
+    def _on_regs_ready(self, before: dict, after: dict, ev_idx: int, req_id: int) -> None:
         # _busy(self, False)  # 已禁用
-        # 渲染寄存器；若期间用户已跳转到其它行，也仍然渲染最新计算结果
+        # 仅渲染最新请求的结果；快速跳转时被取代的旧结果直接丢弃
+        if req_id != self._regs_req_id:
+            return
         self._render_regs(before, after)
         # 渲染完成后再刷新内存对比，避免在点击当下阻塞
         try:
@@ -1046,6 +1032,8 @@ class TraceViewer(QtWidgets.QMainWindow):
         self._worker = ParserWorker(path)
         self._worker.finished.connect(self._on_parsed)
         self._worker.progress.connect(self._on_progress)
+        self._worker.sectionReady.connect(self._on_section_ready)
+        self._parsed_events = 0
         # 显示并置零进度条
         self._progress.show()
         self._progress.setValue(0)
@@ -1090,10 +1078,16 @@ class TraceViewer(QtWidgets.QMainWindow):
 
     @QtCore.pyqtSlot(int)
     def _on_progress(self, pct: int) -> None:
-        self.statusBar().showMessage(f'正在解析… {pct}%')
+        parsed = getattr(self, '_parsed_events', 0)
+        suffix = f'（已解析 {parsed} 条事件）' if parsed else ''
+        self.statusBar().showMessage(f'正在解析… {pct}%{suffix}')
         self._progress.show()
         self._progress.setValue(max(0, min(100, int(pct))))
 
+    def _on_section_ready(self, section: str, first_idx: int, last_idx: int) -> None:
+        # 解析仍在后台进行，parser 尚未交给界面；这里只记录进度，不访问解析中的数据
+        self._parsed_events = last_idx + 1
+
     # 注意：异步版 load_trace 已在上方定义
 
 
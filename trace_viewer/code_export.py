@@ -0,0 +1,330 @@
+"""指令文本到伪C / Python 语句的翻译与导出代码拼装。
+
+只依赖 asm 文本，不涉及 Qt 与解析器状态；值流面板与主窗口代码区的导出共用这里的函数。
+"""
+
+import re
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+
+# `_bitop_*` 共用的三段式解析：op rd, rn, rm/operand2
+_ASM_RE = re.compile(r"^(\w+)\s+(\w+)\s*,\s*([^,]+)(?:\s*,\s*(.+))?$")
+
+
+def _split_shift(rm: str) -> Optional[Tuple[str, str, str]]:
+    """第三参自带移位（如 "ip, lsr #20"）时返回 (移位名, 基址, 移位量原文)，按 lsl/lsr/asr 顺序取首个。"""
+    for name in ('lsl', 'lsr', 'asr'):
+        if name in rm:
+            parts = rm.split(name)
+            return name, parts[0].strip(' ,'), parts[1].strip()
+    return None
+
+
+def _two_operand(low: str) -> Optional[Tuple[str, str]]:
+    """两参形式（mov/mvn rd, rn）：返回 (rd, 去掉 # 的 rn)，解析失败返回 None。"""
+    rest = ' '.join(low.split()[1:])
+    try:
+        rd, rn = [x.strip() for x in rest.split(',', 1)]
+    except ValueError:
+        return None
+    return rd, rn.replace('#', '')
+
+
+_BITFIELD_ARG_RE = re.compile(r'^\w+$')
+
+
+def _bitfield_args(rm: str) -> Optional[Tuple[str, str]]:
+    """位域指令的 (lsb, width)，形如 "#lsb, #width"；须取移位内联改写前的原文。
+
+    两项都必须是单个立即数/名字，其余形式（如带移位的操作数）返回 None，不生成语句。"""
+    try:
+        lsb, width = [x.strip().lstrip('#') for x in rm.split(',')]
+    except ValueError:
+        return None
+    if not (_BITFIELD_ARG_RE.match(lsb) and _BITFIELD_ARG_RE.match(width)):
+        return None
+    return lsb, width
+
+
+# 伪C：op -> (rd, rn, rm_clean) -> 表达式
+_C_OP_TABLE = {
+    # 单目/特殊
+    'rbit': lambda rd, rn, rm: f"{rd} = __builtin_bitreverse32({rn});",
+    'clz': lambda rd, rn, rm: f"{rd} = __builtin_clz({rn});",
+    'rev': lambda rd, rn, rm: f"{rd} = __builtin_bswap32({rn});",
+    'rev16': lambda rd, rn, rm: f"{rd} = ((({rn} << 8) & 0xFF00FF00u) | (({rn} >> 8) & 0x00FF00FFu));",
+    'revsh': lambda rd, rn, rm: f"{rd} = (int32_t)(int16_t)__builtin_bswap16((uint16_t){rn});",
+    # 扩展/带加
+    'uxtb': lambda rd, rn, rm: f"{rd} = (uint32_t)(({rn}) & 0xFF);",
+    'uxth': lambda rd, rn, rm: f"{rd} = (uint32_t)(({rn}) & 0xFFFF);",
+    'sxtb': lambda rd, rn, rm: f"{rd} = (int32_t)(int8_t)({rn} & 0xFF);",
+    'sxth': lambda rd, rn, rm: f"{rd} = (int32_t)(int16_t)({rn} & 0xFFFF);",
+    # rd = rn + SignExtend16(rm)
+    'sxtah': lambda rd, rn, rm: f"{rd} = {rn} + (int32_t)(int16_t)({rm} & 0xFFFF);",
+    # 基本运算
+    'mvn': lambda rd, rn, rm: f"{rd} = ~{rn};",
+    'eor': lambda rd, rn, rm: f"{rd} = {rn} ^ {rm};",
+    'orr': lambda rd, rn, rm: f"{rd} = {rn} | {rm};",
+    'or': lambda rd, rn, rm: f"{rd} = {rn} | {rm};",  # 兼容解析
+    'and': lambda rd, rn, rm: f"{rd} = {rn} & {rm};",
+    'add': lambda rd, rn, rm: f"{rd} = {rn} + {rm};",
+    'sub': lambda rd, rn, rm: f"{rd} = {rn} - {rm};",
+    'mov': lambda rd, rn, rm: f"{rd} = {rn};",
+}
+# 伪C 位域：op -> (rd, rn, lsb, width) -> 表达式
+_C_BITFIELD_TABLE = {
+    'ubfx': lambda rd, rn, lsb, w: f"{rd} = (({rn} >> {lsb}) & ((1u << {w}) - 1));",
+    'sbfx': lambda rd, rn, lsb, w: f"{rd} = ((int32_t)({rn} << (32 - ({lsb} + {w}))) >> (32 - {w}));",
+    'bfc': lambda rd, rn, lsb, w: f"{rd} &= ~(((1u << {w}) - 1) << {lsb});",
+    # 语法：bfi rd, rn, #lsb, #width
+    'bfi': lambda rd, rn, lsb, w: (f"{{ uint32_t __mask = ((1u << {w}) - 1) << {lsb}; "
+                                   f"{rd} = ({rd} & ~__mask) | ((({rn}) << {lsb}) & __mask); }}"),
+}
+# 伪C 纯移位类（rd, rn, sh），按去掉 s 后缀的助记符查找
+_C_SHIFT_TABLE = {
+    'lsl': lambda rd, rn, rm: f"{rd} = {rn} << {rm};",
+    'lsr': lambda rd, rn, rm: f"{rd} = {rn} >> {rm};",
+    'asr': lambda rd, rn, rm: f"{rd} = ((int32_t){rn}) >> {rm};",
+    'ror': lambda rd, rn, rm: f"{rd} = ({rn} >> ({rm} & 31)) | ({rn} << ((32 - ({rm} & 31)) & 31));",
+}
+# 第三参内联移位的 C 写法
+_C_INLINE_SHIFT = {
+    'lsl': '({0} << {1})',
+    'lsr': '({0} >> {1})',
+    'asr': '((int32_t){0} >> {1})',
+}
+
+# Python：op -> (rd, rn, rm_clean) -> 语句
+_PY_OP_TABLE = {
+    # 特殊/单目
+    'rbit': lambda rd, rn, rm: f"{rd} = brev32({rn})",
+    'clz': lambda rd, rn, rm: f"{rd} = clz32({rn})",
+    'rev': lambda rd, rn, rm: f"{rd} = rev32({rn})",
+    'rev16': lambda rd, rn, rm: f"{rd} = rev16({rn})",
+    'revsh': lambda rd, rn, rm: f"{rd} = revsh({rn})",
+    # 扩展
+    'uxtb': lambda rd, rn, rm: f"{rd} = u32({rn} & 0xFF)",
+    'uxth': lambda rd, rn, rm: f"{rd} = u32({rn} & 0xFFFF)",
+    'sxtb': lambda rd, rn, rm: f"{rd} = u32((({rn}) & 0xFF) if (({rn}) & 0x80)==0 else (0xFFFFFFFF - ((~({rn})+1) & 0xFF)))",
+    'sxth': lambda rd, rn, rm: f"{rd} = u32((({rn}) & 0xFFFF) if (({rn}) & 0x8000)==0 else (0xFFFFFFFF - ((~({rn})+1) & 0xFFFF)))",
+    'sxtah': lambda rd, rn, rm: f"{rd} = u32({rn} + (({rm}) & 0xFFFF if (({rm}) & 0x8000)==0 else (0xFFFFFFFF - ((~({rm})+1) & 0xFFFF))))",
+    # 基本运算
+    'mvn': lambda rd, rn, rm: f"{rd} = u32(~{rn})",
+    'eor': lambda rd, rn, rm: f"{rd} = u32({rn} ^ {rm})",
+    'orr': lambda rd, rn, rm: f"{rd} = u32({rn} | {rm})",
+    'or': lambda rd, rn, rm: f"{rd} = u32({rn} | {rm})",
+    'and': lambda rd, rn, rm: f"{rd} = u32({rn} & {rm})",
+    'add': lambda rd, rn, rm: f"{rd} = u32({rn} + {rm})",
+    'sub': lambda rd, rn, rm: f"{rd} = u32({rn} - {rm})",
+    'mov': lambda rd, rn, rm: f"{rd} = u32({rn})",
+    # 纯移位/旋转
+    'lsl': lambda rd, rn, rm: f"{rd} = u32({rn} << {rm})",
+    'lsr': lambda rd, rn, rm: f"{rd} = u32({rn} >> {rm})",
+    'asr': lambda rd, rn, rm: f"{rd} = asr32({rn}, {rm})",
+    'ror': lambda rd, rn, rm: f"{rd} = ror32({rn}, {rm})",
+}
+for _op in ('lsl', 'lsr', 'asr', 'ror'):
+    _PY_OP_TABLE[_op + 's'] = _PY_OP_TABLE[_op]
+del _op
+# Python 位域：op -> (rd, rn, lsb, width) -> 语句
+_PY_BITFIELD_TABLE = {
+    'ubfx': lambda rd, rn, lsb, w: f"{rd} = u32(({rn} >> {lsb}) & ((1 << {w}) - 1))",
+    'sbfx': lambda rd, rn, lsb, w: f"{rd} = u32((((({rn}) << (32 - ({lsb} + {w}))) & MASK32) >> (32 - {w})))",
+    'bfc': lambda rd, rn, lsb, w: f"{rd} = u32({rd} & ~(((1 << {w}) - 1) << {lsb}))",
+    'bfi': lambda rd, rn, lsb, w: f"{rd} = u32(({rd} & ~(((1 << {w}) - 1) << {lsb})) | ((({rn}) << {lsb}) & (((1 << {w}) - 1) << {lsb})))",
+}
+
+# 移位融合：可以把“单独移位 + 紧随其后的消费指令”改写为带移位操作数的单条指令
+_FUSE_SHIFT_OPS = frozenset(('lsl', 'lsr', 'asr'))
+_FUSE_CONSUMER_OPS = frozenset(('eor', 'orr', 'and', 'add', 'sub'))
+
+
+def _fuse_shift_operands(asms: List[str]) -> List[Tuple[str, str]]:
+    """导出前的窥孔优化：返回 [(用于翻译的 asm, 注释用原文), ...]。
+
+    形如 `lsl r1, r2, #3` 紧接 `orr r1, r0, r1` 时，移位结果只被下一条用作第三操作数，
+    且下一条把同一寄存器覆盖（临时值随即失效），两条合并为 `orr r1, r0, r2, lsl #3`，
+    复用现有的移位操作数翻译；注释保留两条原文。其余指令原样一一对应。
+    """
+    out: List[Tuple[str, str]] = []
+    n = len(asms)
+    i = 0
+    while i < n:
+        asm = asms[i]
+        if i + 1 < n:
+            m1 = _ASM_RE.match(asm.strip().lower())
+            if m1 and m1.group(1) in _FUSE_SHIFT_OPS and m1.group(4) and m1.group(4).strip().startswith('#'):
+                nxt = asms[i + 1]
+                m2 = _ASM_RE.match(nxt.strip().lower())
+                tmp = m1.group(2)
+                if (m2 and m2.group(1) in _FUSE_CONSUMER_OPS and m2.group(2) == tmp
+                        and (m2.group(4) or '').strip() == tmp and m2.group(3).strip() != tmp):
+                    fused = f"{m2.group(1)} {tmp}, {m2.group(3).strip()}, {m1.group(3).strip()}, {m1.group(1)} {m1.group(4).strip()}"
+                    out.append((fused, f"{asm}; {nxt}"))
+                    i += 2
+                    continue
+        out.append((asm, asm))
+        i += 1
+    return out
+
+
+# 导出代码的固定文件头：整个进程内不变，导入时拼好一次
+_C_HEADER_LINES = (
+    '/* 生成自 trace 值流选择（伪C） */',
+    '#include <stdint.h>',
+    '',
+)
+_C_HEADER = '\n'.join(_C_HEADER_LINES)
+_PY_HEADER_LINES = (
+    '# 生成自 trace 值流选择（Python 伪代码）',
+    '',
+    'MASK32 = 0xFFFFFFFF',
+    'def u32(x): return x & MASK32',
+    'def brev32(x):',
+    '    x = ((x >> 1) & 0x55555555) | ((x & 0x55555555) << 1)',
+    '    x = ((x >> 2) & 0x33333333) | ((x & 0x33333333) << 2)',
+    '    x = ((x >> 4) & 0x0f0f0f0f) | ((x & 0x0f0f0f0f) << 4)',
+    '    x = ((x >> 8) & 0x00ff00ff) | ((x & 0x00ff00ff) << 8)',
+    '    return u32((x >> 16) | (x << 16))',
+    'def ror32(x, s): s &= 31; return u32((x >> s) | ((x << ((32 - s) & 31))))',
+    'def asr32(x, s): x &= MASK32; return u32((x - (1 << 32) if x & 0x80000000 else x) >> s)',
+    'def rev32(x): return ((x & 0xFF) << 24) | (x & 0xFF00) << 8 | (x >> 8) & 0xFF00 | (x >> 24) & 0xFF',
+    'def rev16(x): return (((x << 8) & 0xFF00FF00) | ((x >> 8) & 0x00FF00FF))',
+    'def revsh(x): import struct; return struct.unpack("<i", struct.pack("<h", (x & 0xFFFF) << 0))[0]',
+    'def clz32(x): return 32 - int(x & MASK32).bit_length() if x & MASK32 else 32',
+    '',
+)
+_PY_HEADER = '\n'.join(_PY_HEADER_LINES)
+
+
+def _bitop_py_stmt(asm: str) -> str:
+    low = asm.strip().lower()
+    m = _ASM_RE.match(low)
+    if not m:
+        if low.startswith('mov '):
+            ops = _two_operand(low)
+            return f"{ops[0]} = u32({ops[1]})" if ops else ''
+        if low.startswith('mvn '):
+            ops = _two_operand(low)
+            return f"{ops[0]} = u32(~{ops[1]})" if ops else ''
+        return ''
+    op, rd, rn, rm = m.groups()
+    rm = '' if rm is None else rm
+    rd = rd.strip(); rn = rn.strip()
+    bitfield = _PY_BITFIELD_TABLE.get(op)
+    if bitfield is not None:
+        # 位域参数按逗号切分，须在移位改写（asr32(...) 含逗号）之前取
+        args = _bitfield_args(rm)
+        return bitfield(rd, rn, *args) if args else ''
+    # 内联第三参移位
+    sh = _split_shift(rm)
+    if sh is not None:
+        name, base, amount = sh
+        amount = amount.replace('#', '').strip()
+        if name == 'asr':
+            rm = f"asr32({base}, {amount})"
+        else:
+            rm = f"(({base}) {'<<' if name == 'lsl' else '>>'} {amount})"
+    rm_clean = rm.replace('#', '').strip() if rm else ''
+
+    handler = _PY_OP_TABLE.get(op)
+    if handler is not None:
+        return handler(rd, rn, rm_clean)
+    return ''
+
+
+def _bitop_c_expr(asm: str) -> str:
+    """将常见 ARM32/ARM64/Thumb 位运算与简单算术转为 C 表达式（末尾分号）。
+    覆盖：and/or/eor/mov/mvn/add/sub/lsl/lsr/lsrs/asr/ror/ubfx/sbfx/bfc/bfi/rbit/clz/rev/rev16/revsh/
+    uxtb/uxth/sxtb/sxth/sxtah 等常见形式。未覆盖的返回注释行。
+
+    助记符经 `_C_OP_TABLE` / `_C_BITFIELD_TABLE` / `_C_SHIFT_TABLE` 一次查表分派。
+    """
+    low = asm.strip().lower()
+    m = _ASM_RE.match(low)
+    if not m:
+        # 两参形式：mov/mvn/单目
+        if low.startswith('mov '):
+            ops = _two_operand(low)
+            return f"{ops[0]} = {ops[1]};" if ops else ''
+        if low.startswith('mvn '):
+            ops = _two_operand(low)
+            return f"{ops[0]} = ~{ops[1]};" if ops else ''
+        # rbit/clz/rev* 两参也可能以此分支进入
+        return ''
+    op, rd, rn, rm = m.groups()
+    rm = '' if rm is None else rm
+    rd = rd.strip()
+    rn = rn.strip()
+
+    # 若第三参自带移位（如 ip, lsr #20），先内联为 C 表达式
+    sh = _split_shift(rm)
+    if sh is not None:
+        name, base, amount = sh
+        rm = _C_INLINE_SHIFT[name].format(base, amount.replace('#', '').strip())
+    rm_clean = rm.strip().replace('#', '')
+
+    handler = _C_OP_TABLE.get(op)
+    if handler is not None:
+        return handler(rd, rn, rm_clean)
+    bitfield = _C_BITFIELD_TABLE.get(op)
+    if bitfield is not None:
+        args = _bitfield_args(rm)
+        return bitfield(rd, rn, *args) if args else ''
+    # 纯移位类（rd, rn, sh），兼容 lsrs/asrs 等
+    shift = _C_SHIFT_TABLE.get(op.rstrip('s'))
+    if shift is not None:
+        return shift(rd, rn, rm_clean)
+    return ''
+
+
+@lru_cache(maxsize=None)
+def _reg_sort_key(r: str) -> Tuple[str, int]:
+    """导出代码时寄存器声明的排序键：按首字母再按编号（r2 < r10），每个寄存器只计算一次。"""
+    tail = r[1:]
+    return (r[0], int(tail) if tail.isdigit() else 99)
+
+
+@lru_cache(maxsize=8192)
+def _bitop_c_expr_cached(asm: str) -> str:
+    """`_bitop_c_expr` 的按 asm 文本缓存版本（纯函数，同一指令文本只解析一次）。"""
+    return _bitop_c_expr(asm)
+
+
+@lru_cache(maxsize=8192)
+def _bitop_py_stmt_cached(asm: str) -> str:
+    """`_bitop_py_stmt` 的按 asm 文本缓存版本。"""
+    return _bitop_py_stmt(asm)
+
+
+def _c_reg_slots(reg_list: List[str]):
+    """导出伪C时把寄存器名映射为 `R[]` 数组下标。
+
+    返回 (寄存器->下标, 表达式改写函数)；改写按整词匹配，只替换声明过的寄存器名。"""
+    reg_idx = {r: i for i, r in enumerate(reg_list)}
+    if not reg_idx:
+        return reg_idx, lambda expr: expr
+    slot = {r: f'R[{i}]' for r, i in reg_idx.items()}
+    pat = re.compile(r'\b(?:%s)\b' % '|'.join(map(re.escape, sorted(reg_idx, key=len, reverse=True))))
+    return reg_idx, lambda expr: pat.sub(lambda m: slot[m.group(0)], expr)
+
+
+def _c_replay_lines(asms: List[str], reg_list: List[str]) -> List[str]:
+    """伪C导出的寄存器声明与 replay 函数体（不含文件头）。
+
+    值流面板与代码区的导出共用此函数，同一段指令得到相同的代码。"""
+    lines: List[str] = []
+    # 寄存器统一放进一个数组：声明只占一行，表达式按下标访问，原名留在注释里对照
+    reg_idx, to_slots = _c_reg_slots(reg_list)
+    if reg_list:
+        lines.append(f'uint32_t R[{len(reg_list)}] = {{0}};')
+        for k in range(0, len(reg_list), 8):
+            lines.append('/* ' + ' '.join(f'R[{reg_idx[r]}]={r}' for r in reg_list[k:k + 8]) + ' */')
+        lines.append('')
+    lines.append('void replay(void) {')
+    c_expr = _bitop_c_expr_cached
+    lines += [f'    {to_slots(expr)}  // {note}' if (expr := c_expr(asm)) else f'    // {note}'
+              for asm, note in _fuse_shift_operands(asms)]
+    lines.append('}')
+    return lines
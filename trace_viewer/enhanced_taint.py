@@ -11,7 +11,7 @@
 5. 污点汇合点检测（多个污点汇聚）
 """
 
-from typing import Dict, List, Set, Tuple, Optional
+from typing import Dict, Iterable, List, Set, Tuple, Optional
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -259,6 +259,13 @@ class EnhancedTaintAnalyzer:
         reg = reg.lower()
         return reg in self.reg_taints and len(self.reg_taints[reg]) > 0
     
+    def any_reg_tainted(self, regs: Iterable[str]) -> bool:
+        """批量检查 regs 中是否有寄存器被污染（regs 须为小写名，如解析器事件的读写名元组）。
+
+        reg_taints 中不会留下空集合，直接拿键视图与 regs 求是否相交，一次完成。
+        """
+        return not self.reg_taints.keys().isdisjoint(regs)
+    
     def get_reg_labels(self, reg: str) -> Set[TaintLabel]:
         """获取寄存器的污点标签"""
         reg = reg.lower()
@@ -1,8 +1,10 @@
 import re
 import os
+import sys
+from array import array
 from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
-from typing import Dict, List, Tuple, Optional, Iterable
+from typing import Callable, Dict, List, Tuple, Optional, Iterable, Iterator, Sequence, FrozenSet
 import threading
 import time
 from collections import OrderedDict
@@ -13,6 +15,56 @@ except Exception:
     get_decoder = None  # 回退
 
 
+# 污点分析用的指令类别（每个事件只分类一次，缓存在 TraceEvent.op_kind）
+_OP_OTHER = 0
+_OP_LDR = 1
+_OP_STR = 2
+_OP_PUSH = 3
+_OP_POP = 4
+_OP_STM = 5
+_OP_LDM = 6
+_OP_STRD = 7
+_OP_LDRD = 8
+_OP_CSEL = 9
+_OP_CSET = 10
+_OP_MADD = 11
+_OP_MOVK = 12
+_OP_ADRP = 13
+_OP_LOADS = (_OP_LDR, _OP_LDRD)
+_OP_MEM_SINGLE = (_OP_LDR, _OP_STR, _OP_LDRD, _OP_STRD)
+
+# TraceParser._mem_rw_flags 取值对应的方向文本
+_MEM_RW_TEXT = ('', 'R', 'W')
+
+# 需带操作数、按完整助记符匹配的类别
+_OP_BY_MNEMONIC = {
+    'push': _OP_PUSH, 'pop': _OP_POP,
+    'strd': _OP_STRD, 'ldrd': _OP_LDRD,
+    'csel': _OP_CSEL, 'csinc': _OP_CSEL, 'csinv': _OP_CSEL, 'csneg': _OP_CSEL,
+    'cset': _OP_CSET, 'csetm': _OP_CSET,
+    'madd': _OP_MADD, 'msub': _OP_MADD, 'smaddl': _OP_MADD, 'umaddl': _OP_MADD,
+    'smsubl': _OP_MADD, 'umsubl': _OP_MADD,
+    'movk': _OP_MOVK, 'adrp': _OP_ADRP,
+}
+
+# 长循环协作取消：每隔这么多步询问一次 should_stop（取 2 的幂，用位与判断）
+_STOP_POLL_MASK = 1023
+
+
+def _until_stopped(indices: Iterable[int], should_stop: Optional[Callable[[], bool]]) -> Iterable[int]:
+    """给污点循环的索引序列挂上取消检查；should_stop 为空时原样返回，不增加循环开销。"""
+    if should_stop is None:
+        return indices
+    return _poll_until_stopped(indices, should_stop)
+
+
+def _poll_until_stopped(indices: Iterable[int], should_stop: Callable[[], bool]) -> Iterator[int]:
+    for k, i in enumerate(indices):
+        if not (k & _STOP_POLL_MASK) and should_stop():
+            return
+        yield i
+
+
 class TraceEvent:
     """单条 trace 事件的数据结构。
     
@@ -25,7 +77,8 @@ class TraceEvent:
     """
     __slots__ = ('line_no', 'timestamp', 'module', 'module_offset', 'encoding', 
                  'pc', 'asm', 'raw', 'writes', 'reads', 'effaddr', 'mem_width', 
-                 'mem_op', 'call_id', 'call_depth')
+                 'mem_op', 'call_id', 'call_depth', 'op_kind', 'access_width',
+                 'reads_keys', 'writes_keys')
     
     def __init__(self, line_no: int, timestamp: str, module: str, module_offset: str,
                  encoding: str, pc: int, asm: str, raw: str,
@@ -51,6 +104,11 @@ class TraceEvent:
         self.mem_op = mem_op
         self.call_id = call_id
         self.call_depth = call_depth
+        self.op_kind = -1  # 惰性计算，见 TraceParser._op_kind
+        self.access_width = 0  # ldr/str 类的污点访存宽度，随 op_kind 一并计算
+        # 读写寄存器名元组：热循环只需遍历名字时用它，免去 dict 键迭代/list 拷贝
+        self.reads_keys = tuple(self.reads)
+        self.writes_keys = tuple(self.writes)
 
 
 class TraceParser:
@@ -101,20 +159,28 @@ class TraceParser:
         self.events: List[TraceEvent] = []
         self.addr_index: Dict[int, List[int]] = {}
         self.branch_targets: Dict[int, str] = {}
-        self._reg_checkpoints: Dict[int, Dict[str, int]] = {}
+        # 寄存器快照：行号 -> (寄存器名元组, array('Q') 值列)；名元组在快照间共享
+        self._reg_checkpoints: Dict[int, Tuple[Tuple[str, ...], Sequence[int]]] = {}
+        self._checkpoint_names: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+        # 快照行号的有序列表，供复原时二分查找；快照数变化时惰性重建
+        self._checkpoint_lines: List[int] = []
         self._checkpoint_interval = checkpoint_interval
         self._current_regs: Dict[str, int] = {}
         # 调用跟踪
         self._call_stack: List[int] = []
         self._next_call_id: int = 1
         # 寄存器读写倒排索引
-        self.reg_read_index: Dict[str, List[int]] = {}
-        self.reg_write_index: Dict[str, List[int]] = {}
+        # 解析完成后由 _freeze_reg_indices 转为 array('i')：连续存储、可直接 bisect
+        self.reg_read_index: Dict[str, Sequence[int]] = {}
+        self.reg_write_index: Dict[str, Sequence[int]] = {}
         # 架构提示：'auto'/'arm32'/'arm64'
         self.arch: str = arch_hint if arch_hint in ('auto', 'arm32', 'arm64') else 'auto'
         # 寄存器复原 LRU 缓存
         self._regs_cache: "OrderedDict[int, Dict[str, int]]" = OrderedDict()
         self._regs_cache_cap: int = 1024
+        # 寄存器复原可能同时来自线程池中的多个任务（寄存器面板、数据来源分析等），
+        # 缓存的查找/遍历/淘汰与别名位分配都在此锁内进行；可重入，成对复原会嵌套调用
+        self._regs_lock = threading.RLock()
         # 增量缓存：记录访问模式，智能选择最近缓存点（性能优化）
         self._recent_access_idx: int = -1  # 最近访问的事件索引
         # 有效地址 LRU 缓存，避免重复重建寄存器
@@ -127,9 +193,33 @@ class TraceParser:
         self._decoder_warn_limit: int = 20
         # 寄存器别名缓存（性能优化）
         self._alias_cache: Dict[str, List[str]] = {}
-
-    def parse_file(self, path: str, progress_cb: Optional[callable] = None) -> None:
-        """解析 trace 文件并构建索引；若存在可用 SQLite 缓存则直接加载。"""
+        self._alias_set_cache: Dict[str, FrozenSet[str]] = {}
+        # 寄存器名 -> 位（按首次出现顺序分配），以及名 -> 别名集合位掩码，供位图污点状态使用
+        self._reg_bit: Dict[str, int] = {}
+        self._alias_bits_cache: Dict[str, int] = {}
+        # 寄存器名驻留表：原始名 -> 驻留的小写名。所有事件共享同一批字符串对象，
+        # reads/writes/倒排索引的键查找可走指针相等快速路径，也省去逐对 lower()
+        self._reg_names: Dict[str, str] = {}
+        # 调用实例索引：call_id -> 该调用内事件索引（array('i')，有序）；按需构建，事件列表变化时失效
+        self._call_index: Dict[int, Sequence[int]] = {}
+        self._call_index_key: Tuple[int, int] = (0, -1)
+        # 寄存器值列：(reg, 是否写入) -> (事件索引列, 32 位值列)，按需由倒排索引派生
+        self._reg_value_cols: Dict[Tuple[str, bool], Tuple[Sequence[int], Sequence[int]]] = {}
+        # 值倒排：(reg, 是否写入) -> (派生自的值列, {32 位值: 有序事件索引 array('i')})，随值列失效
+        self._reg_value_postings: Dict[Tuple[str, bool], Tuple[Sequence[int], Dict[int, Sequence[int]]]] = {}
+        # 访存地址索引：按有效地址排序的 (地址列, 事件索引列)；按需构建，事件列表变化时失效
+        self._mem_addr_index: Tuple[Sequence[int], Sequence[int]] = ((), ())
+        self._mem_addr_index_key: Tuple[int, int] = (0, -1)
+        # 每个事件的 ldr/str 标志（0=非 ldr/str，1=读，2=写），与访存地址索引同时构建
+        self._mem_rw_flags: bytearray = bytearray()
+
+    def parse_file(self, path: str, progress_cb: Optional[callable] = None,
+                   section_cb: Optional[Callable[[int, int], None]] = None,
+                   section_size: int = 50000) -> None:
+        """解析 trace 文件并构建索引；若存在可用 SQLite 缓存则直接加载。
+
+        section_cb(first_idx, last_idx)：常规解析时每累计 section_size 条事件回调一次，
+        报告刚解析完的事件区间（含两端），结束时补报剩余部分。"""
         # 优先尝试缓存
         cache = None
         try:
@@ -157,6 +247,7 @@ class TraceParser:
             total_size = 0
         bytes_read = 0
         last_pct = -1
+        section_start = len(self.events)
         
         # 立即报告0%，让用户知道开始解析了
         if progress_cb:
@@ -186,6 +277,12 @@ class TraceParser:
                 self._annotate_call(ev)
                 self._index_event(ev)
                 self._apply_writes(ev)
+                if section_cb is not None and len(self.events) - section_start >= section_size:
+                    try:
+                        section_cb(section_start, len(self.events) - 1)
+                    except Exception:
+                        pass
+                    section_start = len(self.events)
                 # 写入缓存
                 if cache is not None:
                     if i == 1:
@@ -201,12 +298,18 @@ class TraceParser:
                     if ev.writes:
                         cache.add_writes(idx, ev.writes.items())
                 if i % self._checkpoint_interval == 0:
-                    self._reg_checkpoints[i] = dict(self._current_regs)
+                    self._reg_checkpoints[i] = self._pack_regs(self._current_regs)
                 # 优化：SQLite commit间隔独立设置，减少I/O开销
                 # checkpoint_interval=2000，但commit_interval=10000
                 if cache is not None and i % 10000 == 0:
                     cache.commit()
         
+        if section_cb is not None and len(self.events) > section_start:
+            try:
+                section_cb(section_start, len(self.events) - 1)
+            except Exception:
+                pass
+
         # 解析完成，报告100%
         if progress_cb:
             try:
@@ -214,6 +317,7 @@ class TraceParser:
             except Exception:
                 pass
         
+        self._freeze_reg_indices()
         # 解析完成后，预计算 ldr/str 的有效地址并构建 store_addr 索引
         self._precompute_memory_effects()
         if cache is not None:
@@ -275,6 +379,8 @@ class TraceParser:
         self.addr_index.clear()
         self.branch_targets.clear()
         self._reg_checkpoints.clear()
+        self._checkpoint_names.clear()
+        self._checkpoint_lines = []
         self._current_regs.clear()
         self.reg_read_index.clear()
         self.reg_write_index.clear()
@@ -297,13 +403,14 @@ class TraceParser:
             )
             # 读写寄存器
             for r, v in cache.iter_reads_for_event(idx):
-                ev.reads[r] = int(v)
+                ev.reads[self._intern_reg(r)] = int(v)
             for r, v in cache.iter_writes_for_event(idx):
-                ev.writes[r] = int(v)
+                ev.writes[self._intern_reg(r)] = int(v)
             self._index_event(ev)
             self._apply_writes(ev)
             if line_no % self._checkpoint_interval == 0:
-                self._reg_checkpoints[line_no] = dict(self._current_regs)
+                self._reg_checkpoints[line_no] = self._pack_regs(self._current_regs)
+        self._freeze_reg_indices()
         # 从缓存加载后同样补建内存相关预计算
         self._precompute_memory_effects()
     
@@ -453,6 +560,7 @@ class TraceParser:
         """
         pre: Dict[str, int] = {}
         post: Dict[str, int] = {}
+        reg_names = self._reg_names
 
         if '=>' in rest:
             left, right = rest.split('=>', 1)
@@ -473,7 +581,9 @@ class TraceParser:
                     val = int(val_m.group(0), 16)
                 except ValueError:
                     continue
-                lname = name.lower()
+                lname = reg_names.get(name)
+                if lname is None:
+                    lname = self._intern_reg(name)
                 target[lname] = val
                 # 基于寄存器名推断架构（仅在 auto 模式）
                 if self.arch == 'auto':
@@ -496,9 +606,20 @@ class TraceParser:
 
         return reads, writes
 
+    def _intern_reg(self, name: str) -> str:
+        """返回寄存器名的驻留小写形式（同名寄存器在所有事件中共用一个字符串对象）。"""
+        lname = self._reg_names.get(name)
+        if lname is None:
+            lname = sys.intern(name.lower())
+            self._reg_names[name] = lname
+        return lname
+
     def _index_event(self, ev: TraceEvent) -> None:
         self.events.append(ev)
         idx = len(self.events) - 1
+        # 缓存装载路径会在构造后再填充 reads/writes，这里统一刷新键元组
+        ev.reads_keys = tuple(ev.reads)
+        ev.writes_keys = tuple(ev.writes)
         self.addr_index.setdefault(ev.pc, []).append(idx)
         # 建立倒排索引
         if ev.reads:
@@ -511,6 +632,16 @@ class TraceParser:
                 for alias in self._alias_names(r):
                     self.reg_write_index.setdefault(alias, []).append(idx)
 
+    def _freeze_reg_indices(self) -> None:
+        """将寄存器倒排索引的 list[int] 压实为 array('i')。
+
+        索引按事件顺序追加，天然有序；array 省去每个下标的 int 对象开销，bisect 可直接使用。
+        """
+        for index in (self.reg_read_index, self.reg_write_index):
+            for k, lst in index.items():
+                if not isinstance(lst, array):
+                    index[k] = array('i', lst)
+
     def _apply_writes(self, ev: TraceEvent) -> None:
         # 先用“读取”补全未知寄存器（尽力而为），再用“写入”覆盖
         for k, v in ev.reads.items():
@@ -520,6 +651,31 @@ class TraceParser:
         for k, v in ev.writes.items():
             self._current_regs[k] = v
 
+    def _pack_regs(self, regs: Dict[str, int]) -> Tuple[Tuple[str, ...], Sequence[int]]:
+        """把寄存器状态压成 (名元组, 定长值列)。
+
+        值列代替 dict 中逐个 Python int 对象：全部值装得进 32 位（ARM32 trace 总是如此）时用
+        array('I')（每个值 4 字节），否则用 array('Q')（8 字节）；
+        寄存器集合通常很快稳定，名元组经 _checkpoint_names 去重后在快照间共享。
+        超出 64 位的值（如向量寄存器）无法装入定长数组，退回普通列表。
+        """
+        names = tuple(regs)
+        names = self._checkpoint_names.setdefault(names, names)
+        values = regs.values()
+        vals: Sequence[int]
+        try:
+            vals = array('I', values) if max(values, default=0) <= 0xFFFFFFFF else array('Q', values)
+        except (OverflowError, TypeError):
+            vals = list(values)
+        return names, vals
+
+    @staticmethod
+    def _unpack_regs(packed: Optional[Tuple[Tuple[str, ...], Sequence[int]]]) -> Dict[str, int]:
+        if not packed:
+            return {}
+        names, vals = packed
+        return dict(zip(names, vals))
+
     def reconstruct_regs_at(self, event_index: int) -> Dict[str, int]:
         """在给定事件索引处复原寄存器状态。
 
@@ -527,7 +683,10 @@ class TraceParser:
         if not self.events:
             return {}
         event_index = max(0, min(event_index, len(self.events) - 1))
+        with self._regs_lock:
+            return self._reconstruct_regs_locked(event_index)
 
+    def _reconstruct_regs_locked(self, event_index: int) -> Dict[str, int]:
         # LRU 缓存命中
         cached = self._regs_cache.get(event_index)
         if cached is not None:
@@ -567,14 +726,13 @@ class TraceParser:
         else:
             # 查找小于等于目标行号的最近快照
             target_line = self.events[event_index].line_no
-            checkpoint_line = 0
-            for ln in sorted(self._reg_checkpoints.keys()):
-                if ln <= target_line:
-                    checkpoint_line = ln
-                else:
-                    break
+            lines = self._checkpoint_lines
+            if len(lines) != len(self._reg_checkpoints):
+                lines = self._checkpoint_lines = sorted(self._reg_checkpoints)
+            pos = bisect_right(lines, target_line) - 1
+            checkpoint_line = lines[pos] if pos >= 0 else 0
 
-            regs = dict(self._reg_checkpoints.get(checkpoint_line, {}))
+            regs = self._unpack_regs(self._reg_checkpoints.get(checkpoint_line))
 
             # 从快照位置回放到目标事件
             start_idx = 0
@@ -608,6 +766,10 @@ class TraceParser:
                     self._regs_cache[idx] = dict(regs)
                     midpoint_cached = True
 
+        self._remember_regs(event_index, regs)
+        return regs
+
+    def _remember_regs(self, event_index: int, regs: Dict[str, int]) -> None:
         # 记录本次访问位置（用于顺序访问优化）
         self._recent_access_idx = event_index
         
@@ -618,7 +780,55 @@ class TraceParser:
                 self._regs_cache.popitem(last=False)
             except Exception:
                 self._regs_cache.clear()
-        return regs
+
+    def reconstruct_regs_pair_at(self, event_index: int) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """一次给出事件执行前/后的寄存器状态 (before, after)。
+
+        只回放到 event_index-1，执行后状态由该事件增量推出，而不是第二次从快照回放；
+        结果同样进入寄存器 LRU。第 0 个事件的执行前状态为空。"""
+        if not self.events:
+            return {}, {}
+        event_index = max(0, min(event_index, len(self.events) - 1))
+        with self._regs_lock:
+            before: Dict[str, int] = self._reconstruct_regs_locked(event_index - 1) if event_index > 0 else {}
+            cached = self._regs_cache.get(event_index)
+            if cached is not None:
+                self._regs_cache.move_to_end(event_index)
+                self._recent_access_idx = event_index
+                return before, cached
+            ev = self.events[event_index]
+            after = dict(before)
+            if ev.reads:
+                for k, v in ev.reads.items():
+                    after.setdefault(k, v)
+            if ev.writes:
+                after.update(ev.writes)
+            self._remember_regs(event_index, after)
+            return before, after
+
+    def iter_reg_states(self, lo: int, hi: int) -> Iterator[Tuple[int, Dict[str, int], Dict[str, int]]]:
+        """逐条产出 [lo, hi) 内每个事件的 (索引, 执行前寄存器, 执行后寄存器)。
+
+        只在起点复原一次（lo-1 处的状态），之后沿事件增量推进，
+        K 行连续区间的代价从 K 次回放降为一次回放加 K 步。
+        产出的字典视为只读：下一步的“执行前”即上一步的“执行后”（同一对象）。
+        """
+        events = self.events
+        lo = max(0, lo)
+        hi = min(hi, len(events))
+        if lo >= hi:
+            return
+        regs: Dict[str, int] = self.reconstruct_regs_at(lo - 1) if lo > 0 else {}
+        for i in range(lo, hi):
+            ev = events[i]
+            after = dict(regs)
+            if ev.reads:
+                for k, v in ev.reads.items():
+                    after.setdefault(k, v)
+            if ev.writes:
+                after.update(ev.writes)
+            yield i, regs, after
+            regs = after
 
     def find_first_event_by_pc(self, pc: int) -> Optional[int]:
         """查找某地址首次出现的事件索引。"""
@@ -633,6 +843,26 @@ class TraceParser:
         pos = bisect_left(lst, from_index_exclusive) - 1
         return lst[pos] if pos >= 0 else None
 
+    def find_prev_write_with_value(self, reg: str, from_index_exclusive: int, value_u32: int) -> Optional[int]:
+        """查找 from_index_exclusive 之前最近一次把寄存器写成 value_u32（低 32 位）的事件。
+
+        在 (reg, 值) 倒排数组上二分，一次定位。
+        """
+        lst = self.reg_value_postings(reg, writes=True).get(value_u32 & 0xFFFFFFFF)
+        if not lst:
+            return None
+        pos = bisect_left(lst, from_index_exclusive) - 1
+        return lst[pos] if pos >= 0 else None
+
+    def _locate_value_writer(self, reg: str, start_idx: int, value_u32: int, side: str) -> int:
+        """定位把寄存器置为 value_u32 的写入点；找不到时退回 start_idx。"""
+        if side == '执行后':
+            v_here = self._get_write_value(self.events[start_idx], reg)
+            if v_here is not None and (v_here & 0xFFFFFFFF) == (value_u32 & 0xFFFFFFFF):
+                return start_idx
+        j = self.find_prev_write_with_value(reg, start_idx, value_u32)
+        return start_idx if j is None else j
+
     def find_next_write(self, reg: str, from_index_inclusive: int) -> Optional[int]:
         lst = self.reg_write_index.get(reg)
         if not lst:
@@ -644,7 +874,46 @@ class TraceParser:
         lst = self.reg_read_index.get(reg, [])
         i = bisect_right(lst, lo_exclusive)
         j = bisect_left(lst, hi_exclusive)
-        return lst[i:j]
+        return list(lst[i:j])
+
+    def mem_accesses_in_range(self, lo: int, hi: int) -> List[int]:
+        """返回有效地址落在 [lo, hi] 内的访存事件索引（按事件顺序）。
+
+        首次调用时对全部访存事件求一次 effective_address，按地址排序成两个并行数组；
+        之后每次查询只需两次二分。
+        """
+        self._ensure_mem_addr_index()
+        addrs, idxs = self._mem_addr_index
+        i = bisect_left(addrs, lo)
+        j = bisect_right(addrs, hi)
+        return sorted(idxs[i:j])
+
+    def mem_rw_kind(self, idx: int) -> str:
+        """返回访存事件的方向：以 str 开头为 'W'，其余含 str/ldr 的为 'R'，其它（含 stp/ldp/stur/ldur）为空串。"""
+        self._ensure_mem_addr_index()
+        flags = self._mem_rw_flags
+        if idx < 0 or idx >= len(flags):
+            return ''
+        return _MEM_RW_TEXT[flags[idx]]
+
+    def _ensure_mem_addr_index(self) -> None:
+        key = (id(self.events), len(self.events))
+        if self._mem_addr_index_key == key:
+            return
+        pairs = []
+        flags = bytearray(len(self.events))
+        for i, ev in enumerate(self.events):
+            eff = self.effective_address(i)
+            if eff is not None:
+                pairs.append((eff, i))
+                # 与原先内存搜索的过滤保持一致：asm 中含 str/ldr 即算，以 str 开头记为写
+                asm = ev.asm.lower()
+                if 'str' in asm or 'ldr' in asm:
+                    flags[i] = 2 if asm.startswith('str') else 1
+        pairs.sort()
+        self._mem_addr_index = (array('Q', [a for a, _ in pairs]), array('i', [i for _, i in pairs]))
+        self._mem_rw_flags = flags
+        self._mem_addr_index_key = key
 
     def build_value_chain_fast(self, reg: str, start_idx: int, value_u32: int, side: str = '执行前') -> List[int]:
         """基于倒排索引快速构建链路：找到将寄存器置为 value 的写入点，然后收集之后的读取直到该值被覆盖。
@@ -654,25 +923,8 @@ class TraceParser:
         """
         n = len(self.events)
         start_idx = max(0, min(start_idx, n - 1))
-        # 定位写入点
-        writer_idx: Optional[int] = None
-        if side == '执行后':
-            ev = self.events[start_idx]
-            v_here = self._get_write_value(ev, reg)
-            if v_here is not None and (v_here & 0xFFFFFFFF) == (value_u32 & 0xFFFFFFFF):
-                writer_idx = start_idx
-        if writer_idx is None:
-            j = self.find_prev_write(reg, start_idx)
-            while j is not None:
-                evj = self.events[j]
-                val = self._get_write_value(evj, reg)
-                if val is not None and (val & 0xFFFFFFFF) == (value_u32 & 0xFFFFFFFF):
-                    writer_idx = j
-                    break
-                j = self.find_prev_write(reg, j)
-        if writer_idx is None:
-            # 兜底：从起点直接开始
-            writer_idx = start_idx
+        # 定位写入点（找不到时兜底：从起点直接开始）
+        writer_idx = self._locate_value_writer(reg, start_idx, value_u32, side)
 
         chain: List[int] = []
         # 向后追加当前 writer
@@ -697,27 +949,21 @@ class TraceParser:
         back.reverse()
         chain = back + chain
 
-        # 找到下一个覆盖该寄存器值的写入（不同值）
-        nxt = self.find_next_write(reg, writer_idx + 1)
-        cutoff = nxt if nxt is not None else n
-        # 读取事件（在 writer 与 cutoff 之间）
-        reads = self.read_indices_in_range(reg, writer_idx, cutoff)
-        chain.extend(reads)
-        # 如果期间存在相同值的重复写入，也加入链路并延长 cutoff
-        k = nxt
-        while k is not None:
-            evk = self.events[k]
-            valk = self._get_write_value(evk, reg)
-            if valk is None:
-                break
-            if (valk & 0xFFFFFFFF) != (value_u32 & 0xFFFFFFFF):
+        # 找到下一个覆盖该寄存器值的写入（不同值）；期间相同值的重复写入也加入链路并延长 cutoff。
+        # 直接在写值列上前进，不再逐个写入点查 dict
+        w_idxs, w_vals = self.reg_value_columns(reg, writes=True)
+        v32 = value_u32 & 0xFFFFFFFF
+        pos = bisect_right(w_idxs, writer_idx)
+        prev = writer_idx
+        while True:
+            nxt = w_idxs[pos] if pos < len(w_idxs) else None
+            # 读取事件（在上一写入点与下一覆盖之间）
+            chain.extend(self.read_indices_in_range(reg, prev, nxt if nxt is not None else n))
+            if nxt is None or w_vals[pos] != v32:
                 break
-            chain.append(k)
-            k2 = self.find_next_write(reg, k + 1)
-            # 追加该写入之后到下一覆盖前的读取
-            reads2 = self.read_indices_in_range(reg, k, k2 if k2 is not None else n)
-            chain.extend(reads2)
-            k = k2
+            chain.append(nxt)
+            prev = nxt
+            pos += 1
         # 去重并排序
         chain = sorted(set(chain))
         return chain
@@ -897,24 +1143,8 @@ class TraceParser:
         # 先拿到基本链（含写入点与后续读取），用于兜底与并集
         base_chain = set(self.build_value_chain_fast(reg, start_idx, value_u32 & 0xFFFFFFFF, side))
 
-        # 定位写入点（复用快速链路中的逻辑片段）
-        writer_idx: Optional[int] = None
-        if side == '执行后':
-            ev = self.events[start_idx]
-            v_here = self._get_write_value(ev, reg)
-            if v_here is not None and (v_here & 0xFFFFFFFF) == (value_u32 & 0xFFFFFFFF):
-                writer_idx = start_idx
-        if writer_idx is None:
-            j = self.find_prev_write(reg, start_idx)
-            while j is not None:
-                evj = self.events[j]
-                val = self._get_write_value(evj, reg)
-                if val is not None and (val & 0xFFFFFFFF) == (value_u32 & 0xFFFFFFFF):
-                    writer_idx = j
-                    break
-                j = self.find_prev_write(reg, j)
-        if writer_idx is None:
-            writer_idx = start_idx
+        # 定位写入点（与快速链路相同）
+        writer_idx = self._locate_value_writer(reg, start_idx, value_u32, side)
 
         writer_ev = self.events[writer_idx]
         s = writer_ev.asm.lower()
@@ -1112,9 +1342,12 @@ class TraceParser:
                                reg: str,
                                start_idx: int,
                                side: str = '执行后',
-                               max_nodes: int = 4000) -> Tuple[List[int], List[Tuple[str, int, int, str]]]:
+                               max_nodes: int = 4000,
+                               should_stop: Optional[Callable[[], bool]] = None) -> Tuple[List[int], List[Tuple[str, int, int, str]]]:
         """与 build_provenance_backtrace 类似，但同时返回边集合。
 
+        should_stop：可选的取消回调，每处理一个节点询问一次，返回 True 时带着已收集的部分结果返回。
+
         返回：
           nodes: 事件索引（有序、去重）
           edges: 列表 (etype, src_idx, dst_idx, meta)
@@ -1165,6 +1398,8 @@ class TraceParser:
 
         guard = 0
         while work and guard < max_nodes:
+            if should_stop is not None and should_stop():
+                break
             guard += 1
             cur_reg, cur_idx = work.pop()
             key = (cur_reg, cur_idx)
@@ -1431,6 +1666,10 @@ class TraceParser:
             width: 访存宽度（字节数）
         """
         base = base_addr & 0xFFFFFFFF
+        if base + width <= 0x100000000:
+            # 不跨 32 位地址回绕时整段一次写入（在 C 层遍历 range）
+            tainted_mem.update(range(base, base + width))
+            return
         for offset in range(width):
             tainted_mem.add((base + offset) & 0xFFFFFFFF)
     
@@ -1446,6 +1685,8 @@ class TraceParser:
             如果访问范围内有任何字节被污染，返回True
         """
         base = base_addr & 0xFFFFFFFF
+        if base + width <= 0x100000000:
+            return not tainted_mem.isdisjoint(range(base, base + width))
         for offset in range(width):
             if ((base + offset) & 0xFFFFFFFF) in tainted_mem:
                 return True
@@ -1670,6 +1911,65 @@ class TraceParser:
         s = asm.lower().strip()
         return s.startswith('adrp ')
 
+    def _op_kind(self, ev: TraceEvent) -> int:
+        """返回事件的指令类别（_OP_*），首次计算后缓存在事件上。
+
+        与 _is_*_op 系列判断一致：str*/ldr*/stm*/ldm* 按前缀，其余需完整助记符且带操作数。
+        """
+        k = ev.op_kind
+        if k >= 0:
+            return k
+        s = ev.asm.lower()
+        mn, sep, _ = s.partition(' ')
+        k = _OP_BY_MNEMONIC.get(mn, _OP_OTHER) if sep else _OP_OTHER
+        if k == _OP_OTHER:
+            if s.startswith('ldr'):
+                k = _OP_LDR
+            elif s.startswith('str'):
+                k = _OP_STR
+            elif s.startswith('stm'):
+                k = _OP_STM
+            elif s.startswith('ldm'):
+                k = _OP_LDM
+        if k in _OP_MEM_SINGLE:
+            ev.access_width = self._get_mem_access_width(s)
+        ev.op_kind = k
+        return k
+
+    def _scan_indices(self, start: int, same_call_only: bool, max_steps: int,
+                      backward: bool = False) -> Sequence[int]:
+        """返回污点循环要访问的事件索引序列（已按 max_steps 截断）。
+
+        same_call_only 时直接取调用实例索引中的对应区间，循环体内不再逐条比较 call_id，
+        也不必维护步数计数。
+        """
+        n = len(self.events)
+        max_steps = max(0, int(max_steps))
+        if not same_call_only:
+            if backward:
+                return range(start, max(-1, start - max_steps), -1)
+            return range(start, min(n, start + max_steps))
+        key = (id(self.events), n)
+        if self._call_index_key != key:
+            tmp: Dict[int, List[int]] = {}
+            for idx, ev in enumerate(self.events):
+                tmp.setdefault(ev.call_id, []).append(idx)
+            self._call_index = {cid: array('i', lst) for cid, lst in tmp.items()}
+            self._call_index_key = key
+        lst = self._call_index.get(self.events[start].call_id, ())
+        if backward:
+            pos = bisect_right(lst, start)
+            return lst[max(0, pos - max_steps):pos][::-1]
+        pos = bisect_left(lst, start)
+        return lst[pos:pos + max_steps]
+
+    def _event_effaddr(self, i: int, ev: TraceEvent) -> Optional[int]:
+        """优先取解析阶段预计算的有效地址，缺失时再走 effective_address（含 LRU）。"""
+        eff = ev.effaddr
+        if eff is None:
+            eff = self.effective_address(i)
+        return eff
+
     def _is_constant_pool_load(self, event_index: int, reg: str) -> bool:
         """判断是否从常量池加载（可视为污点清洗的特殊情况）。
         
@@ -2010,6 +2310,9 @@ class TraceParser:
         - str：若源寄存器是污点，则有效地址对应的内存被标记为污点；
         - 立即数覆盖：若对寄存器的写入仅来自立即数（_is_immediate_write）且不依赖污点输入，则视为清洗该寄存器的污点；
         - 命中：凡读取或写入涉及污点（含传播/覆盖/清洗）之事件，均计入结果。
+
+        按 enable_memory_taint 只分派一次到专用内核：关闭内存污点时走 _taint_forward_regs_only，
+        循环内不再计算有效地址、也不做任何内存污点查询/标记。
         """
         n = len(self.events)
         if n == 0:
@@ -2020,26 +2323,44 @@ class TraceParser:
         for r in (source_regs or ()):  # type: ignore[assignment]
             for a in self._alias_names((r or '').lower()):
                 tainted_regs.add(a)
-        tainted_mem = set(int(a) & 0xFFFFFFFF for a in source_mem_addrs)
-        hits: List[int] = []
-        steps = 0
-        base_call = self.events[i0].call_id
+        if enable_memory_taint:
+            tainted_mem = set(int(a) & 0xFFFFFFFF for a in source_mem_addrs)
+            hits = self._taint_forward_full(i0, tainted_regs, tainted_mem, same_call_only, max_steps)
+        else:
+            hits = self._taint_forward_regs_only(i0, tainted_regs, same_call_only, max_steps)
 
-        for i in range(i0, n):
-            if steps >= max_steps:
-                break
-            ev = self.events[i]
-            if same_call_only and ev.call_id != base_call:
+        # 去重并保持顺序
+        seen = set()
+        ordered = []
+        for k in hits:
+            if k in seen:
                 continue
-            steps += 1
+            seen.add(k)
+            ordered.append(k)
+        return ordered
+
+    def _taint_forward_full(self, i0: int, tainted_regs: set, tainted_mem: set,
+                            same_call_only: bool, max_steps: int) -> List[int]:
+        """taint_forward 完整内核：寄存器 + 字节级内存污点。tainted_regs/tainted_mem 原地更新。"""
+        events = self.events
+        hits: List[int] = []
+        # 热循环内频繁调用的方法先绑定到局部变量，省去每次的属性查找
+        alias = self._alias_names
+        op_kind = self._op_kind
+        eff_at = self._event_effaddr
+        mem_tainted = self._check_memory_tainted
+        mark_mem = self._mark_memory_tainted
+
+        for i in self._scan_indices(i0, same_call_only, max_steps):
+            ev = events[i]
             used = False
 
             # 读取命中（考虑别名）
-            for r in ev.reads.keys():
+            for r in ev.reads_keys:
                 if r in tainted_regs:
                     used = True
                     break
-                for a in self._alias_names(r):
+                for a in alias(r):
                     if a in tainted_regs:
                         used = True
                         break
@@ -2048,21 +2369,21 @@ class TraceParser:
 
             # ldr 命中（从污点内存加载）- 支持字节级检测
             asm = ev.asm.lower()
-            eff = None
-            if asm.startswith('ldr'):
-                eff = self.effective_address(i)
-                if eff is not None:
-                    # 使用字节级检测：只要访问范围内有任何字节被污染就命中
-                    width = self._get_mem_access_width(asm)
-                    if self._check_memory_tainted(tainted_mem, eff, width):
-                        used = True
+            kind = op_kind(ev)
+            mem_hit = False
+            if kind in _OP_LOADS:
+                eff = eff_at(i, ev)
+                # 使用字节级检测：只要访问范围内有任何字节被污染就命中
+                if eff is not None and mem_tainted(tainted_mem, eff, ev.access_width):
+                    mem_hit = True
+                    used = True
 
             # 写入传播/清洗
-            if ev.writes:
-                for rd in list(ev.writes.keys()):
+            if ev.writes_keys:
+                for rd in ev.writes_keys:
                     # 0) 特殊恒等归约：将值置零，独立于输入 -> 清洗污点
                     if self._is_constant_zero_write(ev, rd):
-                        for a in self._alias_names(rd):
+                        for a in alias(rd):
                             if a in tainted_regs:
                                 tainted_regs.discard(a)
                             used = True
@@ -2070,43 +2391,38 @@ class TraceParser:
                         continue
                     propagated = False
                     # 1) 来自污点寄存器的传播
-                    for rn in ev.reads.keys():
+                    for rn in ev.reads_keys:
                         if rn in tainted_regs:
                             propagated = True
                             break
-                        for a in self._alias_names(rn):
+                        for a in alias(rn):
                             if a in tainted_regs:
                                 propagated = True
                                 break
                         if propagated:
                             break
-                    # 2) ldr 从污点内存传播 - 支持字节级检测
-                    if not propagated and asm.startswith('ldr'):
-                        if eff is None:
-                            eff = self.effective_address(i)
-                        if eff is not None:
-                            width = self._get_mem_access_width(asm)
-                            if self._check_memory_tainted(tainted_mem, eff, width):
-                                propagated = True
+                    # 2) ldr 从污点内存传播（写入循环内内存污点不变，复用上面的检测结果）
+                    if not propagated and mem_hit:
+                        propagated = True
                     # 3) 特殊指令：位域操作、乘法、单目指令 - 都需要传播污点
                     # 这些指令如果读取寄存器包含污点，则写入也被污染
                     # （上面步骤1已处理，此处无需额外逻辑）
                     
                     if propagated:
-                        for a in self._alias_names(rd):
+                        for a in alias(rd):
                             if a not in tainted_regs:
                                 tainted_regs.add(a)
                         used = True
                     else:
                         # 4) 立即数覆盖清洗（不依赖污点输入）
                         if self._is_immediate_write(ev, rd):
-                            for a in self._alias_names(rd):
+                            for a in alias(rd):
                                 if a in tainted_regs:
                                     tainted_regs.discard(a)
                                 used = True
                         # 5) 常量池加载清洗
                         elif self._is_constant_pool_load(i, rd):
-                            for a in self._alias_names(rd):
+                            for a in alias(rd):
                                 if a in tainted_regs:
                                     tainted_regs.discard(a)
                                 used = True
@@ -2114,45 +2430,49 @@ class TraceParser:
                         # 注意：bfc不完全清洗寄存器，只清零部分位
                         # 保守策略：保留污点但标记为已访问
                         elif self._is_partial_bitfield_clear(ev, rd):
-                            if any(a in tainted_regs for a in self._alias_names(rd)):
+                            if any(a in tainted_regs for a in alias(rd)):
                                 used = True
                         # 7) ARM64: cset/csetm指令清洗（设置0或1常量）
-                        elif self._is_conditional_set_op(asm):
-                            for a in self._alias_names(rd):
+                        elif kind == _OP_CSET:
+                            for a in alias(rd):
                                 if a in tainted_regs:
                                     tainted_regs.discard(a)
                                 used = True
                         # 8) ARM64: adrp指令清洗（地址常量）
-                        elif self._is_adrp_op(asm):
-                            for a in self._alias_names(rd):
+                        elif kind == _OP_ADRP:
+                            for a in alias(rd):
                                 if a in tainted_regs:
                                     tainted_regs.discard(a)
                                 used = True
                         # 9) ARM64: movk指令（部分位修改，保守策略：保留污点）
-                        elif self._is_movk_op(asm):
+                        elif kind == _OP_MOVK:
                             # movk只修改16位，其他位保持不变
                             # 如果寄存器已被污染，保持污点状态
-                            if any(a in tainted_regs for a in self._alias_names(rd)):
+                            if any(a in tainted_regs for a in alias(rd)):
                                 used = True  # 标记使用但不改变污点状态
 
+            # 指令类别单一分派：普通数据处理/搬运（_OP_OTHER）直接跳过
+            if kind == _OP_OTHER:
+                pass
+
             # store 传播到内存 - 支持字节级污点标记
-            if asm.startswith('str'):
-                eff2 = self.effective_address(i)
+            elif kind == _OP_STR:
+                eff2 = eff_at(i, ev)
                 if eff2 is not None:
                     src_reg = self._parse_store_value_reg(asm)
-                    if src_reg and (src_reg in tainted_regs or any(a in tainted_regs for a in self._alias_names(src_reg))):
+                    if src_reg and (src_reg in tainted_regs or any(a in tainted_regs for a in alias(src_reg))):
                         # 标记整个访存范围为污点
-                        width = self._get_mem_access_width(asm)
-                        self._mark_memory_tainted(tainted_mem, eff2, width)
+                        width = ev.access_width
+                        mark_mem(tainted_mem, eff2, width)
                         used = True
             
             # === 多寄存器指令处理 ===
             
             # 1. push指令：污点寄存器传播到栈内存
-            if asm.startswith('push '):
+            elif kind == _OP_PUSH:
                 reg_list = self._parse_register_list(asm)
                 for reg in reg_list:
-                    if reg in tainted_regs or any(a in tainted_regs for a in self._alias_names(reg)):
+                    if reg in tainted_regs or any(a in tainted_regs for a in alias(reg)):
                         # push指令将寄存器写入栈，需要标记相应内存为污点
                         # 注：这里简化处理，实际地址计算需要SP值，此处仅标记污点传播发生
                         used = True
@@ -2161,64 +2481,64 @@ class TraceParser:
                         # 实际应用中可能需要复原SP值来精确标记地址
                         
             # 2. pop指令：栈内存传播到寄存器
-            elif asm.startswith('pop '):
+            elif kind == _OP_POP:
                 reg_list = self._parse_register_list(asm)
                 # pop将栈内存加载到寄存器
                 # 如果栈内存被污染，传播到目标寄存器
                 # 简化处理：如果有任何污点寄存器或内存，保守地假设可能通过栈传播
                 if tainted_mem:  # 如果有污点内存（可能包含栈）
                     for reg in reg_list:
-                        for a in self._alias_names(reg):
+                        for a in alias(reg):
                             if a not in tainted_regs:
                                 tainted_regs.add(a)
                         used = True
                         
             # 3. stm/stmia/stmdb等：多寄存器存储
-            elif asm.startswith('stm'):
+            elif kind == _OP_STM:
                 reg_list = self._parse_register_list(asm)
                 for reg in reg_list:
-                    if reg in tainted_regs or any(a in tainted_regs for a in self._alias_names(reg)):
+                    if reg in tainted_regs or any(a in tainted_regs for a in alias(reg)):
                         used = True
                         # 类似store，传播到内存
                         
             # 4. ldm/ldmia/ldmdb等：多寄存器加载
-            elif asm.startswith('ldm'):
+            elif kind == _OP_LDM:
                 reg_list = self._parse_register_list(asm)
                 # 如果从污点内存加载，传播到所有目标寄存器
                 if tainted_mem:
                     for reg in reg_list:
-                        for a in self._alias_names(reg):
+                        for a in alias(reg):
                             if a not in tainted_regs:
                                 tainted_regs.add(a)
                         used = True
                         
             # 5. strd：双字存储（8字节）
-            elif asm.startswith('strd '):
+            elif kind == _OP_STRD:
                 reg1, reg2 = self._parse_dual_regs(asm)
                 if reg1 and reg2:
                     # 检查两个源寄存器是否有污点
                     tainted = False
                     for reg in [reg1, reg2]:
-                        if reg in tainted_regs or any(a in tainted_regs for a in self._alias_names(reg)):
+                        if reg in tainted_regs or any(a in tainted_regs for a in alias(reg)):
                             tainted = True
                             break
                     if tainted:
                         # 获取有效地址并标记8字节范围
-                        eff3 = self.effective_address(i)
+                        eff3 = eff_at(i, ev)
                         if eff3 is not None:
-                            self._mark_memory_tainted(tainted_mem, eff3, 8)
+                            mark_mem(tainted_mem, eff3, 8)
                         used = True
                         
             # 6. ldrd：双字加载（8字节）
-            elif asm.startswith('ldrd '):
+            elif kind == _OP_LDRD:
                 reg1, reg2 = self._parse_dual_regs(asm)
                 if reg1 and reg2:
                     # 检查内存是否被污染
-                    eff4 = self.effective_address(i)
-                    if eff4 is not None and self._check_memory_tainted(tainted_mem, eff4, 8):
+                    eff4 = eff_at(i, ev)
+                    if eff4 is not None and mem_tainted(tainted_mem, eff4, 8):
                         # 传播到两个目标寄存器
                         for reg in [reg1, reg2]:
-                            for a in self._alias_names(reg):
+                            for a in alias(reg):
                                 if a not in tainted_regs:
                                     tainted_regs.add(a)
                         used = True
@@ -2226,35 +2546,35 @@ class TraceParser:
             # === ARM64特殊指令处理 ===
             
             # 1. csel/csinc/csinv/csneg指令：条件选择，两个源操作数都可能传播污点
-            if self._is_conditional_select_op(asm):
+            elif kind == _OP_CSEL:
                 rd, rn, rm = self._parse_csel_operands(asm)
                 if rd and rn and rm:
                     # 检查rn或rm是否被污染
                     tainted = False
                     for reg in [rn, rm]:
-                        if reg in tainted_regs or any(a in tainted_regs for a in self._alias_names(reg)):
+                        if reg in tainted_regs or any(a in tainted_regs for a in alias(reg)):
                             tainted = True
                             break
                     if tainted:
                         # 传播到rd
-                        for a in self._alias_names(rd):
+                        for a in alias(rd):
                             if a not in tainted_regs:
                                 tainted_regs.add(a)
                         used = True
             
             # 2. madd/msub/smaddl等指令：4个操作数，任一被污染则传播
-            elif self._is_madd_op(asm):
+            elif kind == _OP_MADD:
                 rd, rn, rm, ra = self._parse_madd_operands(asm)
                 if rd and rn and rm and ra:
                     # 检查rn, rm, ra是否被污染
                     tainted = False
                     for reg in [rn, rm, ra]:
-                        if reg in tainted_regs or any(a in tainted_regs for a in self._alias_names(reg)):
+                        if reg in tainted_regs or any(a in tainted_regs for a in alias(reg)):
                             tainted = True
                             break
                     if tainted:
                         # 传播到rd
-                        for a in self._alias_names(rd):
+                        for a in alias(rd):
                             if a not in tainted_regs:
                                 tainted_regs.add(a)
                         used = True
@@ -2262,17 +2582,103 @@ class TraceParser:
             if used:
                 hits.append(i)
 
-        # 去重并保持顺序
-        seen = set()
-        ordered = []
-        for k in hits:
-            if k in seen:
-                continue
-            seen.add(k)
-            ordered.append(k)
-        return ordered
+        return hits
+
+    def _taint_forward_regs_only(self, i0: int, tainted_regs: set,
+                                 same_call_only: bool, max_steps: int) -> List[int]:
+        """taint_forward 仅寄存器内核（enable_memory_taint=False）。
+
+        与 _taint_forward_full 的寄存器规则一致，但去掉了 ldr/str/push/pop/stm/ldm/strd/ldrd
+        的有效地址计算与内存污点分支；pop/ldm 在无污点内存时本就不会传播。
+        """
+        events = self.events
+        hits: List[int] = []
+        alias = self._alias_names
+
+        for i in self._scan_indices(i0, same_call_only, max_steps):
+            ev = events[i]
+            used = False
+
+            # 读取命中（考虑别名）；写入传播只依赖该结果，无需逐个目的寄存器重复检查
+            read_hit = False
+            for r in ev.reads_keys:
+                if r in tainted_regs or any(a in tainted_regs for a in alias(r)):
+                    read_hit = True
+                    break
+            if read_hit:
+                used = True
+
+            kind = self._op_kind(ev)
+            if ev.writes:
+                for rd in ev.writes_keys:
+                    if self._is_constant_zero_write(ev, rd):
+                        for a in alias(rd):
+                            tainted_regs.discard(a)
+                        used = True
+                        continue
+                    if read_hit:
+                        for a in alias(rd):
+                            tainted_regs.add(a)
+                        used = True
+                    elif self._is_immediate_write(ev, rd) or self._is_constant_pool_load(i, rd) \
+                            or kind == _OP_CSET or kind == _OP_ADRP:
+                        for a in alias(rd):
+                            tainted_regs.discard(a)
+                        used = True
+                    elif self._is_partial_bitfield_clear(ev, rd) or kind == _OP_MOVK:
+                        # bfc/movk 只修改部分位：保留污点但标记为已访问
+                        if any(a in tainted_regs for a in alias(rd)):
+                            used = True
+
+            # ARM64：csel 族两个源、madd 族三个源，任一污点即传播到 rd
+            if kind == _OP_CSEL:
+                rd, rn, rm = self._parse_csel_operands(ev.asm)
+                srcs = (rn, rm) if (rd and rn and rm) else ()
+            elif kind == _OP_MADD:
+                rd, rn, rm, ra = self._parse_madd_operands(ev.asm)
+                srcs = (rn, rm, ra) if (rd and rn and rm and ra) else ()
+            else:
+                srcs = ()
+            if srcs and any(reg in tainted_regs or any(a in tainted_regs for a in alias(reg)) for reg in srcs):
+                for a in alias(rd):
+                    tainted_regs.add(a)
+                used = True
+
+            if used:
+                hits.append(i)
+
+        return hits
 
     # === 寄存器别名（ARM64）与读写获取 ===
+    def _alias_set(self, name: str) -> FrozenSet[str]:
+        """`_alias_names` 的 frozenset 版本（带缓存），供集合运算直接使用。"""
+        s = self._alias_set_cache.get(name)
+        if s is None:
+            s = frozenset(self._alias_names(name))
+            if len(self._alias_set_cache) < 256:
+                self._alias_set_cache[name] = s
+        return s
+
+    def _alias_bits(self, name: str) -> int:
+        """`_alias_set` 的位图版本：每个寄存器名占一位，返回其别名集合的位掩码。
+
+        名与位一一对应，集合的并/差/相交判断即对应整数的 | / & ~ / &。"""
+        m = self._alias_bits_cache.get(name)
+        if m is None:
+            # 分配新位要读 len(bit_of) 再写入，并发的污点任务须串行，否则两个名可能拿到同一位
+            with self._regs_lock:
+                m = self._alias_bits_cache.get(name)
+                if m is None:
+                    bit_of = self._reg_bit
+                    m = 0
+                    for a in self._alias_set(name):
+                        b = bit_of.get(a)
+                        if b is None:
+                            b = bit_of[a] = 1 << len(bit_of)
+                        m |= b
+                    self._alias_bits_cache[name] = m
+        return m
+
     def _alias_names(self, name: str) -> List[str]:
         """返回寄存器名称的别名集合（含自身）。
         - ARM64: wN/xN 互为别名；fp/lr 与 x29/x30 互通；xzr/wzr 互通
@@ -2377,7 +2783,9 @@ class TraceParser:
                                 max_steps: int = 200000,
                                 enable_memory_taint: bool = True,
                                 enable_implicit_flow: bool = False,
-                                track_constants: bool = True) -> Dict:
+                                track_constants: bool = True,
+                                stop_on_target: bool = False,
+                                should_stop: Optional[Callable[[], bool]] = None) -> Dict:
         """高级污点分析：提供更详细的分析结果和统计信息。
         
         Args:
@@ -2391,6 +2799,9 @@ class TraceParser:
             enable_memory_taint: 是否启用内存污点传播
             enable_implicit_flow: 是否启用隐式控制流污点
             track_constants: 是否跟踪常量传播
+            stop_on_target: 污点首次到达目标后立即停止（只关心“能否到达”时使用；
+                此时 hits/taint_path/statistics 只覆盖到命中目标的那一步）
+            should_stop: 可选的取消回调，每 1024 步询问一次，返回 True 时提前结束并返回部分结果
             
         Returns:
             Dict包含:
@@ -2431,19 +2842,14 @@ class TraceParser:
             "target_hits": 0
         }
         
-        base_call = self.events[i0].call_id
         target_reached = False
-        steps = 0
+        # 快照复用：状态未变化时各 step 共享同一个 frozenset，避免每个命中步都整表拷贝
+        regs_snap: frozenset = frozenset(tainted_regs)
+        mem_snap: frozenset = frozenset(tainted_mem)
+        mem_dirty = False
         
-        for i in range(i0, n):
-            if steps >= max_steps:
-                break
-                
+        for i in _until_stopped(self._scan_indices(i0, same_call_only, max_steps), should_stop):
             ev = self.events[i]
-            if same_call_only and ev.call_id != base_call:
-                continue
-                
-            steps += 1
             statistics["total_steps"] += 1
             used = False
             # 性能优化：只在需要时复制污点状态（减少拷贝开销）
@@ -2451,34 +2857,35 @@ class TraceParser:
                 "event_idx": i,
                 "pc": hex(ev.pc),
                 "asm": ev.asm,
-                "tainted_regs_before": None,  # 延迟拷贝
-                "tainted_mem_before": None,   # 延迟拷贝
+                "tainted_regs_before": None,  # 命中时引用共享快照
+                "tainted_mem_before": None,   # 命中时引用共享快照
                 "propagation_type": None,
                 "target_hit": False
             }
             
             # 检查读取命中
             read_hit_regs = []
-            for r in ev.reads.keys():
+            for r in ev.reads_keys:
                 if r in tainted_regs or any(a in tainted_regs for a in self._alias_names(r)):
                     read_hit_regs.append(r)
                     used = True
                     
             # 检查内存读取命中（ldr指令）- 支持字节级检测
             asm = ev.asm.lower()
+            kind = self._op_kind(ev)
             eff = None
             mem_hit = False
-            if enable_memory_taint and asm.startswith('ldr'):
-                eff = self.effective_address(i)
+            if enable_memory_taint and kind in _OP_LOADS:
+                eff = self._event_effaddr(i, ev)
                 if eff is not None:
-                    width = self._get_mem_access_width(asm)
+                    width = ev.access_width
                     if self._check_memory_tainted(tainted_mem, eff, width):
                         mem_hit = True
                         used = True
                     
             # 处理写入传播
             if ev.writes:
-                for rd in list(ev.writes.keys()):
+                for rd in ev.writes_keys:
                     # 检查是否为常量零写入（清洗）
                     if self._is_constant_zero_write(ev, rd):
                         for a in self._alias_names(rd):
@@ -2492,17 +2899,17 @@ class TraceParser:
                     propagated = False
                     
                     # 寄存器到寄存器传播
-                    for rn in ev.reads.keys():
+                    for rn in ev.reads_keys:
                         if rn in tainted_regs or any(a in tainted_regs for a in self._alias_names(rn)):
                             propagated = True
                             break
                             
                     # 内存到寄存器传播（ldr）- 支持字节级检测
-                    if not propagated and enable_memory_taint and asm.startswith('ldr'):
+                    if not propagated and enable_memory_taint and kind in _OP_LOADS:
                         if eff is None:
-                            eff = self.effective_address(i)
+                            eff = self._event_effaddr(i, ev)
                         if eff is not None:
-                            width = self._get_mem_access_width(asm)
+                            width = ev.access_width
                             if self._check_memory_tainted(tainted_mem, eff, width):
                                 propagated = True
                                 step_info["propagation_type"] = "mem_to_reg"
@@ -2559,7 +2966,7 @@ class TraceParser:
                                 step_info["propagation_type"] = "partial_bitfield_clear"
                                 used = True
                         # ARM64: cset/csetm指令清洗
-                        elif track_constants and self._is_conditional_set_op(asm):
+                        elif track_constants and kind == _OP_CSET:
                             for a in self._alias_names(rd):
                                 if a in tainted_regs:
                                     tainted_regs.discard(a)
@@ -2567,27 +2974,28 @@ class TraceParser:
                                     step_info["propagation_type"] = "cset_cleanup"
                             used = True
                         # ARM64: adrp指令清洗
-                        elif track_constants and self._is_adrp_op(asm):
+                        elif track_constants and kind == _OP_ADRP:
                             for a in self._alias_names(rd):
                                 if a in tainted_regs:
                                     tainted_regs.discard(a)
                                     statistics["cleanups"] += 1
                                     step_info["propagation_type"] = "adrp_cleanup"
                             used = True
-                        # ARM64: movk指令（部分位修改，保留污点）
-                        elif self._is_movk_op(asm):
-                            if any(a in tainted_regs for a in self._alias_names(rd)):
-                                step_info["propagation_type"] = "movk_partial_modify"
-                                used = True
+                        # movk（部分位修改，保留污点）统一在下方的指令类别分派中处理
                             
+            # 指令类别单一分派：普通数据处理/搬运（_OP_OTHER）直接跳过
+            if kind == _OP_OTHER:
+                pass
+
             # 处理存储指令（寄存器到内存传播）- 支持字节级污点标记
-            if enable_memory_taint and asm.startswith('str'):
+            elif kind == _OP_STR and enable_memory_taint:
                 src_reg = self._parse_store_value_reg(asm)
                 if src_reg and (src_reg in tainted_regs or any(a in tainted_regs for a in self._alias_names(src_reg))):
-                    eff2 = self.effective_address(i)
+                    eff2 = self._event_effaddr(i, ev)
                     if eff2 is not None:
-                        width = self._get_mem_access_width(asm)
+                        width = ev.access_width
                         self._mark_memory_tainted(tainted_mem, eff2, width)
+                        mem_dirty = True
                         step_info["propagation_type"] = "reg_to_mem"
                         statistics["memory_propagations"] += 1
                         used = True
@@ -2604,7 +3012,7 @@ class TraceParser:
             # === 多寄存器指令处理（advanced版本） ===
             
             # push指令
-            if enable_memory_taint and asm.startswith('push '):
+            elif kind == _OP_PUSH and enable_memory_taint:
                 reg_list = self._parse_register_list(asm)
                 has_taint = False
                 for reg in reg_list:
@@ -2617,7 +3025,7 @@ class TraceParser:
                     used = True
                     
             # pop指令
-            elif asm.startswith('pop '):
+            elif kind == _OP_POP:
                 reg_list = self._parse_register_list(asm)
                 if enable_memory_taint and tainted_mem:
                     for reg in reg_list:
@@ -2634,7 +3042,7 @@ class TraceParser:
                     used = True
                     
             # stm多寄存器存储
-            elif enable_memory_taint and asm.startswith('stm'):
+            elif kind == _OP_STM and enable_memory_taint:
                 reg_list = self._parse_register_list(asm)
                 has_taint = False
                 for reg in reg_list:
@@ -2647,7 +3055,7 @@ class TraceParser:
                     used = True
                     
             # ldm多寄存器加载
-            elif asm.startswith('ldm'):
+            elif kind == _OP_LDM:
                 reg_list = self._parse_register_list(asm)
                 if enable_memory_taint and tainted_mem:
                     for reg in reg_list:
@@ -2665,7 +3073,7 @@ class TraceParser:
                     used = True
                     
             # strd双字存储
-            elif enable_memory_taint and asm.startswith('strd '):
+            elif kind == _OP_STRD and enable_memory_taint:
                 reg1, reg2 = self._parse_dual_regs(asm)
                 if reg1 and reg2:
                     has_taint = False
@@ -2674,9 +3082,10 @@ class TraceParser:
                             has_taint = True
                             break
                     if has_taint:
-                        eff3 = self.effective_address(i)
+                        eff3 = self._event_effaddr(i, ev)
                         if eff3 is not None:
                             self._mark_memory_tainted(tainted_mem, eff3, 8)
+                            mem_dirty = True
                             step_info["propagation_type"] = "strd_dual_reg"
                             statistics["memory_propagations"] += 1
                             used = True
@@ -2690,10 +3099,10 @@ class TraceParser:
                                     break
                     
             # ldrd双字加载
-            elif asm.startswith('ldrd '):
+            elif kind == _OP_LDRD:
                 reg1, reg2 = self._parse_dual_regs(asm)
                 if reg1 and reg2:
-                    eff4 = self.effective_address(i)
+                    eff4 = self._event_effaddr(i, ev)
                     if enable_memory_taint and eff4 is not None and self._check_memory_tainted(tainted_mem, eff4, 8):
                         for reg in [reg1, reg2]:
                             for a in self._alias_names(reg):
@@ -2712,7 +3121,7 @@ class TraceParser:
             # === ARM64特殊指令处理（advanced版本） ===
             
             # 1. csel/csinc/csinv/csneg指令：条件选择
-            if self._is_conditional_select_op(asm):
+            elif kind == _OP_CSEL:
                 rd, rn, rm = self._parse_csel_operands(asm)
                 if rd and rn and rm:
                     tainted = False
@@ -2734,9 +3143,9 @@ class TraceParser:
                             statistics["target_hits"] += 1
             
             # 2. cset/csetm指令：条件设置常量（清洗）
-            elif self._is_conditional_set_op(asm):
+            elif kind == _OP_CSET:
                 # cset在writes中已处理，此处仅统计
-                for rd in ev.writes.keys():
+                for rd in ev.writes_keys:
                     for a in self._alias_names(rd):
                         if a in tainted_regs:
                             tainted_regs.discard(a)
@@ -2745,7 +3154,7 @@ class TraceParser:
                             used = True
             
             # 3. madd/msub/smaddl等指令：4操作数乘加
-            elif self._is_madd_op(asm):
+            elif kind == _OP_MADD:
                 rd, rn, rm, ra = self._parse_madd_operands(asm)
                 if rd and rn and rm and ra:
                     tainted = False
@@ -2767,15 +3176,15 @@ class TraceParser:
                             statistics["target_hits"] += 1
             
             # 4. movk指令：部分位修改（保留污点）
-            elif self._is_movk_op(asm):
-                for rd in ev.writes.keys():
+            elif kind == _OP_MOVK:
+                for rd in ev.writes_keys:
                     if any(a in tainted_regs for a in self._alias_names(rd)):
                         step_info["propagation_type"] = "movk_partial_modify"
                         used = True
             
             # 5. adrp指令：地址常量（清洗）
-            elif self._is_adrp_op(asm):
-                for rd in ev.writes.keys():
+            elif kind == _OP_ADRP:
+                for rd in ev.writes_keys:
                     for a in self._alias_names(rd):
                         if a in tainted_regs:
                             tainted_regs.discard(a)
@@ -2785,14 +3194,21 @@ class TraceParser:
                             
             if used:
                 hits.append(i)
-                # 只在实际使用时才复制状态信息（性能优化）
-                if step_info["tainted_regs_before"] is None:
-                    step_info["tainted_regs_before"] = set()  # 已经变化，用空集代替
-                if step_info["tainted_mem_before"] is None:
-                    step_info["tainted_mem_before"] = set()
-                step_info["tainted_regs_after"] = tainted_regs.copy()
-                step_info["tainted_mem_after"] = tainted_mem.copy()
+                # 污点状态只会在命中步中变化，上一次快照即为本步之前的状态，直接引用无需拷贝
+                step_info["tainted_regs_before"] = regs_snap
+                step_info["tainted_mem_before"] = mem_snap
+                # 寄存器集合很小，直接比较即可判断是否变化；内存集合只在标记时置脏
+                if tainted_regs != regs_snap:
+                    regs_snap = frozenset(tainted_regs)
+                if mem_dirty:
+                    mem_snap = frozenset(tainted_mem)
+                    mem_dirty = False
+                step_info["tainted_regs_after"] = regs_snap
+                step_info["tainted_mem_after"] = mem_snap
                 taint_path.append(step_info)
+
+            if stop_on_target and target_reached:
+                break
                 
         return {
             "hits": hits,
@@ -2803,6 +3219,55 @@ class TraceParser:
             "final_tainted_mem": list(tainted_mem)
         }
 
+    def reg_value_columns(self, reg: str, writes: bool = False) -> Tuple[Sequence[int], Sequence[int]]:
+        """返回寄存器的 (事件索引列, 值列) 两个并行数组。
+
+        索引列即 reg_read_index/reg_write_index 中的数组；值列为对应事件读到/写入的 32 位值
+        （含别名解析，取不到时为 -1）。按值筛选候选时只需比较整数，不再逐事件查 dict。
+        索引对象被替换或长度变化时自动重建。
+        """
+        reg = (reg or '').lower()
+        index = self.reg_write_index if writes else self.reg_read_index
+        idxs = index.get(reg) or ()
+        key = (reg, writes)
+        cols = self._reg_value_cols.get(key)
+        if cols is not None and cols[0] is idxs and len(cols[1]) == len(idxs):
+            return cols
+        getter = self._get_write_value if writes else self._get_read_value
+        events = self.events
+        vals = array('q')
+        for i in idxs:
+            try:
+                v = getter(events[i], reg)
+            except Exception:
+                v = None
+            vals.append(-1 if v is None else (v & 0xFFFFFFFF))
+        cols = (idxs, vals)
+        self._reg_value_cols[key] = cols
+        return cols
+
+    def reg_value_postings(self, reg: str, writes: bool = False) -> Dict[int, Sequence[int]]:
+        """返回寄存器的值倒排表：32 位值 -> 读到/写入该值的事件索引（有序 array('i')）。
+
+        由 reg_value_columns 派生并随其失效；取不到值（-1）的事件不入表。
+        """
+        reg = (reg or '').lower()
+        idxs, vals = self.reg_value_columns(reg, writes)
+        key = (reg, writes)
+        cached = self._reg_value_postings.get(key)
+        if cached is not None and cached[0] is vals:
+            return cached[1]
+        postings: Dict[int, Sequence[int]] = {}
+        for i, v in zip(idxs, vals):
+            if v < 0:
+                continue
+            lst = postings.get(v)
+            if lst is None:
+                lst = postings[v] = array('i')
+            lst.append(i)
+        self._reg_value_postings[key] = (vals, postings)
+        return postings
+
     def find_value_candidates(self, reg: str, value: int, *, side: str = '任意') -> List[Tuple[int, 'TraceEvent']]:
         """查找所有匹配指定寄存器和值的事件候选。
         
@@ -2825,33 +3290,15 @@ class TraceParser:
         want_reads = side_norm in ('执行前', '任意')
         want_writes = side_norm in ('执行后', '任意')
 
-        # 从读索引中查找（执行前）
-        if want_reads:
-            for idx in (self.reg_read_index.get(reg, []) or []):
-                if idx in seen:
-                    continue
-                ev = self.events[idx]
-                try:
-                    b = self._get_read_value(ev, reg)
-                except Exception:
-                    b = ev.reads.get(reg)
-                if b is not None and (b & 0xFFFFFFFF) == value_u32:
-                    candidates.append((idx, ev))
-                    seen.add(idx)
-
-        # 从写索引中查找（执行后）
-        if want_writes:
-            for idx in (self.reg_write_index.get(reg, []) or []):
+        # 读（执行前）/写（执行后）两侧均直接取值倒排表
+        for writes, wanted in ((False, want_reads), (True, want_writes)):
+            if not wanted:
+                continue
+            for idx in self.reg_value_postings(reg, writes).get(value_u32, ()):
                 if idx in seen:
                     continue
-                ev = self.events[idx]
-                try:
-                    a = self._get_write_value(ev, reg)
-                except Exception:
-                    a = ev.writes.get(reg)
-                if a is not None and (a & 0xFFFFFFFF) == value_u32:
-                    candidates.append((idx, ev))
-                    seen.add(idx)
+                candidates.append((idx, self.events[idx]))
+                seen.add(idx)
         
         # 按索引排序（即按执行顺序）
         candidates.sort(key=lambda x: x[0])
@@ -2899,17 +3346,9 @@ class TraceParser:
         if reg in param_regs_32 or reg in param_regs_64:
             # 简单启发：若该寄存器在此之前很久没写入（>50条指令），可能是参数
             if idx > 50:
-                # 向前查找最近的写入
-                found_write = False
-                for j in range(idx - 1, max(0, idx - 50), -1):
-                    if reg in self.events[j].writes:
-                        for a in self._alias_names(reg):
-                            if a in self.events[j].writes:
-                                found_write = True
-                                break
-                        if found_write:
-                            break
-                if not found_write:
+                # 向前查找最近的写入（写倒排索引上二分，替代逐条回扫）
+                prev_w = self.find_prev_write(reg, idx)
+                if prev_w is None or prev_w <= idx - 50:
                     return "源头·参数"
         
         # 5. 系统调用返回（svc 后的 r0/x0）
@@ -2935,7 +3374,8 @@ class TraceParser:
                       target_value: Optional[int] = None,
                       same_call_only: bool = False,
                       max_steps: int = 100000,
-                      enable_memory_taint: bool = True) -> List[int]:
+                      enable_memory_taint: bool = True,
+                      should_stop: Optional[Callable[[], bool]] = None) -> List[int]:
         """反向污点分析：从目标事件向前追踪值的来源。
         
         算法核心：
@@ -2951,6 +3391,7 @@ class TraceParser:
             same_call_only: 是否仅在同一调用内分析
             max_steps: 最大分析步数
             enable_memory_taint: 是否启用内存污点追踪
+            should_stop: 可选的取消回调，每 1024 步询问一次，返回 True 时提前结束并返回部分结果
             
         Returns:
             命中的事件索引列表（降序：最早的来源在前）
@@ -2962,104 +3403,84 @@ class TraceParser:
         start_idx = max(0, min(start_idx, n - 1))
         target_reg = target_reg.lower()
         
+        # 寄存器污点状态用位图表示（见 _alias_bits），并/差/相交都是单次整数运算
+        bits = self._alias_bits
         # 初始化污点状态：目标寄存器及其别名
-        tainted_regs: set[str] = set()
-        for a in self._alias_names(target_reg):
-            tainted_regs.add(a)
+        tainted_regs = bits(target_reg)
         
         tainted_mem: set[int] = set()  # 污点内存地址
         hits: List[int] = []  # 命中的事件索引
-        terminated_regs: set[str] = set()  # 已到达终止条件的寄存器（不再追踪）
-        
-        steps = 0
-        base_call = self.events[start_idx].call_id
-        
-        # 反向遍历：从 start_idx 向前到 0
-        for i in range(start_idx, -1, -1):
-            if steps >= max_steps:
-                break
-            
+        terminated_regs = 0  # 已到达终止条件的寄存器（不再追踪）
+        # 待追踪工作集：已污染且尚未终止的寄存器。工作集与污点内存都为空时，
+        # 后续事件不可能再命中，可提前结束遍历
+        live_regs = tainted_regs
+        
+        # 反向遍历：从 start_idx 向前到 0（同调用限制与步数上限已体现在索引序列中）
+        for i in _until_stopped(self._scan_indices(start_idx, same_call_only, max_steps, backward=True),
+                                should_stop):
             ev = self.events[i]
-            
-            # 同调用限制
-            if same_call_only and ev.call_id != base_call:
-                continue
-            
-            steps += 1
             used = False
-            asm = ev.asm.lower()
+            kind = self._op_kind(ev)
             
             # === 反向传播核心逻辑 ===
             
             # 1. 处理写入：若写入污点寄存器，则读取的寄存器变为污点
             if ev.writes:
-                for rd in list(ev.writes.keys()):
-                    # 检查是否写入了污点寄存器
-                    is_tainted_write = False
-                    for a in self._alias_names(rd):
-                        if a in tainted_regs and a not in terminated_regs:
-                            is_tainted_write = True
-                            break
-                    
-                    if is_tainted_write:
+                for rd in ev.writes_keys:
+                    # 检查是否写入了污点寄存器（别名已并入掩码，不逐个别名循环）
+                    if live_regs & bits(rd):
                         used = True
                         
                         # 检查终止条件
                         term_reason = self._check_backward_termination(i, rd)
                         if term_reason:
                             # 到达源头，标记该寄存器为终止
-                            for a in self._alias_names(rd):
-                                terminated_regs.add(a)
+                            rd_bits = bits(rd)
+                            terminated_regs |= rd_bits
+                            live_regs &= ~rd_bits
                             # 记录命中但不继续传播
                             continue
                         
                         # 反向传播：将读取的寄存器标记为污点
-                        for rn in ev.reads.keys():
-                            for a in self._alias_names(rn):
-                                if a not in tainted_regs:
-                                    tainted_regs.add(a)
+                        for rn in ev.reads_keys:
+                            new = bits(rn) & ~tainted_regs
+                            if new:
+                                tainted_regs |= new
+                                live_regs |= new & ~terminated_regs
                         
                         # 特殊：ldr 指令，地址寄存器和内存都变为污点
-                        if asm.startswith('ldr') and enable_memory_taint:
-                            eff = self.effective_address(i)
+                        if kind in _OP_LOADS and enable_memory_taint:
+                            eff = self._event_effaddr(i, ev)
                             if eff is not None:
-                                width = self._get_mem_access_width(asm)
-                                self._mark_memory_tainted(tainted_mem, eff, width)
+                                self._mark_memory_tainted(tainted_mem, eff, ev.access_width)
             
             # 2. 处理读取：若读取污点寄存器，记录命中
-            for rn in ev.reads.keys():
-                read_tainted = False
-                for a in self._alias_names(rn):
-                    if a in tainted_regs and a not in terminated_regs:
-                        read_tainted = True
+            if not used:
+                for rn in ev.reads_keys:
+                    if live_regs & bits(rn):
+                        used = True
                         break
-                if read_tainted:
-                    used = True
-                    break
             
             # 3. 处理内存：str 到污点内存 → 源寄存器变污点
-            if enable_memory_taint and asm.startswith('str'):
-                eff = self.effective_address(i)
+            if tainted_mem and (kind == _OP_STR or kind == _OP_STRD):
+                eff = self._event_effaddr(i, ev)
                 if eff is not None:
-                    width = self._get_mem_access_width(asm)
-                    if self._check_memory_tainted(tainted_mem, eff, width):
+                    if self._check_memory_tainted(tainted_mem, eff, ev.access_width):
                         used = True
-                        # 将 str 的源寄存器标记为污点
-                        src_reg = self._parse_store_value_reg(asm)
-                        if src_reg:
-                            for a in self._alias_names(src_reg):
-                                if a not in tainted_regs:
-                                    tainted_regs.add(a)
-                        # 地址寄存器也可能是污点来源
-                        for rn in ev.reads.keys():
-                            for a in self._alias_names(rn):
-                                if a not in tainted_regs:
-                                    tainted_regs.add(a)
+                        # 将 str 的源寄存器标记为污点；地址寄存器也可能是污点来源
+                        src_reg = self._parse_store_value_reg(ev.asm.lower())
+                        for r in ([src_reg] if src_reg else []) + list(ev.reads_keys):
+                            new = bits(r) & ~tainted_regs
+                            if new:
+                                tainted_regs |= new
+                                live_regs |= new & ~terminated_regs
             
             # 4. ldr 从污点内存 → 继续追踪（已在写入处理中覆盖）
             
             if used:
                 hits.append(i)
+                if not live_regs and not tainted_mem:
+                    break
         
         # 返回降序结果（最早的来源在前）
         hits.reverse()
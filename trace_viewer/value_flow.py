@@ -1,8 +1,185 @@
+import heapq
 import re
 import time
-from typing import List, Tuple, Optional, Dict
+import weakref
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import List, Tuple, Optional, Dict, Iterable, Iterator
 from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
 from PyQt6 import QtCore, QtGui, QtWidgets
+try:
+    from .code_export import (_ASM_RE, _C_HEADER, _PY_HEADER, _split_shift, _fuse_shift_operands, _reg_sort_key,
+                              _bitop_c_expr_cached, _bitop_py_stmt_cached, _c_replay_lines)
+except Exception:
+    from code_export import (_ASM_RE, _C_HEADER, _PY_HEADER, _split_shift, _fuse_shift_operands,  # type: ignore
+                             _reg_sort_key, _bitop_c_expr_cached, _bitop_py_stmt_cached, _c_replay_lines)
+try:
+    from .workers import PoolTask
+except Exception:
+    from workers import PoolTask  # type: ignore
+
+
+# `_bitop_c_expr` 能给出表达式的助记符；其余指令（访存/跳转/比较等）直接跳过正则解析
+_C_SUMMARY_OPS = frozenset((
+    'mov', 'mvn', 'eor', 'orr', 'or', 'and', 'add', 'sub',
+    'rbit', 'clz', 'rev', 'rev16', 'revsh',
+    'ubfx', 'sbfx', 'bfc', 'bfi',
+    'uxtb', 'uxth', 'sxtb', 'sxth', 'sxtah',
+))
+# 移位类允许带 s 后缀（lsls/lsrs/asrs/rors）
+_C_SUMMARY_SHIFT_OPS = frozenset(('lsl', 'lsr', 'asr', 'ror'))
+
+# `_classify_tag` 兜底归为“运算”的助记符
+_ARITH_MNEMS = frozenset(('add', 'sub', 'eor', 'orr', 'or', 'and', 'bic', 'orn', 'mul', 'mla', 'mls',
+                          'lsl', 'lsr', 'asr', 'ror'))
+
+# `_fmt_bitops`：按 asm 前 3 个字符映射运算符简写（'or ' 为两字母 or 加空格）
+_BITOP_PREFIX = {
+    'orr': '|', 'or ': '|', 'and': '&', 'bic': '&~', 'orn': '|~',
+    'add': '+', 'sub': '-', 'rsb': '-',
+}
+# 兜底：指令中出现移位即显示方向，按此顺序检查
+_SHIFT_TOKS = (('lsr', '>>'), ('lsl', '<<'), ('asr', '>>'))
+
+# `_classify_tag` 的助记符类别：每种助记符只判定一次，之后按整数分派
+_MN_OTHER, _MN_LDR, _MN_STR, _MN_SVC, _MN_BL, _MN_MOV, _MN_ARITH = range(7)
+# 兜底分类：类别 -> 标记（svc/bl 在前面已单独处理）
+_MN_FALLBACK_TAG = {_MN_LDR: '读内存', _MN_STR: '写内存', _MN_MOV: '传送', _MN_ARITH: '运算'}
+
+
+@lru_cache(maxsize=None)
+def _mnem_class(mnem: str) -> int:
+    if mnem.startswith('ldr'):
+        return _MN_LDR
+    if mnem.startswith('svc'):
+        return _MN_SVC
+    if mnem == 'bl':
+        return _MN_BL
+    if mnem.startswith('str'):
+        return _MN_STR
+    if mnem.startswith(('mov', 'mvn')):
+        return _MN_MOV
+    if mnem in _ARITH_MNEMS:
+        return _MN_ARITH
+    return _MN_OTHER
+
+
+# EnhancedTaintWorker 的指令类别：按助记符查一次，扫描循环里只做整数比较
+_ENH_OTHER, _ENH_ARITH, _ENH_LOAD, _ENH_STORE, _ENH_COND = range(5)
+_ENH_ARITH_MNEMS = frozenset(('add', 'sub', 'and', 'orr', 'eor', 'mov', 'mul'))
+_ENH_COND_MNEMS = frozenset(('cmp', 'tst'))
+# parser -> 已分类的事件类别数组（只增不改，按需向后补齐；换 trace 会换新的 parser）
+_ENH_OP_CLASSES: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+@lru_cache(maxsize=None)
+def _enh_op_class(mnem: str, has_operands: bool) -> int:
+    """与原先对整行 asm 的前缀判断等价：算术/比较需完整助记符且带操作数，ldr/str/条件跳转按前缀。"""
+    if has_operands and mnem in _ENH_ARITH_MNEMS:
+        return _ENH_ARITH
+    if mnem.startswith('ldr'):
+        return _ENH_LOAD
+    if mnem.startswith('str'):
+        return _ENH_STORE
+    if (has_operands and mnem in _ENH_COND_MNEMS) or mnem.startswith(('b.eq', 'b.ne', 'beq', 'bne')):
+        return _ENH_COND
+    return _ENH_OTHER
+
+
+def _enh_op_classes(parser, hi: int) -> array:
+    """返回覆盖 parser.events[:hi] 的类别数组（按 parser 缓存，多次分析共享）。"""
+    kinds = _ENH_OP_CLASSES.get(parser)
+    if kinds is None:
+        kinds = _ENH_OP_CLASSES[parser] = array('b')
+    if len(kinds) < hi:
+        events = parser.events
+        cls = _enh_op_class
+        for i in range(len(kinds), hi):
+            mn, sep, _ = events[i].asm.partition(' ')
+            kinds.append(cls(mn.lower(), bool(sep)))
+    return kinds
+
+
+_HEX8 = '0x%08x'
+# “低8位”列：0..255 的两位十六进制文本查表，免去逐行格式化
+_LOW8_HEX = tuple('%02x' % i for i in range(256))
+# 导出代码超过该字符数时分批灌入编辑器，每批行数
+_CODE_STREAM_CHARS = 256 * 1024
+_CODE_STREAM_LINES = 2000
+# 批量预取执行前值时，相邻待补行间隔不超过该值就并入同一段连续推进，否则另起一段重新复原
+_PREFETCH_GAP = 256
+
+# 增强污点结果中的汇合点：第 0 列 UserRole+1 置 True，由 _ConfluenceDelegate 统一着色
+_CONFLUENCE_ROLE = QtCore.Qt.ItemDataRole.UserRole + 1
+_CONFLUENCE_BG = QtGui.QBrush(QtGui.QColor(255, 250, 205))  # 浅黄色
+_CONFLUENCE_FG = QtGui.QBrush(QtGui.QColor(139, 69, 19))    # 棕色
+
+
+def _hex8_or_empty(v: Optional[int]) -> str:
+    return '' if v is None else _HEX8 % v
+
+
+# 污点地址输入的单个条目：可带 0x 前缀，一律按十六进制解析
+_ADDR_TOKEN_RE = re.compile(r'(?:0x)?([0-9a-f]+)')
+
+
+def _parse_addr_list(txt: str) -> List[int]:
+    """解析逗号分隔的地址列表；无效条目静默跳过。"""
+    out: List[int] = []
+    for tok in txt.lower().split(','):
+        m = _ADDR_TOKEN_RE.fullmatch(tok.strip())
+        if m:
+            out.append(int(m.group(1), 16))
+    return out
+
+
+# 简要伪代码：op -> 运算符（lsl/lsr 直接保留助记符）
+_PSEUDO_OP_TABLE = {'eor': '^', 'orr': '|', 'and': '&', 'add': '+', 'sub': '-', 'lsl': 'lsl', 'lsr': 'lsr'}
+
+
+
+def _rw_tag(ev, reg: Optional[str]) -> str:
+    """结果行的“读写”列：reg 为空时看事件是否有任何写入/读取。"""
+    if reg:
+        return 'W' if reg in ev.writes else ('R' if reg in ev.reads else '')
+    return 'W' if ev.writes else ('R' if ev.reads else '')
+
+
+def _trace_prefix(ev) -> str:
+    """只导出“汇编之前”的 trace 内容：原始行第一个双引号之前的部分。"""
+    raw = ev.raw
+    if raw:
+        # partition 找到第一个引号即停，不会像 split 那样切完整行
+        return raw.partition('"')[0].rstrip()
+    # 回退：构造到冒号为止
+    return ''.join(('[', ev.timestamp, '][', ev.module, ' ', ev.module_offset, '] [', ev.encoding, '] ',
+                    _HEX8 % ev.pc, ':'))
+
+
+@lru_cache(maxsize=8192)
+def _c_summary(asm: str) -> str:
+    """更精确的 C 表达式摘要。优先用现有解析 `_bitop_c_expr`，
+    未覆盖/访存类返回空字符串。
+
+    结果只取决于 asm 文本；trace 中不同的指令文本通常远少于事件数，
+    渲染长列表时每种指令只解析一次。"""
+    s = asm.lower().split(None, 1)
+    if not s:
+        return ''
+    # 先按助记符一次集合查找分类，未覆盖的指令不再进入正则匹配
+    mn = s[0]
+    if mn not in _C_SUMMARY_OPS and mn.rstrip('s') not in _C_SUMMARY_SHIFT_OPS:
+        return ''
+    try:
+        expr = _bitop_c_expr_cached(asm)
+        # 去掉结尾分号，简洁展示
+        if expr and expr.endswith(';'):
+            expr = expr[:-1]
+        return expr or ''
+    except Exception:
+        return ''
 
 
 class ValueFlowDock(QtWidgets.QDockWidget):
@@ -124,6 +301,10 @@ class ValueFlowDock(QtWidgets.QDockWidget):
         self.list.setColumnWidth(6, 70)
         self.list.setColumnWidth(7, 100)
         self.list.setColumnWidth(8, 150)
+        # 结果为平铺列表：统一行高 + 不绘制根节点装饰，滚动/布局不再逐行测量
+        self.list.setUniformRowHeights(True)
+        self.list.setRootIsDecorated(False)
+        self.list.setItemDelegate(_ConfluenceDelegate(self.list))
         self.list.itemDoubleClicked.connect(self._on_double)
         self.list.itemClicked.connect(self._on_click)
         self._last_jump_ts = 0.0  # 节流
@@ -159,7 +340,31 @@ class ValueFlowDock(QtWidgets.QDockWidget):
         # 异步 Worker
         self._backward_worker: Optional['BackwardTaintWorker'] = None
         self._backward_req_id: int = 0
+        # 大选择导出代码：线程池任务的请求序号，只接收最新一次的结果
+        self._codegen_req_id: int = 0
+        # 反向追踪结果 LRU：(reg, start_idx, match_val, same_call) -> hits；同一 trace 下结果确定
+        self._backward_cache: "OrderedDict[tuple, List[int]]" = OrderedDict()
+        self._backward_cache_cap: int = 64
+        self._backward_pending_key: Optional[tuple] = None
+        # 值链：后台构链 Worker 与结果 LRU，(reg, match_val, side, start_idx) -> indices
+        self._chain_worker: Optional['ChainWorker'] = None
+        self._chain_req_id: int = 0
+        self._chain_cache: "OrderedDict[tuple, List[int]]" = OrderedDict()
+        self._chain_cache_cap: int = 64
+        # 标记列 LRU：(reg, idx) -> tag
+        self._tag_cache: "OrderedDict[Tuple[Optional[str], int], str]" = OrderedDict()
+        self._tag_cache_cap: int = 200000
+        # 值链/溯源行文本 LRU：(idx, reg) -> 除“标记”外的 9 列文本，重复渲染同一链路时免去格式化
+        self._ctx_row_cache: "OrderedDict[Tuple[int, Optional[str]], List[str]]" = OrderedDict()
+        self._ctx_row_cache_cap: int = 20000
+        # 批量渲染期间预取的执行前值：(reg, {idx: before})，由 _prefetch_before 填充，渲染结束即清空
+        self._batch_before: Optional[Tuple[str, Dict[int, Optional[int]]]] = None
+        # 提供 current_event_index() 的主窗口（弱引用缓存，由 _find_anchor_event_index 填充）
+        self._mw_ref: Optional[weakref.ref] = None
         self._taint_worker: Optional['TaintWorker'] = None
+        # 溯源：线程池任务与请求号（新请求使旧任务过期）
+        self._prov_worker: Optional['_ProvenanceWorker'] = None
+        self._prov_req_id: int = 0
 
     def set_font_point_size(self, point_size: int) -> None:
         """统一调整面板内主要控件的字体大小，用于与代码区同步缩放。"""
@@ -186,9 +391,25 @@ class ValueFlowDock(QtWidgets.QDockWidget):
 
     def attach(self, parser, eval_effaddr_cb) -> None:
         self.parser = parser
+        # 换了 trace，旧的反向追踪结果全部失效
+        self._backward_cache.clear()
+        self._backward_pending_key = None
+        self._chain_cache.clear()
+        self._tag_cache.clear()
+        self._ctx_row_cache.clear()
         # 内存对比已禁用，这里保留接口但不使用 eval_effaddr_cb
         self.eval_effaddr_cb = eval_effaddr_cb
 
+    @staticmethod
+    def _stop_worker(worker: Optional[QtCore.QThread]) -> None:
+        """请求仍在运行的上一个 Worker 中断；只有确实在运行时才等待片刻，避免 QThread 销毁警告。"""
+        try:
+            if worker is not None and worker.isRunning():
+                worker.requestInterruption()
+                worker.wait(150)
+        except Exception:
+            pass
+
     def _find_anchor_event_index(self) -> Optional[int]:
         """尽量从主窗口获取“当前代码区锚点”的事件索引。
 
@@ -197,20 +418,23 @@ class ValueFlowDock(QtWidgets.QDockWidget):
         - 历史上曾使用 `_get_current_event_index`，但当前主窗口对外接口是 `current_event_index()`；
         - 这里做父链遍历，找到任意提供上述接口的对象即可。
         """
+        # 0) 上次解析到的提供者（弱引用缓存，避免每次都遍历父链）
+        mw = self._mw_ref() if self._mw_ref is not None else None
+        if mw is not None:
+            idx = self._anchor_index_of(mw)
+            if idx is not None:
+                return idx
+            self._mw_ref = None
         # 1) 沿 parent() 链向上找
         w = self
         while w is not None:
-            try:
-                if hasattr(w, 'current_event_index'):
-                    idx = w.current_event_index()  # type: ignore[attr-defined]
-                    if isinstance(idx, int):
-                        return idx
-                if hasattr(w, '_get_current_event_index'):
-                    idx = w._get_current_event_index()  # type: ignore[attr-defined]
-                    if isinstance(idx, int):
-                        return idx
-            except Exception:
-                pass
+            idx = self._anchor_index_of(w)
+            if idx is not None:
+                try:
+                    self._mw_ref = weakref.ref(w)
+                except TypeError:
+                    pass
+                return idx
             try:
                 w = w.parent()  # type: ignore[assignment]
             except Exception:
@@ -226,6 +450,26 @@ class ValueFlowDock(QtWidgets.QDockWidget):
             pass
         return None
 
+    @staticmethod
+    def _anchor_index_of(w) -> Optional[int]:
+        try:
+            if hasattr(w, 'current_event_index'):
+                idx = w.current_event_index()  # type: ignore[attr-defined]
+                if isinstance(idx, int):
+                    return idx
+            if hasattr(w, '_get_current_event_index'):
+                idx = w._get_current_event_index()  # type: ignore[attr-defined]
+                if isinstance(idx, int):
+                    return idx
+        except Exception:
+            pass
+        return None
+
+    def showEvent(self, event) -> None:
+        # 停靠位置/父窗口可能已变化，下次重新沿父链解析
+        self._mw_ref = None
+        super().showEvent(event)
+
     def _on_trace_backward(self, anchor_idx: Optional[int] = None, exact_mode: bool = False) -> None:
         """反向追踪值来源的主入口
         
@@ -263,22 +507,28 @@ class ValueFlowDock(QtWidgets.QDockWidget):
             anchor_pc = anchor_ev.pc
             
             # 查找所有执行该PC地址且寄存器值匹配的事件
+            # 只看执行前的值（reads）：两组索引均有序，按规模较小的一侧驱动匹配
             candidates = []
-            if anchor_pc in self.parser.addr_index:
-                pc_candidates = self.parser.addr_index[anchor_pc]
-                # 过滤出包含目标寄存器且值匹配的事件
-                for idx in pc_candidates:
-                    ev = self.parser.events[idx]
-                    # 检查读取的寄存器
-                    for r, v in ev.reads.items():
-                        if r.lower() == reg and (v & 0xFFFFFFFF) == match_val:
-                            candidates.append((idx, ev))
+            pc_candidates = self.parser.addr_index.get(anchor_pc)
+            if pc_candidates:
+                events = self.parser.events
+                idxs, vals = self.parser.reg_value_columns(reg)
+                n_idx = len(idxs)
+                if len(pc_candidates) <= n_idx:
+                    # 常见情况：该 PC 只执行少数几次，逐个在读值列上二分（下界随之前移）
+                    k = 0
+                    for idx in pc_candidates:
+                        k = bisect_left(idxs, idx, k)
+                        if k >= n_idx:
                             break
-                    else:
-                        # 如果读取中没找到，检查写入的寄存器（写入前的值）
-                        # 注意：这里需要检查的是执行前的值，不是写入后的值
-                        # 所以我们只检查 reads，不检查 writes
-                        pass
+                        if idxs[k] == idx and vals[k] == match_val:
+                            candidates.append((idx, events[idx]))
+                else:
+                    # 热点 PC：执行次数多于该寄存器的读取次数，改为扫描读值列并做集合判定
+                    pc_set = set(pc_candidates)
+                    for k in range(n_idx):
+                        if vals[k] == match_val and idxs[k] in pc_set:
+                            candidates.append((idxs[k], events[idxs[k]]))
             
             if not candidates:
                 QtWidgets.QMessageBox.information(
@@ -327,18 +577,24 @@ class ValueFlowDock(QtWidgets.QDockWidget):
         same_call = bool(self.samecall_chk.isChecked())
         self._backward_req_id += 1
         req_id = self._backward_req_id
+
+        # 命中缓存：直接渲染，不再启动后台线程
+        cache_key = (reg, start_idx, match_val, same_call)
+        cached = self._backward_cache.get(cache_key)
+        if cached is not None:
+            self._backward_cache.move_to_end(cache_key)
+            self._backward_pending_key = None
+            self._on_backward_ready(list(cached), reg, req_id)
+            return
+        self._backward_pending_key = cache_key
         
         self._set_busy(True)
-        try:
-            if self._backward_worker and self._backward_worker.isRunning():
-                self._backward_worker.requestInterruption()
-                self._backward_worker.wait(150)
-        except Exception:
-            pass
-        
-        self._backward_worker = BackwardTaintWorker(self.parser, reg, start_idx, match_val, same_call, req_id)
+        # 旧任务无需等待退出：req_id 前进后它会自行放弃结果
+        self._backward_worker = BackwardTaintWorker(
+            self.parser, reg, start_idx, match_val, same_call, req_id,
+            is_current=lambda rid: rid == self._backward_req_id)
         self._backward_worker.finishedWithBackwardResults.connect(self._on_backward_ready)
-        self._backward_worker.start()
+        QtCore.QThreadPool.globalInstance().start(self._backward_worker)
 
     def _select_candidate_dialog(self, candidates: List[Tuple[int, 'TraceEvent']], reg: str, value: int) -> Optional[int]:
         """弹出对话框让用户从多个候选中选择追踪起点
@@ -357,60 +613,58 @@ class ValueFlowDock(QtWidgets.QDockWidget):
         hint.setStyleSheet('color: #8bd5ff; padding: 5px;')
         lay.addWidget(hint)
         
-        tv = QtWidgets.QTreeWidget()
-        # 显示行号、时间戳、PC、指令和寄存器读取信息
-        tv.setHeaderLabels(['行号', '时间戳', 'PC', '指令', '寄存器读取'])
+        # 候选可能多达数万条：使用虚拟化模型，只格式化视口内可见的行
+        model = CandidateModel(candidates, dlg)
+        tv = QtWidgets.QTreeView()
+        tv.setModel(model)
+        tv.setRootIsDecorated(False)
+        tv.setUniformRowHeights(True)
         tv.setColumnWidth(0, 80)
         tv.setColumnWidth(1, 100)
         tv.setColumnWidth(2, 110)
         tv.setColumnWidth(3, 250)
         tv.setColumnWidth(4, 350)  # 寄存器读取列（加宽以显示更多寄存器）
         
-        for idx, ev in candidates:
-            # 构建寄存器读取信息（显示所有读取的寄存器）
-            regs_info = []
-            for r, v in sorted(ev.reads.items()):
-                regs_info.append(f"{r}=0x{v:x}")
-            regs_str = ' '.join(regs_info) if regs_info else '(无)'
-            
-            item = QtWidgets.QTreeWidgetItem([
-                str(ev.line_no),
-                f"[{ev.timestamp}]",
-                f"0x{ev.pc:08x}",
-                ev.asm,
-                regs_str
-            ])
-            item.setData(0, QtCore.Qt.ItemDataRole.UserRole, idx)
-            tv.addTopLevelItem(item)
-        
         # 默认选中第一个
-        if tv.topLevelItemCount() > 0:
-            tv.setCurrentItem(tv.topLevelItem(0))
+        if model.rowCount() > 0:
+            tv.setCurrentIndex(model.index(0, 0))
         
         # 选择改变时，更新主窗口寄存器面板
-        def _on_selection_changed():
-            cur = tv.currentItem()
-            if cur and self.parent():
-                try:
-                    idx = cur.data(0, QtCore.Qt.ItemDataRole.UserRole)
-                    main_window = self.parent()
-                    # 调用主窗口的寄存器复原方法
-                    if hasattr(main_window, '_rebuild_regs_async'):
-                        main_window._rebuild_regs_async(idx)
-                except Exception as e:
-                    pass
+        def _rebuild_regs(idx):
+            if idx is None or not self.parent():
+                return
+            try:
+                main_window = self.parent()
+                # 调用主窗口的寄存器复原方法
+                if hasattr(main_window, '_rebuild_regs_async'):
+                    main_window._rebuild_regs_async(idx)
+            except Exception as e:
+                pass
+        
+        # 去抖：方向键连续切换时只在停顿 120ms 后复原最后一次选中的行
+        timer = QtCore.QTimer(dlg)
+        timer.setSingleShot(True)
+        timer.setInterval(120)
+        pending = [None]
+        timer.timeout.connect(lambda: _rebuild_regs(pending[0]))
+        
+        def _on_selection_changed(cur, prev):
+            if cur.isValid():
+                pending[0] = model.event_index(cur.row())
+                timer.start()
         
-        tv.itemSelectionChanged.connect(_on_selection_changed)
+        tv.selectionModel().currentChanged.connect(_on_selection_changed)
         
         # 初始化：显示第一个候选的寄存器
         if candidates:
-            _on_selection_changed()
+            _rebuild_regs(model.event_index(0))
         
         # 双击确认
-        def _on_double(it, col):
-            dlg._sel = it.data(0, QtCore.Qt.ItemDataRole.UserRole)
-            dlg.accept()
-        tv.itemDoubleClicked.connect(_on_double)
+        def _on_double(mi):
+            if mi.isValid():
+                dlg._sel = model.event_index(mi.row())
+                dlg.accept()
+        tv.doubleClicked.connect(_on_double)
         lay.addWidget(tv)
         
         # 按钮
@@ -419,9 +673,9 @@ class ValueFlowDock(QtWidgets.QDockWidget):
         cancel = QtWidgets.QPushButton('取消')
         
         def _on_ok():
-            cur = tv.currentItem()
-            if cur:
-                dlg._sel = cur.data(0, QtCore.Qt.ItemDataRole.UserRole)
+            cur = tv.currentIndex()
+            if cur.isValid():
+                dlg._sel = model.event_index(cur.row())
                 dlg.accept()
         
         okb.clicked.connect(_on_ok)
@@ -444,6 +698,18 @@ class ValueFlowDock(QtWidgets.QDockWidget):
             return  # 过期请求
         
         self._set_busy(False)
+
+        # LRU 写入（仅后台计算的新结果；缓存命中时 pending_key 已清空）
+        key = self._backward_pending_key
+        if key is not None:
+            self._backward_pending_key = None
+            self._backward_cache[key] = list(hits)
+            while len(self._backward_cache) > self._backward_cache_cap:
+                try:
+                    self._backward_cache.popitem(last=False)
+                except Exception:
+                    self._backward_cache.clear()
+                    break
         
         if not hits:
             QtWidgets.QMessageBox.information(self, '反向追踪', '未找到值的来源路径')
@@ -458,57 +724,100 @@ class ValueFlowDock(QtWidgets.QDockWidget):
 
     def _render_backward_results(self, reg: str, indices: List[int]) -> None:
         """渲染反向追踪结果到列表（降序排列）"""
-        self.list.setUpdatesEnabled(False)
-        try:
-            self.list.clear()
+        with self._bulk_list_update() as items:
+            self._prefetch_before(reg, indices)
+            green = QtGui.QBrush(QtGui.QColor('#4CAF50'))
+            # 循环内用到的属性/全局名预先绑定为局部变量
+            row_fields = self._row_fields
+            make = QtWidgets.QTreeWidgetItem
+            role = QtCore.Qt.ItemDataRole.UserRole
+            add = items.append
             for idx in indices:
-                ev = self.parser.events[idx]
-                
-                # 获取寄存器前后值
-                before = ev.reads.get(reg)
-                after = ev.writes.get(reg)
-                if before is None or after is None:
-                    fb, fa, _ = self._fallback_before_after(idx, reg)
-                    if before is None:
-                        before = fb
-                    if after is None:
-                        after = fa
-                
-                # 判断方向
-                rw = 'W' if reg in ev.writes else ('R' if reg in ev.reads else '')
-                
-                # 获取标记（包含终止原因）
-                tag = self._classify_tag(reg, idx)
-                term_reason = None  # 初始化，避免 UnboundLocalError
-                # 增强标记：检查终止条件
-                if reg in ev.writes:
-                    term_reason = self.parser._check_backward_termination(idx, reg)
-                    if term_reason:
-                        tag = term_reason
-                
-                # 构建列表项
-                item = QtWidgets.QTreeWidgetItem([
-                    str(ev.line_no), 
-                    f"0x{ev.pc:08x}", 
-                    rw, 
-                    tag, 
-                    ev.asm,
-                    '' if before is None else f"0x{before:08x}",
-                    '' if after is None else f"0x{after:08x}",
-                    str(getattr(ev, 'call_id', 0)),
-                    self._fmt_low8(reg, idx), 
-                    self._fmt_c_summary(ev.asm)
-                ])
-                item.setData(0, QtCore.Qt.ItemDataRole.UserRole, idx)
+                fields, term_reason = row_fields(idx, reg)
+                item = make(fields)
+                item.setData(0, role, idx)
                 
                 # 源头行高亮（可选）
                 if term_reason:
-                    item.setForeground(2, QtGui.QBrush(QtGui.QColor('#4CAF50')))  # 绿色标记源头
+                    item.setForeground(2, green)  # 绿色标记源头
                 
-                self.list.addTopLevelItem(item)
-        finally:
-            self.list.setUpdatesEnabled(True)
-            self.list.viewport().update()
+                add(item)
+
+    def _row_fields(self, idx: int, reg: str) -> Tuple[List[str], Optional[str]]:
+        """一次性取出反向追踪结果行的全部列文本，返回 (列文本, 终止原因)。
+
+        事件的 reads/writes 只各查一次；写入点若命中终止条件，标记直接取终止原因，
+        不再走 `_classify_tag`。
+        """
+        ev = self.parser.events[idx]
+        reads = ev.reads
+        writes = ev.writes
+        raw_before = reads.get(reg)
+        raw_after = writes.get(reg)
+        before, after = raw_before, raw_after
+        if before is None or after is None:
+            fb, fa, _ = self._fallback_before_after(idx, reg)
+            if before is None:
+                before = fb
+            if after is None:
+                after = fa
+        rw = _rw_tag(ev, reg)
+        in_writes = rw == 'W'
+        term_reason = self.parser._check_backward_termination(idx, reg) if in_writes else None
+        tag = term_reason or self._classify_tag(reg, idx)
+        asm = ev.asm
+        return [
+            str(ev.line_no),
+            _HEX8 % ev.pc,
+            rw,
+            tag,
+            asm,
+            _hex8_or_empty(before),
+            _hex8_or_empty(after),
+            str(ev.call_id),
+            self._low8_text(raw_before, raw_after),
+            self._fmt_c_summary(asm),
+        ], term_reason
+
+    def _ctx_row_fields(self, idx: int, reg: Optional[str]) -> List[str]:
+        """值链/溯源结果行除“标记”外的列文本（按 (idx, reg) 做 LRU 缓存）。
+
+        顺序：行号、PC、读写、指令(含寄存器上下文)、执行前、执行后、调用、低8位、C 摘要。
+        """
+        key = (idx, reg)
+        cache = self._ctx_row_cache
+        fields = cache.get(key)
+        if fields is not None:
+            cache.move_to_end(key)
+            return fields
+        ev = self.parser.events[idx]
+        reads = ev.reads
+        writes = ev.writes
+        raw_before = reads.get(reg) if reg else None
+        raw_after = writes.get(reg) if reg else None
+        before, after = raw_before, raw_after
+        if before is None or after is None:
+            fb, fa, _ = self._fallback_before_after(idx, reg or None)
+            if before is None:
+                before = fb
+            if after is None:
+                after = fa
+        rw = _rw_tag(ev, reg) if reg else ''
+        fields = [
+            str(ev.line_no),
+            _HEX8 % ev.pc,
+            rw,
+            self._fmt_with_reg_context(ev, reg, before, after),
+            _hex8_or_empty(before),
+            _hex8_or_empty(after),
+            str(ev.call_id),
+            self._low8_text(raw_before, raw_after) if reg else self._fmt_low8(reg, idx),
+            self._fmt_c_summary(ev.asm),
+        ]
+        cache[key] = fields
+        if len(cache) > self._ctx_row_cache_cap:
+            cache.popitem(last=False)
+        return fields
 
     def _on_search(self) -> None:
         """统一入口：优先按“寄存器+值”做值链追踪，否则使用污点前向。"""
@@ -536,14 +845,20 @@ class ValueFlowDock(QtWidgets.QDockWidget):
 
     def _search_register(self, reg: str, in_scope_fn, match_val: Optional[int], side_sel: str) -> None:
         reg = reg.lower()
-        for idx, ev in enumerate(self.parser.events):
+        items: List[QtWidgets.QTreeWidgetItem] = []
+        events = self.parser.events
+        # 只遍历倒排索引中涉及该寄存器的事件（索引含 wN/xN 别名，rw 判定仍按原名精确匹配）
+        touched = heapq.merge(self.parser.reg_write_index.get(reg) or (),
+                              self.parser.reg_read_index.get(reg) or ())
+        last = -1
+        for idx in touched:
+            if idx == last:
+                continue
+            last = idx
+            ev = events[idx]
             if not in_scope_fn(ev):
                 continue
-            rw = None
-            if reg in ev.writes:
-                rw = 'W'
-            elif reg in ev.reads:
-                rw = 'R'
+            rw = _rw_tag(ev, reg)
             if rw:
                 before = ev.reads.get(reg)
                 after = ev.writes.get(reg)
@@ -576,37 +891,73 @@ class ValueFlowDock(QtWidgets.QDockWidget):
                     low8, bitops
                 ])
                 item.setData(0, QtCore.Qt.ItemDataRole.UserRole, idx)
-                self.list.addTopLevelItem(item)
+                items.append(item)
+        self._add_items_bulk(items)
 
     def _search_memory(self, addr_range: Tuple[int, int], in_scope_fn) -> None:
         lo, hi = addr_range
-        for idx, ev in enumerate(self.parser.events):
+        if self.eval_effaddr_cb is None:
+            return
+        items: List[QtWidgets.QTreeWidgetItem] = []
+        events = self.parser.events
+        rw_kind = self.parser.mem_rw_kind
+        # 按地址排序的访存索引做区间查询，只遍历命中的事件
+        for idx in self.parser.mem_accesses_in_range(lo, hi):
+            ev = events[idx]
             if not in_scope_fn(ev):
                 continue
-            if self.eval_effaddr_cb is None:
-                break
-            # 只粗略匹配常见 str/ldr/strb/ldrb/strh/ldrh
-            asm = ev.asm.lower()
-            if not any(k in asm for k in ('str', 'ldr')):
-                continue
-            eff = self.eval_effaddr_cb(idx)
-            if eff is None:
+            # 只粗略匹配常见 str/ldr/strb/ldrb/strh/ldrh（方向标志由解析器预先算好）
+            rw = rw_kind(idx)
+            if not rw:
                 continue
-            if lo <= eff <= hi:
-                rw = 'W' if asm.startswith('str') else 'R'
-                # 未指定寄存器的 memory 事件：尝试自动补全前/后值
-                low8 = self._fmt_low8(None, idx)
-                bitops = self._fmt_c_summary(ev.asm)
-                tag = self._classify_tag(None, idx)
-                fb, fa, _auto = self._fallback_before_after(idx, None)
-                item = QtWidgets.QTreeWidgetItem([
-                    str(ev.line_no), f'0x{ev.pc:08x}', rw, tag, ev.asm,
-                    '' if fb is None else f"0x{fb:08x}",
-                    '' if fa is None else f"0x{fa:08x}",
-                    str(getattr(ev, 'call_id', 0)), low8, bitops
-                ])
-                item.setData(0, QtCore.Qt.ItemDataRole.UserRole, idx)
-                self.list.addTopLevelItem(item)
+            # 未指定寄存器的 memory 事件：尝试自动补全前/后值
+            low8 = self._fmt_low8(None, idx)
+            bitops = self._fmt_c_summary(ev.asm)
+            tag = self._classify_tag(None, idx)
+            fb, fa, _auto = self._fallback_before_after(idx, None)
+            item = QtWidgets.QTreeWidgetItem([
+                str(ev.line_no), f'0x{ev.pc:08x}', rw, tag, ev.asm,
+                '' if fb is None else f"0x{fb:08x}",
+                '' if fa is None else f"0x{fa:08x}",
+                str(getattr(ev, 'call_id', 0)), low8, bitops
+            ])
+            item.setData(0, QtCore.Qt.ItemDataRole.UserRole, idx)
+            items.append(item)
+        self._add_items_bulk(items)
+
+    @contextmanager
+    def _bulk_list_update(self) -> Iterator[List[QtWidgets.QTreeWidgetItem]]:
+        """整体重建结果列表：清空后产出一个空的行列表，退出时一次性插入。
+
+        清空与批量插入期间暂停刷新并屏蔽列表自身信号（选择/当前项变化），结束后统一恢复；
+        渲染中预取的执行前值（_batch_before）也在退出时清空。"""
+        tv = self.list
+        tv.setUpdatesEnabled(False)
+        blocker = QtCore.QSignalBlocker(tv)
+        try:
+            tv.clear()
+            items: List[QtWidgets.QTreeWidgetItem] = []
+            yield items
+            self._add_items_bulk(items)
+        finally:
+            self._batch_before = None
+            blocker.unblock()
+            tv.setUpdatesEnabled(True)
+            tv.viewport().update()
+
+    def _add_items_bulk(self, items: List[QtWidgets.QTreeWidgetItem]) -> None:
+        """一次性插入多行：暂停排序并屏蔽信号，避免逐行 addTopLevelItem 触发模型通知。"""
+        if not items:
+            return
+        tv = self.list
+        sorting = tv.isSortingEnabled()
+        tv.setSortingEnabled(False)
+        blocked = tv.blockSignals(True)
+        try:
+            tv.addTopLevelItems(items)
+        finally:
+            tv.blockSignals(blocked)
+            tv.setSortingEnabled(sorting)
 
     # 保留占位，避免旧调用；当前不再使用作用域筛选
     def _build_scope_filter(self):
@@ -648,21 +999,24 @@ class ValueFlowDock(QtWidgets.QDockWidget):
         candidates = []  # (idx, ev, before, after)
         seen = set()
         want_after = (self.side_combo.currentText() == '运行后')
+        events = self.parser.events
         if want_after:
+            get_write = self.parser._get_write_value
             for idx in (self.parser.reg_write_index.get(reg, []) or []):
-                ev = self.parser.events[idx]
+                ev = events[idx]
                 try:
-                    a = self.parser._get_write_value(ev, reg)
+                    a = get_write(ev, reg)
                 except Exception:
                     a = ev.writes.get(reg)
                 if a is not None and (a & 0xFFFFFFFF) == match_val and idx not in seen:
                     candidates.append((idx, ev, ev.reads.get(reg), a))
                     seen.add(idx)
         else:
+            get_read = self.parser._get_read_value
             for idx in (self.parser.reg_read_index.get(reg, []) or []):
-                ev = self.parser.events[idx]
+                ev = events[idx]
                 try:
-                    b = self.parser._get_read_value(ev, reg)
+                    b = get_read(ev, reg)
                 except Exception:
                     b = ev.reads.get(reg)
                 if b is not None and (b & 0xFFFFFFFF) == match_val and idx not in seen:
@@ -698,9 +1052,10 @@ class ValueFlowDock(QtWidgets.QDockWidget):
         # 构建值路径
         # 起点侧以用户选择为准
         side_sel = '执行后' if want_after else '执行前'
-        cache_key = f"{reg}|{match_val:08x}|{side_sel}|{start_idx}"
-        if cache_key in self._chain_cache:
-            chain_indices = self._chain_cache[cache_key]
+        cache_key = (reg, match_val & 0xFFFFFFFF, side_sel, start_idx)
+        chain_indices = self._chain_cache.get(cache_key)
+        if chain_indices is not None:
+            self._chain_cache.move_to_end(cache_key)
             self._render_chain_list_fast(reg, chain_indices)
             return
 
@@ -708,13 +1063,7 @@ class ValueFlowDock(QtWidgets.QDockWidget):
         self._chain_req_id += 1
         req_id = self._chain_req_id
         self._set_busy(True)
-        if self._chain_worker and self._chain_worker.isRunning():
-            try:
-                self._chain_worker.requestInterruption()
-                # 等待上一任务退出，避免 QThread 销毁警告
-                self._chain_worker.wait(150)
-            except Exception:
-                pass
+        self._stop_worker(self._chain_worker)
         self._chain_worker = ChainWorker(self.parser, reg, start_idx, match_val, side_sel, req_id)
         self._chain_worker.finishedWithId.connect(self._on_chain_ready)
         self._chain_worker.start()
@@ -740,57 +1089,49 @@ class ValueFlowDock(QtWidgets.QDockWidget):
         if writer_idx not in chain:
             chain.append(writer_idx)
         # 向后收集：直到下一个写入改变该寄存器的值为止，包含所有读取
-        for j in range(writer_idx + 1, len(self.parser.events)):
-            ev = self.parser.events[j]
-            if reg in ev.writes:
-                a = ev.writes.get(reg)
-                if a is None or (a & 0xFFFFFFFF) != (val & 0xFFFFFFFF):
-                    break
-                else:
-                    chain.append(j)
-                    continue
-            if reg in ev.reads:
-                chain.append(j)
+        # 在写值列上二分定位后续写入，读取则直接取倒排索引区间，不再逐事件扫描
+        val32 = val & 0xFFFFFFFF
+        w_idxs, w_vals = self.parser.reg_value_columns(reg, writes=True)
+        stop = len(self.parser.events)
+        same_writes: List[int] = []
+        for k in range(bisect_right(w_idxs, writer_idx), len(w_idxs)):
+            if w_vals[k] != val32:
+                stop = w_idxs[k]
+                break
+            same_writes.append(w_idxs[k])
+        follow = set(same_writes)
+        follow.update(self.parser.read_indices_in_range(reg, writer_idx, stop))
+        chain.extend(sorted(follow))
         return chain
 
     def _find_prev_write_with_value(self, reg: str, idx: int, val: int) -> Optional[int]:
-        for j in range(idx - 1, -1, -1):
-            ev = self.parser.events[j]
-            if reg in ev.writes:
-                a = ev.writes.get(reg)
-                if a is not None and (a & 0xFFFFFFFF) == (val & 0xFFFFFFFF):
-                    return j
-        return None
+        return self.parser.find_prev_write_with_value(reg, idx, val)
 
     def _find_prev_write_any(self, reg: str, idx: int) -> Optional[int]:
-        for j in range(idx - 1, -1, -1):
-            if reg in self.parser.events[j].writes:
-                return j
-        return None
+        return self.parser.find_prev_write(reg, idx)
 
     def _fmt_with_reg_context(self, ev, reg: str, before: Optional[int], after: Optional[int]) -> str:
         # 在指令列追加寄存器上下文，如："ldr r1, [r1, #4]"  r1=0xe4fff404 => r1=0xfffffffb
-        parts = [ev.asm]
         ctx = []
-        if before is not None or after is not None:
-            b = '' if before is None else f"r1=0x{before:08x}" if reg == 'r1' else f"{reg}=0x{before:08x}"
-            a = '' if after is None else f"r1=0x{after:08x}" if reg == 'r1' else f"{reg}=0x{after:08x}"
-            if b or a:
-                arrow = ' => ' if b and a else ''
-                ctx.append(f"{b}{arrow}{a}")
-        # 附带显示参与的其它寄存器读取值（最多两个）
+        if before is not None and after is not None:
+            ctx.append(f"{reg}={_HEX8 % before} => {reg}={_HEX8 % after}")
+        elif before is not None:
+            ctx.append(f"{reg}={_HEX8 % before}")
+        elif after is not None:
+            ctx.append(f"{reg}={_HEX8 % after}")
+        # 附带显示参与的其它寄存器读取值（最多两个），直接遍历 reads，取够即停
         extras = []
-        for k, v in list(ev.reads.items()):
+        for k, v in ev.reads.items():
             if k == reg:
                 continue
-            extras.append(f"{k}=0x{v:08x}")
+            extras.append(f"{k}={_HEX8 % v}")
             if len(extras) >= 2:
                 break
         if extras:
             ctx.append(' '.join(extras))
         if ctx:
-            parts.append(' [' + '  '.join(ctx) + ']')
-        return ' '.join(parts)
+            return f"{ev.asm}  [{'  '.join(ctx)}]"
+        return ev.asm
 
     def _update_trace_btn_state(self) -> None:
         """更新追踪按钮的启用状态"""
@@ -808,23 +1149,13 @@ class ValueFlowDock(QtWidgets.QDockWidget):
             return  # 已过期
         self._set_busy(False)
         # 缓存键与上下文一致：寄存器+值+侧+起点
-        try:
-            ctx = getattr(self, '_last_trace_ctx', {}) or {}
-            mv = ctx.get('match_val', 0)
-            side = ctx.get('side', '')
-            sidx = ctx.get('start_idx', 0)
-            cache_key = f"{reg}|{mv:08x}|{side}|{sidx}"
-            # LRU 写入
-            self._chain_cache[cache_key] = list(indices)
-            # 裁剪容量
-            while len(self._chain_cache) > self._chain_cache_cap:
-                try:
-                    self._chain_cache.popitem(last=False)
-                except Exception:
-                    self._chain_cache.clear()
-                    break
-        except Exception:
-            pass
+        ctx = getattr(self, '_last_trace_ctx', {}) or {}
+        cache_key = (reg, ctx.get('match_val', 0) & 0xFFFFFFFF, ctx.get('side', ''), ctx.get('start_idx', 0))
+        # LRU 写入（每次最多超出一项，弹出最旧的即可）
+        self._chain_cache[cache_key] = list(indices)
+        self._chain_cache.move_to_end(cache_key)
+        if len(self._chain_cache) > self._chain_cache_cap:
+            self._chain_cache.popitem(last=False)
         # 渲染
         self._render_chain_list_fast(reg, indices)
         # 附带来源解释
@@ -858,60 +1189,58 @@ class ValueFlowDock(QtWidgets.QDockWidget):
                 QtWidgets.QToolTip.showText(self.mapToGlobal(QtCore.QPoint(0, 0)), ' | '.join(lines)[:300])
 
     def _render_chain_list_fast(self, reg: str, chain_indices: List[int]) -> None:
-        self.list.setUpdatesEnabled(False)
-        try:
-            self.list.clear()
+        with self._bulk_list_update() as items:
+            self._prefetch_before(reg, chain_indices, skip_cached=True)
+            # 循环内用到的方法/常量先绑定为局部变量
+            row_fields = self._ctx_row_fields
+            classify = self._classify_tag
+            Item = QtWidgets.QTreeWidgetItem
+            role = QtCore.Qt.ItemDataRole.UserRole
+            add = items.append
             for idx in chain_indices:
-                ev = self.parser.events[idx]
-                before = ev.reads.get(reg)
-                after = ev.writes.get(reg)
-                if before is None or after is None:
-                    fb, fa, _ = self._fallback_before_after(idx, reg)
-                    if before is None:
-                        before = fb
-                    if after is None:
-                        after = fa
-                rw = 'W' if reg in ev.writes else ('R' if reg in ev.reads else '')
-                asm = self._fmt_with_reg_context(ev, reg, before, after)
-                tag = self._classify_tag(reg, idx)
-                item = QtWidgets.QTreeWidgetItem([
-                    str(ev.line_no), f"0x{ev.pc:08x}", rw, tag, asm,
-                    '' if before is None else f"0x{before:08x}",
-                    '' if after is None else f"0x{after:08x}",
-                    str(getattr(ev, 'call_id', 0)),
-                    self._fmt_low8(reg, idx), self._fmt_c_summary(ev.asm)
-                ])
-                item.setData(0, QtCore.Qt.ItemDataRole.UserRole, idx)
-                self.list.addTopLevelItem(item)
-        finally:
-            self.list.setUpdatesEnabled(True)
-            self.list.viewport().update()
+                f = row_fields(idx, reg)
+                item = Item(f[:3] + [classify(reg, idx)] + f[3:])
+                item.setData(0, role, idx)
+                add(item)
 
     # === 终止条件与节点标注 ===
     def _classify_tag(self, reg: Optional[str], idx: int) -> str:
+        """返回结果行的“标记”列；只取决于 (reg, idx) 与当前 trace，按此键做 LRU 缓存。"""
         if not self.parser:
             return ''
+        key = (reg, idx)
+        tag = self._tag_cache.get(key)
+        if tag is not None:
+            self._tag_cache.move_to_end(key)
+            return tag
+        tag = self._classify_tag_uncached(reg, idx)
+        self._tag_cache[key] = tag
+        if len(self._tag_cache) > self._tag_cache_cap:
+            self._tag_cache.popitem(last=False)
+        return tag
+
+    def _classify_tag_uncached(self, reg: Optional[str], idx: int) -> str:
         ev = self.parser.events[idx]
-        s = ev.asm.lower()
+        mc = _mnem_class(ev.asm.lower().split(' ', 1)[0])
         # 1) 初始数据源
         if reg:
             if self.parser._is_immediate_write(ev, reg) or self.parser._is_constant_zero_write(ev, reg):
                 return '源头'
         # rodata/常量内存（通过“无前序 store”的ldr识别）
-        if s.startswith('ldr') and (not ev.writes or (reg and reg in ev.writes)):
+        if mc == _MN_LDR and (not ev.writes or (reg and reg in ev.writes)):
             try:
                 if self.parser._is_load_from_const_memory(idx, reg or next(iter(ev.writes.keys()), '')):
                     return '常量'
             except Exception:
                 pass
         # 2) 系统/外部边界（粗识别：svc/bl libc 符号不可用时退化为空）
-        if s.startswith('svc'):
+        if mc == _MN_SVC:
             return '边界'
-        try:
-            if s.startswith('bl '):
+        if mc == _MN_BL:
+            try:
                 return '调用-外' if self.parser.is_external_call(idx) else '调用'
-        except Exception:
-            pass
+            except Exception:
+                pass
         # 3) 循环/递归起点（简单：同一 asm 在短窗口内重复）
         try:
             if self.parser.is_loop_head(idx, window=32):
@@ -925,19 +1254,7 @@ class ValueFlowDock(QtWidgets.QDockWidget):
         except Exception:
             pass
         # 兜底分类，避免空白
-        try:
-            if s.startswith('ldr'):
-                return '读内存'
-            if s.startswith('str'):
-                return '写内存'
-            if s.startswith(('mov', 'mvn')):
-                return '传送'
-            mnem = s.split(' ', 1)[0]
-            if mnem in ('add','sub','eor','orr','or','and','bic','orn','mul','mla','mls','lsl','lsr','asr','ror'):
-                return '运算'
-        except Exception:
-            pass
-        return ''
+        return _MN_FALLBACK_TAG.get(mc, '')
 
     def _set_busy(self, busy: bool) -> None:
         if busy:
@@ -975,11 +1292,9 @@ class ValueFlowDock(QtWidgets.QDockWidget):
             if isinstance(idx, int):
                 pairs.append((idx, it))
         pairs.sort(key=lambda x: x[0])
-        lines = []
-        for _, it in pairs:
-            cols = [it.text(c) for c in range(self.list.columnCount())]
-            lines.append('\t'.join(cols))
-        QtWidgets.QApplication.clipboard().setText('\n'.join(lines))
+        cols = range(self.list.columnCount())
+        text = '\n'.join(['\t'.join([it.text(c) for c in cols]) for _, it in pairs])
+        QtWidgets.QApplication.clipboard().setText(text)
         try:
             self.parent().statusBar().showMessage('已复制到剪贴板', 1500)  # type: ignore[union-attr]
         except Exception:
@@ -998,14 +1313,12 @@ class ValueFlowDock(QtWidgets.QDockWidget):
         # 大体量异步生成，避免 UI 卡顿
         if len(indices) >= 800:
             self._set_busy(True)
-            try:
-                if hasattr(self, '_codegen_worker') and self._codegen_worker and self._codegen_worker.isRunning():
-                    self._codegen_worker.requestInterruption()
-            except Exception:
-                pass
-            self._codegen_worker = _CodeGenWorker(self, indices, mode)
-            self._codegen_worker.finishedWithCode.connect(self._on_codegen_ready)
-            self._codegen_worker.start()
+            # 旧任务无需中断等待：序号前进后它的结果会被丢弃
+            self._codegen_req_id += 1
+            worker = _CodeGenWorker(self, indices, mode, self._codegen_req_id,
+                                    is_current=lambda rid: rid == self._codegen_req_id)
+            worker.finishedWithCode.connect(self._on_codegen_ready)
+            QtCore.QThreadPool.globalInstance().start(worker)
             return
         # 小体量：同步生成
         if mode == 'c':
@@ -1053,14 +1366,12 @@ class ValueFlowDock(QtWidgets.QDockWidget):
         reg = reg.strip().lower()
         side = '执行后'
         self._set_busy(True)
-        try:
-            if self._prov_worker and self._prov_worker.isRunning():
-                self._prov_worker.requestInterruption()
-        except Exception:
-            pass
-        self._prov_worker = _ProvenanceWorker(self.parser, reg, idx, side)
+        # 旧的溯源任务随请求号前进自行放弃，无需等待
+        self._prov_req_id += 1
+        self._prov_worker = _ProvenanceWorker(self.parser, reg, idx, side, self._prov_req_id,
+                                              is_current=lambda rid: rid == self._prov_req_id)
         self._prov_worker.finishedWithPath.connect(self._on_provenance_ready)
-        self._prov_worker.start()
+        QtCore.QThreadPool.globalInstance().start(self._prov_worker)
 
     @QtCore.pyqtSlot(object)
     def _show_save_dialog(self, content: str) -> None:
@@ -1103,63 +1414,33 @@ class ValueFlowDock(QtWidgets.QDockWidget):
         if not indices:
             QtWidgets.QMessageBox.information(self, '溯源', '未能构建溯源路径')
             return
-        self.list.setUpdatesEnabled(False)
-        try:
-            self.list.clear()
+        with self._bulk_list_update() as items:
+            self._prefetch_before(reg, indices, skip_cached=True)
+            row_fields = self._ctx_row_fields
+            Item = QtWidgets.QTreeWidgetItem
+            role = QtCore.Qt.ItemDataRole.UserRole
+            add = items.append
             for idx in indices:
-                ev = self.parser.events[idx]
-                before = ev.reads.get(reg) if reg else None
-                after = ev.writes.get(reg) if reg else None
-                if before is None or after is None:
-                    fb, fa, _ = self._fallback_before_after(idx, reg or None)
-                    if before is None:
-                        before = fb
-                    if after is None:
-                        after = fa
-                asm = self._fmt_with_reg_context(ev, reg, before, after)
-                rw = 'W' if reg in ev.writes else ('R' if reg in ev.reads else '')
-                tag = '[溯源]'
-                item = QtWidgets.QTreeWidgetItem([
-                    str(ev.line_no), f"0x{ev.pc:08x}", rw, tag, asm,
-                    '' if before is None else f"0x{before:08x}",
-                    '' if after is None else f"0x{after:08x}",
-                    str(getattr(ev, 'call_id', 0)),
-                    self._fmt_low8(reg, idx), self._fmt_c_summary(ev.asm)
-                ])
-                item.setData(0, QtCore.Qt.ItemDataRole.UserRole, idx)
-                self.list.addTopLevelItem(item)
-            # 改为导出“当前列表中所有行”的原始 trace 文本
-            try:
-                idxs = []
-                for i in range(self.list.topLevelItemCount()):
-                    it = self.list.topLevelItem(i)
-                    v = it.data(0, QtCore.Qt.ItemDataRole.UserRole)
-                    if isinstance(v, int):
-                        idxs.append(v)
-                txt = self._build_trace_text(idxs)
-                self._show_save_dialog(txt)
-            except Exception:
-                pass
-        finally:
-            self.list.setUpdatesEnabled(True)
-            self.list.viewport().update()
+                f = row_fields(idx, reg)
+                item = Item(f[:3] + ['[溯源]'] + f[3:])
+                item.setData(0, role, idx)
+                add(item)
+        # 改为导出“当前列表中所有行”的原始 trace 文本（列表恢复刷新后再弹出保存对话框）
+        try:
+            idxs = []
+            for i in range(self.list.topLevelItemCount()):
+                it = self.list.topLevelItem(i)
+                v = it.data(0, QtCore.Qt.ItemDataRole.UserRole)
+                if isinstance(v, int):
+                    idxs.append(v)
+            txt = self._build_trace_text(idxs)
+            self._show_save_dialog(txt)
+        except Exception:
+            pass
 
     def _build_trace_text(self, indices: list) -> str:
-        lines = []
-        for idx in indices:
-            ev = self.parser.events[idx]
-            raw = ev.raw or ''
-            # 只导出“汇编之前”的 trace 内容
-            if raw:
-                try:
-                    prefix = raw.split('"')[0].rstrip()
-                except Exception:
-                    prefix = raw
-            else:
-                # 回退：构造到冒号为止
-                prefix = f"[{ev.timestamp}][{ev.module} {ev.module_offset}] [{ev.encoding}] 0x{ev.pc:08x}:"
-            lines.append(prefix)
-        return '\n'.join(lines)
+        events = self.parser.events
+        return '\n'.join([_trace_prefix(events[idx]) for idx in indices])
 
     def _parse_taint_inputs(self) -> tuple:
         """解析污点输入，返回 (source_regs, source_addrs, target_regs, target_addrs)"""
@@ -1167,25 +1448,7 @@ class ValueFlowDock(QtWidgets.QDockWidget):
         regs_txt = (self.taint_regs_edit.text() or '').strip()
         mem_txt = (self.taint_mem_edit.text() or '').strip()
         source_regs = [s.strip().lower() for s in regs_txt.split(',') if s.strip()]
-        source_addrs = []
-        if mem_txt:
-            for s in mem_txt.split(','):
-                st = s.strip().lower()
-                if not st:
-                    continue
-                try:
-                    # 正确处理十六进制和十进制
-                    if st.startswith('0x'):
-                        source_addrs.append(int(st, 16))
-                    else:
-                        # 尝试十六进制，失败则尝试十进制
-                        try:
-                            source_addrs.append(int(st, 16))
-                        except ValueError:
-                            source_addrs.append(int(st, 10))
-                except Exception:
-                    # 静默跳过无效输入
-                    pass
+        source_addrs = _parse_addr_list(mem_txt)
         
         # 目标污点（高级模式）
         target_regs = []
@@ -1194,22 +1457,7 @@ class ValueFlowDock(QtWidgets.QDockWidget):
             target_regs_txt = (self.target_regs_edit.text() or '').strip()
             target_mem_txt = (self.target_mem_edit.text() or '').strip()
             target_regs = [s.strip().lower() for s in target_regs_txt.split(',') if s.strip()]
-            if target_mem_txt:
-                for s in target_mem_txt.split(','):
-                    st = s.strip().lower()
-                    if not st:
-                        continue
-                    try:
-                        # 正确处理十六进制和十进制
-                        if st.startswith('0x'):
-                            target_addrs.append(int(st, 16))
-                        else:
-                            try:
-                                target_addrs.append(int(st, 16))
-                            except ValueError:
-                                target_addrs.append(int(st, 10))
-                    except Exception:
-                        pass
+            target_addrs = _parse_addr_list(target_mem_txt)
         
         return source_regs, source_addrs, target_regs, target_addrs
 
@@ -1239,18 +1487,8 @@ class ValueFlowDock(QtWidgets.QDockWidget):
         if isinstance(idx, int):
             start_idx = idx
         self._set_busy(True)
-        try:
-            if hasattr(self, '_taint_worker') and self._taint_worker and self._taint_worker.isRunning():
-                self._taint_worker.requestInterruption()
-        except Exception:
-            pass
         # 若已有在跑的污点线程，则请求中断并等待片刻
-        try:
-            if hasattr(self, '_taint_worker') and self._taint_worker and self._taint_worker.isRunning():
-                self._taint_worker.requestInterruption()
-                self._taint_worker.wait(150)
-        except Exception:
-            pass
+        self._stop_worker(getattr(self, '_taint_worker', None))
             
         # 根据模式选择不同的Worker
         if use_enhanced:
@@ -1307,22 +1545,24 @@ class ValueFlowDock(QtWidgets.QDockWidget):
 
     def _populate_taint_results(self, hits: list) -> None:
         """填充污点分析结果到列表"""
-        self.list.setUpdatesEnabled(False)
-        try:
-            self.list.clear()
+        with self._bulk_list_update() as items:
+            events = self.parser.events
+            classify = self._classify_tag
+            low8 = self._fmt_low8
+            csum = self._fmt_c_summary
+            Item = QtWidgets.QTreeWidgetItem
+            role = QtCore.Qt.ItemDataRole.UserRole
+            add = items.append
             for idx in hits:
-                ev = self.parser.events[idx]
-                rw = 'W' if ev.writes else ('R' if ev.reads else '')
-                tag = self._classify_tag(None, idx)
-                item = QtWidgets.QTreeWidgetItem([
-                    str(ev.line_no), f"0x{ev.pc:08x}", rw, tag, ev.asm,
-                    '', '', str(getattr(ev, 'call_id', 0)), self._fmt_low8(None, idx), self._fmt_c_summary(ev.asm)
+                ev = events[idx]
+                asm = ev.asm
+                rw = _rw_tag(ev, None)
+                item = Item([
+                    str(ev.line_no), _HEX8 % ev.pc, rw, classify(None, idx), asm,
+                    '', '', str(ev.call_id), low8(None, idx), csum(asm)
                 ])
-                item.setData(0, QtCore.Qt.ItemDataRole.UserRole, idx)
-                self.list.addTopLevelItem(item)
-        finally:
-            self.list.setUpdatesEnabled(True)
-            self.list.viewport().update()
+                item.setData(0, role, idx)
+                add(item)
 
     @QtCore.pyqtSlot(list)
     def _on_taint_ready(self, hits: list) -> None:
@@ -1359,55 +1599,86 @@ class ValueFlowDock(QtWidgets.QDockWidget):
     
     def _populate_enhanced_taint_results(self, hits: list, confluence_points: dict) -> None:
         """填充增强污点分析结果到列表，高亮汇合点"""
-        self.list.setUpdatesEnabled(False)
-        try:
-            self.list.clear()
+        with self._bulk_list_update() as items:
+            events = self.parser.events
+            classify = self._classify_tag
+            low8 = self._fmt_low8
+            csum = self._fmt_c_summary
+            Item = QtWidgets.QTreeWidgetItem
+            role = QtCore.Qt.ItemDataRole.UserRole
+            add = items.append
             for idx in hits:
-                ev = self.parser.events[idx]
-                rw = 'W' if ev.writes else ('R' if ev.reads else '')
-                tag = self._classify_tag(None, idx)
+                ev = events[idx]
+                asm = ev.asm
+                rw = _rw_tag(ev, None)
                 
                 # 标记汇合点
-                if idx in confluence_points:
-                    sources = confluence_points[idx]
-                    tag = f"⭐汇合点 ({len(sources)}源)"
+                sources = confluence_points.get(idx)
+                tag = f"⭐汇合点 ({len(sources)}源)" if sources is not None else classify(None, idx)
                 
-                item = QtWidgets.QTreeWidgetItem([
-                    str(ev.line_no), f"0x{ev.pc:08x}", rw, tag, ev.asm,
-                    '', '', str(getattr(ev, 'call_id', 0)), 
-                    self._fmt_low8(None, idx), self._fmt_c_summary(ev.asm)
+                item = Item([
+                    str(ev.line_no), _HEX8 % ev.pc, rw, tag, asm,
+                    '', '', str(ev.call_id), 
+                    low8(None, idx), csum(asm)
                 ])
-                item.setData(0, QtCore.Qt.ItemDataRole.UserRole, idx)
+                item.setData(0, role, idx)
                 
-                # 汇合点用特殊颜色高亮
-                if idx in confluence_points:
-                    for col in range(self.list.columnCount()):
-                        item.setBackground(col, QtGui.QColor(255, 250, 205))  # 浅黄色
-                        item.setForeground(col, QtGui.QColor(139, 69, 19))    # 棕色
+                # 汇合点只打标记，整行高亮由 _ConfluenceDelegate 绘制时完成
+                if sources is not None:
+                    item.setData(0, _CONFLUENCE_ROLE, True)
                 
-                self.list.addTopLevelItem(item)
-        finally:
-            self.list.setUpdatesEnabled(True)
-            self.list.viewport().update()
+                add(item)
 
     def _show_code_dialog(self, title: str, default_name: str, file_filter: str, code: str) -> None:
         dlg = QtWidgets.QDialog(self)
         dlg.setWindowTitle(title)
         lay = QtWidgets.QVBoxLayout(dlg)
         edit = QtWidgets.QPlainTextEdit()
-        edit.setPlainText(code)
-        edit.setReadOnly(False)
+        # 大段代码分批灌入编辑器：先显示开头，其余由 0 间隔定时器逐批追加，界面不被一次 setPlainText 卡住。
+        # 灌入期间编辑器只读，复制/保存直接使用完整的 code
+        stream_pos: List[Optional[int]] = [None]
+        if len(code) > _CODE_STREAM_CHARS:
+            lines = code.split('\n')
+            step = _CODE_STREAM_LINES
+            edit.setReadOnly(True)
+            edit.setPlainText('\n'.join(lines[:step]))
+            stream_pos[0] = step
+
+            def _feed():
+                k = stream_pos[0]
+                if k is None:
+                    return
+                if k >= len(lines):
+                    stream_pos[0] = None
+                    edit.setReadOnly(False)
+                    return
+                edit.setUpdatesEnabled(False)
+                try:
+                    edit.appendPlainText('\n'.join(lines[k:k + step]))
+                finally:
+                    edit.setUpdatesEnabled(True)
+                stream_pos[0] = k + step
+                QtCore.QTimer.singleShot(0, _feed)
+
+            QtCore.QTimer.singleShot(0, _feed)
+        else:
+            edit.setPlainText(code)
+            edit.setReadOnly(False)
         lay.addWidget(edit)
+
+        def _text() -> str:
+            return code if stream_pos[0] is not None else edit.toPlainText()
+
         btns = QtWidgets.QHBoxLayout()
         btn_copy = QtWidgets.QPushButton('复制到剪贴板')
         btn_save = QtWidgets.QPushButton('保存到文件')
-        btn_copy.clicked.connect(lambda: (QtWidgets.QApplication.clipboard().setText(edit.toPlainText()), QtWidgets.QMessageBox.information(dlg, '已复制', '代码已复制')))
+        btn_copy.clicked.connect(lambda: (QtWidgets.QApplication.clipboard().setText(_text()), QtWidgets.QMessageBox.information(dlg, '已复制', '代码已复制')))
         def _save():
             path, _ = QtWidgets.QFileDialog.getSaveFileName(dlg, f'保存为 {default_name}', default_name, file_filter)
             if path:
                 try:
                     with open(path, 'w', encoding='utf-8') as f:
-                        f.write(edit.toPlainText())
+                        f.write(_text())
                     QtWidgets.QMessageBox.information(dlg, '已保存', f'已保存到\n{path}')
                 except Exception as e:
                     QtWidgets.QMessageBox.critical(dlg, '保存失败', str(e))
@@ -1418,75 +1689,37 @@ class ValueFlowDock(QtWidgets.QDockWidget):
         lay.addLayout(btns)
         dlg.resize(760, 560)
         dlg.exec()
+        # 对话框关闭后停止尚未灌完的批次
+        stream_pos[0] = None
+
+    def _export_events(self, indices: list) -> Tuple[list, List[str]]:
+        """一次取出导出所需的事件对象与排序后的寄存器声明列表（每个下标只索引 events 一次）。"""
+        events = self.parser.events
+        evs = [events[i] for i in indices]
+        # set.union 直接在 C 层遍历各事件预存的读写名元组
+        used_regs = set().union(*[ev.reads_keys for ev in evs], *[ev.writes_keys for ev in evs])
+        return evs, sorted(used_regs, key=_reg_sort_key)
 
     def _gen_c_code(self, indices: list) -> str:
-        used_regs = set()
-        for idx in indices:
-            ev = self.parser.events[idx]
-            used_regs.update(ev.reads.keys())
-            used_regs.update(ev.writes.keys())
-        reg_list = sorted(used_regs, key=lambda x: (x[0], int(x[1:]) if x[1:].isdigit() else 99))
-        lines = [
-            '/* 生成自 trace 值流选择（伪C） */',
-            '#include <stdint.h>',
-            '',
-        ]
-        if reg_list:
-            decls = ', '.join(f'uint32_t {r}=0' for r in reg_list)
-            lines.append(f'{decls};')
-            lines.append('')
-        lines.append('void replay(void) {')
-        for idx in indices:
-            ev = self.parser.events[idx]
-            expr = self._bitop_c_expr(ev.asm)
-            if expr:
-                lines.append(f'    {expr}  // {ev.asm}')
-            else:
-                lines.append(f'    // {ev.asm}')
-        lines.append('}')
-        return '\n'.join(lines)
+        evs, reg_list = self._export_events(indices)
+        return '\n'.join([_C_HEADER] + _c_replay_lines([ev.asm for ev in evs], reg_list))
 
     def _gen_py_code(self, indices: list) -> str:
-        used_regs = set()
-        for idx in indices:
-            ev = self.parser.events[idx]
-            used_regs.update(ev.reads.keys())
-            used_regs.update(ev.writes.keys())
-        reg_list = sorted(used_regs, key=lambda x: (x[0], int(x[1:]) if x[1:].isdigit() else 99))
-        lines = [
-            '# 生成自 trace 值流选择（Python 伪代码）',
-            '',
-            'MASK32 = 0xFFFFFFFF',
-            'def u32(x): return x & MASK32',
-            'def brev32(x):',
-            '    x = ((x >> 1) & 0x55555555) | ((x & 0x55555555) << 1)',
-            '    x = ((x >> 2) & 0x33333333) | ((x & 0x33333333) << 2)',
-            '    x = ((x >> 4) & 0x0f0f0f0f) | ((x & 0x0f0f0f0f) << 4)',
-            '    x = ((x >> 8) & 0x00ff00ff) | ((x & 0x00ff00ff) << 8)',
-            '    return u32((x >> 16) | (x << 16))',
-            'def ror32(x, s): s &= 31; return u32((x >> s) | ((x << ((32 - s) & 31))))',
-            'def rev32(x): return ((x & 0xFF) << 24) | (x & 0xFF00) << 8 | (x >> 8) & 0xFF00 | (x >> 24) & 0xFF',
-            'def rev16(x): return (((x << 8) & 0xFF00FF00) | ((x >> 8) & 0x00FF00FF))',
-            'def revsh(x): import struct; return struct.unpack("<i", struct.pack("<h", (x & 0xFFFF) << 0))[0]',
-            'def clz32(x): return 32 - int(x & MASK32).bit_length() if x & MASK32 else 32',
-            '',
-        ]
+        evs, reg_list = self._export_events(indices)
+        lines = [_PY_HEADER]
         if reg_list:
-            decls = '='.join([*reg_list, '0'])
-            lines.append(decls)
+            lines.extend(f'{r} = 0' for r in reg_list)
             lines.append('')
         lines.append('def replay():')
-        for idx in indices:
-            ev = self.parser.events[idx]
-            stmt = self._bitop_py_stmt(ev.asm)
-            if stmt:
-                lines.append(f'    {stmt}  # {ev.asm}')
-            else:
-                lines.append(f'    # {ev.asm}')
+        py_stmt = _bitop_py_stmt_cached
+        lines += [f'    {stmt}  # {note}' if (stmt := py_stmt(asm)) else f'    # {note}'
+                  for asm, note in _fuse_shift_operands([ev.asm for ev in evs])]
         return '\n'.join(lines)
 
-    @QtCore.pyqtSlot(str, str)
-    def _on_codegen_ready(self, code: str, mode: str) -> None:
+    @QtCore.pyqtSlot(str, str, int)
+    def _on_codegen_ready(self, code: str, mode: str, req_id: int) -> None:
+        if req_id != self._codegen_req_id:
+            return
         self._set_busy(False)
         if not code:
             QtWidgets.QMessageBox.warning(self, '导出失败', '生成代码失败')
@@ -1502,71 +1735,45 @@ class ValueFlowDock(QtWidgets.QDockWidget):
         if not self.parser:
             return ''
         ev = self.parser.events[idx]
-        before = None
-        after = None
-        if reg and reg in ev.reads:
-            before = ev.reads.get(reg)
-        if reg and reg in ev.writes:
-            after = ev.writes.get(reg)
+        if reg:
+            return self._low8_text(ev.reads.get(reg), ev.writes.get(reg))
         # 不指定寄存器时，尝试从右侧写寄存器中取一个
-        if not reg and ev.writes:
-            k, v = next(iter(ev.writes.items()))
-            after = v
-        if after is None and before is None:
-            return ''
+        after = next(iter(ev.writes.values()), None)
+        return self._low8_text(None, after)
+
+    @staticmethod
+    def _low8_text(before: Optional[int], after: Optional[int]) -> str:
         if before is None:
-            return f"-> {after & 0xFF:02x}"
+            return '' if after is None else '-> ' + _LOW8_HEX[after & 0xFF]
         if after is None:
-            return f"{before & 0xFF:02x} ->"
-        return f"{before & 0xFF:02x} -> {after & 0xFF:02x}"
+            return _LOW8_HEX[before & 0xFF] + ' ->'
+        return _LOW8_HEX[before & 0xFF] + ' -> ' + _LOW8_HEX[after & 0xFF]
 
     def _fmt_bitops(self, asm: str) -> str:
         s = asm.lower()
-        try:
-            # 访存类：不显示
-            if s.startswith('ldr') or s.startswith('str'):
-                return ''
-            if s.startswith('mvn'):
-                return '~'
-            if s.startswith('eor') or '^' in s:
-                return '^'
-            if s.startswith('orr') or ' orr ' in s or s.startswith('or '):
-                return '|'
-            if s.startswith('and'):
-                return '&'
-            if s.startswith('bic'):
-                return '&~'
-            if s.startswith('orn'):
-                return '|~'
-            if s.startswith('add'):
-                return '+'
-            if s.startswith('sub') or s.startswith('rsb'):
-                return '-'
-            if 'lsr' in s:
-                return '>>'
-            if 'lsl' in s:
-                return '<<'
-            if 'asr' in s:
-                return '>>'
-            # 其它复杂单目/位域等不统一为简写，留空
-        except Exception:
-            pass
+        head = s[:3]
+        # 访存类：不显示
+        if head in ('ldr', 'str'):
+            return ''
+        if head == 'mvn':
+            return '~'
+        if head == 'eor' or '^' in s:
+            return '^'
+        if ' orr ' in s:
+            return '|'
+        # 其余按指令前 3 个字符一次查表
+        sym = _BITOP_PREFIX.get(head)
+        if sym:
+            return sym
+        for tok, sym in _SHIFT_TOKS:
+            if tok in s:
+                return sym
+        # 其它复杂单目/位域等不统一为简写，留空
         return ''
 
     def _fmt_c_summary(self, asm: str) -> str:
-        """更精确的 C 表达式摘要。优先用现有解析 `_bitop_c_expr`，
-        未覆盖/访存类返回空字符串。该函数仅做字符串解析，性能开销极小。"""
-        s = (asm or '').strip().lower()
-        if not s or s.startswith('ldr') or s.startswith('str'):
-            return ''
-        try:
-            expr = self._bitop_c_expr(asm)
-            # 去掉结尾分号，简洁展示
-            if expr and expr.endswith(';'):
-                expr = expr[:-1]
-            return expr or ''
-        except Exception:
-            return ''
+        """更精确的 C 表达式摘要（按 asm 文本缓存，见 `_c_summary`）。"""
+        return _c_summary(asm or '')
 
     # === 辅助：补全 before/after（必要时自动选择寄存器） ===
     def _fallback_before_after(self, idx: int, reg: Optional[str]) -> tuple:
@@ -1587,461 +1794,168 @@ class ValueFlowDock(QtWidgets.QDockWidget):
                     use_reg = next(iter(ev.reads.keys()))
                 else:
                     return None, None, None
-            regs_after = self.parser.reconstruct_regs_at(idx)
-            before = None
-            after = regs_after.get(use_reg)
-            if idx > 0:
+            if idx <= 0:
+                return None, self.parser.reconstruct_regs_at(0).get(use_reg), use_reg
+            # 只复原一次执行前状态；执行后的值由本事件增量推出：
+            # 写入则取写入值，否则沿用执行前的值（执行前未知时复原会用本事件的读取补上）
+            batch = self._batch_before
+            if batch is not None and batch[0] == use_reg and idx in batch[1]:
+                before = batch[1][idx]
+            else:
                 try:
-                    regs_before = self.parser.reconstruct_regs_at(idx - 1)
-                    before = regs_before.get(use_reg)
+                    before = self.parser.reconstruct_regs_at(idx - 1).get(use_reg)
                 except Exception:
                     before = None
+            after = ev.writes.get(use_reg)
+            if after is None:
+                after = before if before is not None else ev.reads.get(use_reg)
             return before, after, use_reg
         except Exception:
             return None, None, None
 
-    # === 导出（伪C） ===
-    def _on_export_c(self) -> None:
-        if not self.parser:
-            return
-        sel = self.list.selectedItems()
-        indices = [it.data(0, QtCore.Qt.ItemDataRole.UserRole) for it in sel if isinstance(it.data(0, QtCore.Qt.ItemDataRole.UserRole), int)]
-        if not indices:
-            QtWidgets.QMessageBox.information(self, '提示', '请在结果列表中选择若干行再导出')
+    def _prefetch_before(self, reg: str, indices: Iterable[int], skip_cached: bool = False) -> None:
+        """为一批待渲染行预取 reg 的执行前值，供 _fallback_before_after 直接取用。
+
+        只挑 reads/writes 缺值、需要兜底复原的行；升序排好后按间隔切成若干段，
+        每段走一次 parser.iter_reg_states，避免逐行回放。
+        """
+        self._batch_before = None
+        if not reg or self.parser is None:
             return
-        indices.sort()
-        # 收集使用到的寄存器，用于声明
-        used_regs = set()
-        for idx in indices:
-            ev = self.parser.events[idx]
-            used_regs.update(ev.reads.keys())
-            used_regs.update(ev.writes.keys())
-        reg_list = sorted(used_regs, key=lambda x: (x[0], int(x[1:]) if x[1:].isdigit() else 99))
-
-        # 生成伪C代码
-        lines = [
-            '/* 生成自 trace 值流选择（伪C） */',
-            '#include <stdint.h>',
-            '',
-        ]
-        if reg_list:
-            decls = ', '.join(f'uint32_t {r}=0' for r in reg_list)
-            lines.append(f'{decls};')
-            lines.append('')
-        lines.append('void replay(void) {')
-        for i, idx in enumerate(indices, 1):
-            ev = self.parser.events[idx]
-            expr = self._bitop_c_expr(ev.asm)
-            if expr:
-                lines.append(f'    {expr}  // {ev.asm}')
-            else:
-                lines.append(f'    // {ev.asm}')
-        lines.append('}')
+        try:
+            events = self.parser.events
+            cache = self._ctx_row_cache if skip_cached else None
+            need = sorted({i for i in indices
+                           if 0 < i < len(events)
+                           and (cache is None or (i, reg) not in cache)
+                           and (reg not in events[i].reads or reg not in events[i].writes)})
+            if len(need) < 2:
+                return
+            out: Dict[int, Optional[int]] = {}
+            start = 0
+            for k in range(1, len(need) + 1):
+                if k < len(need) and need[k] - need[k - 1] <= _PREFETCH_GAP:
+                    continue
+                run = need[start:k]
+                start = k
+                wanted = set(run)
+                for i, before, _after in self.parser.iter_reg_states(run[0], run[-1] + 1):
+                    if i in wanted:
+                        out[i] = before.get(reg)
+            self._batch_before = (reg.lower(), out)
+        except Exception:
+            self._batch_before = None
 
-        code = '\n'.join(lines)
-        dlg = QtWidgets.QDialog(self)
-        dlg.setWindowTitle('导出伪C代码')
-        lay = QtWidgets.QVBoxLayout(dlg)
-        edit = QtWidgets.QPlainTextEdit()
-        edit.setPlainText(code)
-        edit.setReadOnly(False)
-        lay.addWidget(edit)
-        btns = QtWidgets.QHBoxLayout()
-        btn_copy = QtWidgets.QPushButton('复制到剪贴板')
-        btn_save = QtWidgets.QPushButton('保存为 .c 文件')
-        btn_copy.clicked.connect(lambda: (QtWidgets.QApplication.clipboard().setText(code), QtWidgets.QMessageBox.information(dlg, '已复制', '代码已复制')))
-        def _save():
-            path, _ = QtWidgets.QFileDialog.getSaveFileName(dlg, '保存为 .c', 'replay.c', 'C Files (*.c);;All Files (*)')
-            if path:
-                try:
-                    with open(path, 'w', encoding='utf-8') as f:
-                        f.write(edit.toPlainText())
-                    QtWidgets.QMessageBox.information(dlg, '已保存', f'已保存到\n{path}')
-                except Exception as e:
-                    QtWidgets.QMessageBox.critical(dlg, '保存失败', str(e))
-        btn_save.clicked.connect(_save)
-        btns.addStretch(1)
-        btns.addWidget(btn_copy)
-        btns.addWidget(btn_save)
-        lay.addLayout(btns)
-        dlg.resize(760, 560)
-        dlg.exec()
+    # === 导出（伪C） ===
+    def _on_export_c(self) -> None:
+        self._export_code_via_selection(mode='c')
 
     def _on_export_py(self) -> None:
-        if not self.parser:
-            return
-        sel = self.list.selectedItems()
-        indices = [it.data(0, QtCore.Qt.ItemDataRole.UserRole) for it in sel if isinstance(it.data(0, QtCore.Qt.ItemDataRole.UserRole), int)]
-        if not indices:
-            QtWidgets.QMessageBox.information(self, '提示', '请在结果列表中选择若干行再导出')
-            return
-        indices.sort()
-        # 收集寄存器
-        used_regs = set()
-        for idx in indices:
-            ev = self.parser.events[idx]
-            used_regs.update(ev.reads.keys())
-            used_regs.update(ev.writes.keys())
-        reg_list = sorted(used_regs, key=lambda x: (x[0], int(x[1:]) if x[1:].isdigit() else 99))
-
-        lines = [
-            '# 生成自 trace 值流选择（Python 伪代码）',
-            '',
-            'MASK32 = 0xFFFFFFFF',
-            'def u32(x): return x & MASK32',
-            'def brev32(x):',
-            '    x = ((x >> 1) & 0x55555555) | ((x & 0x55555555) << 1)',
-            '    x = ((x >> 2) & 0x33333333) | ((x & 0x33333333) << 2)',
-            '    x = ((x >> 4) & 0x0f0f0f0f) | ((x & 0x0f0f0f0f) << 4)',
-            '    x = ((x >> 8) & 0x00ff00ff) | ((x & 0x00ff00ff) << 8)',
-            '    return u32((x >> 16) | (x << 16))',
-            'def ror32(x, s): s &= 31; return u32((x >> s) | ((x << ((32 - s) & 31))))',
-            'def rev32(x): return ((x & 0xFF) << 24) | (x & 0xFF00) << 8 | (x >> 8) & 0xFF00 | (x >> 24) & 0xFF',
-            'def rev16(x): return (((x << 8) & 0xFF00FF00) | ((x >> 8) & 0x00FF00FF))',
-            'def revsh(x): import struct; return struct.unpack("<i", struct.pack("<h", (x & 0xFFFF) << 0))[0]',
-            'def clz32(x):return 32 - int(x & MASK32).bit_length() if x & MASK32 else 32',
-            '',
-        ]
-        if reg_list:
-            decls = '='.join([*reg_list, '0'])
-            # 形如: r0=r1=r2=...=0
-            lines.append(decls)
-            lines.append('')
-        lines.append('def replay():')
-        for idx in indices:
-            ev = self.parser.events[idx]
-            stmt = self._bitop_py_stmt(ev.asm)
-            if stmt:
-                lines.append(f'    {stmt}  # {ev.asm}')
-            else:
-                lines.append(f'    # {ev.asm}')
-        code = '\n'.join(lines)
-        dlg = QtWidgets.QDialog(self)
-        dlg.setWindowTitle('导出 Python 伪代码')
-        lay = QtWidgets.QVBoxLayout(dlg)
-        edit = QtWidgets.QPlainTextEdit()
-        edit.setPlainText(code)
-        edit.setReadOnly(False)
-        lay.addWidget(edit)
-        btns = QtWidgets.QHBoxLayout()
-        btn_copy = QtWidgets.QPushButton('复制到剪贴板')
-        btn_save = QtWidgets.QPushButton('保存为 .py 文件')
-        btn_copy.clicked.connect(lambda: (QtWidgets.QApplication.clipboard().setText(edit.toPlainText()), QtWidgets.QMessageBox.information(dlg, '已复制', '代码已复制')))
-        def _save():
-            path, _ = QtWidgets.QFileDialog.getSaveFileName(dlg, '保存为 .py', 'replay.py', 'Python Files (*.py);;All Files (*)')
-            if path:
-                try:
-                    with open(path, 'w', encoding='utf-8') as f:
-                        f.write(edit.toPlainText())
-                    QtWidgets.QMessageBox.information(dlg, '已保存', f'已保存到\n{path}')
-                except Exception as e:
-                    QtWidgets.QMessageBox.critical(dlg, '保存失败', str(e))
-        btn_save.clicked.connect(_save)
-        btns.addStretch(1)
-        btns.addWidget(btn_copy)
-        btns.addWidget(btn_save)
-        lay.addLayout(btns)
-        dlg.resize(760, 560)
-        dlg.exec()
-
-    def _bitop_py_stmt(self, asm: str) -> str:
-        s = asm.strip(); low = s.lower()
-        m = re.match(r"^(\w+)\s+(\w+)\s*,\s*([^,]+)(?:\s*,\s*(.+))?$", low)
-        if not m:
-            if low.startswith('mov '):
-                try:
-                    rest = ' '.join(low.split()[1:])
-                    rd, rn = [x.strip() for x in rest.split(',', 1)]
-                    rn = rn.replace('#', '')
-                    return f"{rd} = u32({rn})"
-                except Exception:
-                    return ''
-            if low.startswith('mvn '):
-                try:
-                    rest = ' '.join(low.split()[1:])
-                    rd, rn = [x.strip() for x in rest.split(',', 1)]
-                    rn = rn.replace('#', '')
-                    return f"{rd} = u32(~{rn})"
-                except Exception:
-                    return ''
-            return ''
-        op, rd, rn, rm = m.group(1), m.group(2), m.group(3), m.group(4)
-        rm = '' if rm is None else rm
-        rd = rd.strip(); rn = rn.strip()
-        # 内联第三参移位
-        def _sh(opname, txt):
-            parts = txt.split(opname)
-            base = parts[0].strip(' ,')
-            sh = parts[1].strip().replace('#','').strip()
-            if opname == 'asr':
-                return f"((({base}) & 0x80000000) and u32(({base}) >> {sh}) or u32(({base}) >> {sh}))"
-            return f"(({base}) { '<<' if opname=='lsl' else '>>' } {sh})"
-        if 'lsl' in rm:
-            rm = _sh('lsl', rm)
-        elif 'lsr' in rm:
-            rm = _sh('lsr', rm)
-        elif 'asr' in rm:
-            rm = _sh('asr', rm)
-        rm_clean = rm.replace('#','').strip() if rm else ''
-
-        # 特殊/单目
-        if op == 'rbit':
-            return f"{rd} = brev32({rn})"
-        if op == 'clz':
-            return f"{rd} = clz32({rn})"
-        if op == 'rev':
-            return f"{rd} = rev32({rn})"
-        if op == 'rev16':
-            return f"{rd} = rev16({rn})"
-        if op == 'revsh':
-            return f"{rd} = revsh({rn})"
-
-        # 位域
-        if op == 'ubfx':
-            try:
-                lsb, width = [x.strip().lstrip('#') for x in rm.split(',')]
-                return f"{rd} = u32(({rn} >> {lsb}) & ((1 << {width}) - 1))"
-            except Exception:
-                return ''
-        if op == 'sbfx':
-            try:
-                lsb, width = [x.strip().lstrip('#') for x in rm.split(',')]
-                return f"{rd} = u32((((({rn}) << (32 - ({lsb} + {width}))) & MASK32) >> (32 - {width})))"
-            except Exception:
-                return ''
-        if op == 'bfc':
-            try:
-                lsb, width = [x.strip().lstrip('#') for x in rm.split(',')]
-                return f"{rd} = u32({rd} & ~(((1 << {width}) - 1) << {lsb}))"
-            except Exception:
-                return ''
-        if op == 'bfi':
-            try:
-                lsb, width = [x.strip().lstrip('#') for x in rm.split(',')]
-                return f"{rd} = u32(({rd} & ~(((1 << {width}) - 1) << {lsb})) | ((({rn}) << {lsb}) & (((1 << {width}) - 1) << {lsb})))"
-            except Exception:
-                return ''
-
-        # 扩展
-        if op == 'uxtb':
-            return f"{rd} = u32({rn} & 0xFF)"
-        if op == 'uxth':
-            return f"{rd} = u32({rn} & 0xFFFF)"
-        if op == 'sxtb':
-            return f"{rd} = u32((({rn}) & 0xFF) if (({rn}) & 0x80)==0 else (0xFFFFFFFF - ((~({rn})+1) & 0xFF)))"
-        if op == 'sxth':
-            return f"{rd} = u32((({rn}) & 0xFFFF) if (({rn}) & 0x8000)==0 else (0xFFFFFFFF - ((~({rn})+1) & 0xFFFF)))"
-        if op == 'sxtah':
-            return f"{rd} = u32({rn} + (({rm_clean}) & 0xFFFF if (({rm_clean}) & 0x8000)==0 else (0xFFFFFFFF - ((~({rm_clean})+1) & 0xFFFF))))"
-
-        # 基本运算
-        if op == 'mvn':
-            return f"{rd} = u32(~{rn})"
-        if op == 'eor':
-            return f"{rd} = u32({rn} ^ {rm_clean})"
-        if op in ('orr', 'or'):
-            return f"{rd} = u32({rn} | {rm_clean})"
-        if op == 'and':
-            return f"{rd} = u32({rn} & {rm_clean})"
-        if op == 'add':
-            return f"{rd} = u32({rn} + {rm_clean})"
-        if op == 'sub':
-            return f"{rd} = u32({rn} - {rm_clean})"
-        if op == 'mov':
-            return f"{rd} = u32({rn})"
-
-        # 纯移位/旋转
-        if op in ('lsl','lsls'):
-            return f"{rd} = u32({rn} << {rm_clean})"
-        if op in ('lsr','lsrs'):
-            return f"{rd} = u32({rn} >> {rm_clean})"
-        if op in ('asr','asrs'):
-            return f"{rd} = u32((({rn} & 0x80000000) and ({rn} >> {rm_clean})) or ({rn} >> {rm_clean}))"
-        if op in ('ror','rors'):
-            return f"{rd} = ror32({rn}, {rm_clean})"
-        return ''
+        self._export_code_via_selection(mode='py')
 
     def _bitop_pseudocode(self, asm: str) -> str:
         """将常见位运算指令转为简要伪代码（尽量提取 rd/rn/rm 与移位）。"""
         s = asm.strip()
         low = s.lower()
-        # 通用三段式解析：op rd, rn, rm/operand2
-        m = None
-        m = re.match(r"^(\w+)\s+(\w+)\s*,\s*([^,]+)(?:\s*,\s*(.+))?$", low)
+        m = _ASM_RE.match(low)
         if not m:
             if low.startswith('mvn'):
                 # mvn rd, rn 亦有两参形式；尽量保留原文
                 return s.replace('mvn', 'rd := ~rn')
             return ''
-        op, rd, rn, rm = m.group(1), m.group(2), m.group(3), m.group(4)
+        op, rd, rn, rm = m.groups()
         if rm is None:
             rm = ''
-        # 处理移位
-        sh = ''
-        if 'lsl' in rm:
-            parts = rm.split('lsl')
-            rm = parts[0].strip(' ,')
-            sh = parts[1].strip()
-            rm = f"({rm} << {sh})"
-        elif 'lsr' in rm:
-            parts = rm.split('lsr')
-            rm = parts[0].strip(' ,')
-            sh = parts[1].strip()
-            rm = f"({rm} >> {sh})"
+        # 处理移位（仅 lsl/lsr）
+        sh = _split_shift(rm)
+        if sh is not None and sh[0] != 'asr':
+            name, base, amount = sh
+            rm = f"({base} {'<<' if name == 'lsl' else '>>'} {amount})"
         rn = rn.strip()
         rm = rm.strip()
         if op == 'mvn':
             return f"{rd} := ~{rn}"
-        if op == 'eor':
-            return f"{rd} := {rn} ^ {rm}"
-        if op == 'orr':
-            return f"{rd} := {rn} | {rm}"
-        if op == 'and':
-            return f"{rd} := {rn} & {rm}"
-        if op == 'add':
-            return f"{rd} := {rn} + {rm}"
-        if op == 'sub':
-            return f"{rd} := {rn} - {rm}"
-        if op in ('lsl', 'lsr'):
-            return f"{rd} := {rn} {op} {rm}"
-        return ''
+        sym = _PSEUDO_OP_TABLE.get(op)
+        return f"{rd} := {rn} {sym} {rm}" if sym else ''
 
-    def _bitop_c_expr(self, asm: str) -> str:
-        """将常见 ARM32/ARM64/Thumb 位运算与简单算术转为 C 表达式（末尾分号）。
-        覆盖：and/or/eor/mov/mvn/add/sub/lsl/lsr/lsrs/asr/ror/ubfx/sbfx/bfc/bfi/rbit/clz/rev/rev16/revsh/
-        uxtb/uxth/sxtb/sxth/sxtah 等常见形式。未覆盖的返回注释行。
-        """
-        s = asm.strip()
-        low = s.lower()
-        m = re.match(r"^(\w+)\s+(\w+)\s*,\s*([^,]+)(?:\s*,\s*(.+))?$", low)
-        if not m:
-            # 两参形式：mov/mvn/单目
-            if low.startswith('mov '):
-                try:
-                    parts = low.split()
-                    rest = ' '.join(parts[1:])
-                    rd, rn = [x.strip() for x in rest.split(',', 1)]
-                    rn = rn.replace('#', '')
-                    return f"{rd} = {rn};"
-                except Exception:
-                    return ''
-            if low.startswith('mvn '):
-                try:
-                    parts = low.split()
-                    rest = ' '.join(parts[1:])
-                    rd, rn = [x.strip() for x in rest.split(',', 1)]
-                    rn = rn.replace('#', '')
-                    return f"{rd} = ~{rn};"
-                except Exception:
-                    return ''
-            # rbit/clz/rev* 两参也可能以此分支进入
-            return ''
-        op, rd, rn, rm = m.group(1), m.group(2), m.group(3), m.group(4)
-        rm = '' if rm is None else rm
-        opb = op.rstrip('s')  # 兼容 lsrs/asrs 等
-        rd = rd.strip()
-        rn = rn.strip()
 
-        # 若第三参自带移位（如 ip, lsr #20），先内联为 C 表达式
-        if 'lsl' in rm:
-            parts = rm.split('lsl')
-            base = parts[0].strip(' ,')
-            sh = parts[1].strip()
-            rm = f"({base} << {sh.replace('#','').strip()})"
-        elif 'lsr' in rm:
-            parts = rm.split('lsr')
-            base = parts[0].strip(' ,')
-            sh = parts[1].strip()
-            rm = f"({base} >> {sh.replace('#','').strip()})"
-        elif 'asr' in rm:
-            parts = rm.split('asr')
-            base = parts[0].strip(' ,')
-            sh = parts[1].strip()
-            rm = f"((int32_t){base} >> {sh.replace('#','').strip()})"
-        rm_clean = rm.strip().replace('#', '')
-
-        # 单目/特殊
-        if op == 'rbit':
-            return f"{rd} = __builtin_bitreverse32({rn});"
-        if op == 'clz':
-            return f"{rd} = __builtin_clz({rn});"
-        if op == 'rev':
-            return f"{rd} = __builtin_bswap32({rn});"
-        if op == 'rev16':
-            return f"{rd} = ((({rn} << 8) & 0xFF00FF00u) | (({rn} >> 8) & 0x00FF00FFu));"
-        if op == 'revsh':
-            return f"{rd} = (int32_t)(int16_t)__builtin_bswap16((uint16_t){rn});"
-
-        # 位域
-        if op == 'ubfx':
-            try:
-                lsb, width = [x.strip().lstrip('#') for x in rm.split(',')]
-                return f"{rd} = (({rn} >> {lsb}) & ((1u << {width}) - 1));"
-            except Exception:
-                return ''
-        if op == 'sbfx':
-            try:
-                lsb, width = [x.strip().lstrip('#') for x in rm.split(',')]
-                return f"{rd} = ((int32_t)({rn} << (32 - ({lsb} + {width}))) >> (32 - {width}));"
-            except Exception:
-                return ''
-        if op == 'bfc':
-            try:
-                lsb, width = [x.strip().lstrip('#') for x in rm.split(',')]
-                return f"{rd} &= ~(((1u << {width}) - 1) << {lsb});"
-            except Exception:
-                return ''
-        if op == 'bfi':
-            try:
-                # 语法：bfi rd, rn, #lsb, #width
-                lsb, width = [x.strip().lstrip('#') for x in rm.split(',')]
-                return f"{{ uint32_t __mask = ((1u << {width}) - 1) << {lsb}; {rd} = ({rd} & ~__mask) | ((({rn}) << {lsb}) & __mask); }}"
-            except Exception:
-                return ''
-
-        # 扩展/带加
-        if op == 'uxtb':
-            return f"{rd} = (uint32_t)(({rn}) & 0xFF);"
-        if op == 'uxth':
-            return f"{rd} = (uint32_t)(({rn}) & 0xFFFF);"
-        if op == 'sxtb':
-            return f"{rd} = (int32_t)(int8_t)({rn} & 0xFF);"
-        if op == 'sxth':
-            return f"{rd} = (int32_t)(int16_t)({rn} & 0xFFFF);"
-        if op == 'sxtah':
-            # rd = rn + SignExtend16(rm)
-            return f"{rd} = {rn} + (int32_t)(int16_t)({rm_clean} & 0xFFFF);"
-
-        # 基本运算
-        if op == 'mvn':
-            return f"{rd} = ~{rn};"
-        if op == 'eor':
-            return f"{rd} = {rn} ^ {rm_clean};"
-        if op in ('orr', 'or'):  # 兼容解析
-            return f"{rd} = {rn} | {rm_clean};"
-        if op == 'and':
-            return f"{rd} = {rn} & {rm_clean};"
-        if op == 'add':
-            return f"{rd} = {rn} + {rm_clean};"
-        if op == 'sub':
-            return f"{rd} = {rn} - {rm_clean};"
-        if op == 'mov':
-            return f"{rd} = {rn};"
-
-        # 纯移位类（rd, rn, sh）
-        if opb == 'lsl':
-            return f"{rd} = {rn} << {rm_clean};"
-        if opb == 'lsr':
-            return f"{rd} = {rn} >> {rm_clean};"
-        if opb == 'asr':
-            return f"{rd} = ((int32_t){rn}) >> {rm_clean};"
-        if opb == 'ror':
-            return f"{rd} = ({rn} >> ({rm_clean} & 31)) | ({rn} << ((32 - ({rm_clean} & 31)) & 31));"
+class _ConfluenceDelegate(QtWidgets.QStyledItemDelegate):
+    """结果列表委托：第 0 列带汇合点标记的行整行使用共享的高亮画刷。"""
 
-        return ''
+    def initStyleOption(self, option, index) -> None:
+        super().initStyleOption(option, index)
+        if index.siblingAtColumn(0).data(_CONFLUENCE_ROLE):
+            option.backgroundBrush = _CONFLUENCE_BG
+            option.palette.setBrush(QtGui.QPalette.ColorRole.Text, _CONFLUENCE_FG)
+
+
+class CandidateModel(QtCore.QAbstractTableModel):
+    """追踪起点候选列表模型：按需格式化可见行，寄存器读取列带 LRU 缓存。"""
+
+    _HEADERS = ('行号', '时间戳', 'PC', '指令', '寄存器读取')
+
+    def __init__(self, candidates: List[Tuple[int, 'TraceEvent']], parent=None) -> None:
+        super().__init__(parent)
+        self._rows = candidates
+        self._regs_cache: "OrderedDict[int, str]" = OrderedDict()
+        self._regs_cache_cap = 2048
+
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._HEADERS)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if orientation == QtCore.Qt.Orientation.Horizontal and role == QtCore.Qt.ItemDataRole.DisplayRole:
+            if 0 <= section < len(self._HEADERS):
+                return self._HEADERS[section]
+        return None
+
+    def event_index(self, row: int) -> int:
+        return self._rows[row][0]
+
+    def data(self, index, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        idx, ev = self._rows[row]
+        if role == QtCore.Qt.ItemDataRole.UserRole:
+            return idx
+        if role != QtCore.Qt.ItemDataRole.DisplayRole:
+            return None
+        col = index.column()
+        if col == 0:
+            return str(ev.line_no)
+        if col == 1:
+            return f"[{ev.timestamp}]"
+        if col == 2:
+            return f"0x{ev.pc:08x}"
+        if col == 3:
+            return ev.asm
+        if col == 4:
+            return self._regs_str(row, ev)
+        return None
+
+    def _regs_str(self, row: int, ev: 'TraceEvent') -> str:
+        # 构建寄存器读取信息（显示所有读取的寄存器）
+        cached = self._regs_cache.get(row)
+        if cached is not None:
+            self._regs_cache.move_to_end(row)
+            return cached
+        regs_str = ' '.join(f"{r}=0x{v:x}" for r, v in sorted(ev.reads.items())) or '(无)'
+        self._regs_cache[row] = regs_str
+        if len(self._regs_cache) > self._regs_cache_cap:
+            self._regs_cache.popitem(last=False)
+        return regs_str
 
 
 class ChainWorker(QtCore.QThread):
+    """值链构建线程。
+
+    保持 QThread 而不进线程池：主窗口与面板在发起新请求前都要中断并等待（主窗口超时还会 terminate）
+    上一次构建结束，保证同一 parser 上的构链不会并发执行；线程池任务无法被这样等待或终止。"""
+
     finishedWithId = QtCore.pyqtSignal(list, str, int)
 
     def __init__(self, parser, reg: str, start_idx: int, match_val: int, side: str, req_id: int) -> None:
@@ -2077,16 +1991,25 @@ class ChainWorker(QtCore.QThread):
         self.finishedWithId.emit(sorted(set(indices)), self._reg, self._req_id)
 
 
-class _CodeGenWorker(QtCore.QThread):
-    finishedWithCode = QtCore.pyqtSignal(str, str)
+class _CodeGenSignals(QtCore.QObject):
+    finishedWithCode = QtCore.pyqtSignal(str, str, int)  # (code, mode, req_id)
+
 
-    def __init__(self, dock, indices: list, mode: str) -> None:
-        super().__init__(dock)
+class _CodeGenWorker(PoolTask):
+    """大选择导出代码任务：提交到全局线程池，过期请求由 is_current 回调判定并丢弃结果。"""
+
+    _signals_cls = _CodeGenSignals
+
+    def __init__(self, dock, indices: list, mode: str, req_id: int, is_current=None) -> None:
+        super().__init__(req_id, is_current)
+        self.finishedWithCode = self.signals.finishedWithCode
         self._dock = dock
         self._indices = list(indices)
         self._mode = mode
 
     def run(self) -> None:
+        if self._stale():
+            return
         try:
             if self._mode == 'c':
                 code = self._dock._gen_c_code(self._indices)
@@ -2094,11 +2017,16 @@ class _CodeGenWorker(QtCore.QThread):
                 code = self._dock._gen_py_code(self._indices)
         except Exception:
             code = ''
-        if not self.isInterruptionRequested():
-            self.finishedWithCode.emit(code, self._mode)
+        if not self._stale():
+            self.finishedWithCode.emit(code, self._mode, self._req_id)
 
 
 class TaintWorker(QtCore.QThread):
+    """前向污点分析线程（Enhanced/Advanced 变体同样如此）。
+
+    单次分析通常持续数秒，线程创建开销可以忽略；三种污点任务共用面板上的一个 _taint_worker 槽位，
+    新请求经 _stop_worker 中断并等待旧任务，避免两次重分析同时占用同一 parser，因此不改为线程池任务。"""
+
     finishedWithHits = QtCore.pyqtSignal(list)
 
     def __init__(self, parser, start_idx: int, regs: List[str], mem_addrs: List[int], same_call: bool) -> None:
@@ -2165,55 +2093,73 @@ class EnhancedTaintWorker(QtCore.QThread):
                     self.finishedWithEnhancedResults.emit(results)
                 return
             
-            base_call = self._parser.events[self._start_idx].call_id
+            events = self._parser.events
+            base_call = events[self._start_idx].call_id
             propagation_count = 0
+            end = min(n, self._start_idx + 200000)
+            op_class = _enh_op_classes(self._parser, end)
+            # 分析器的寄存器污点表（键为小写寄存器名，值非空），用于整组判断是否需要传播
+            reg_taints = analyzer.reg_taints
+            any_tainted = analyzer.any_reg_tainted
+            # 循环内的方法/属性预先绑定为局部变量
+            interrupted = self.isInterruptionRequested
+            same_call = self._same_call
+            reg_to_reg = analyzer.propagate_reg_to_reg
+            mem_to_reg = analyzer.propagate_mem_to_reg
+            reg_to_mem = analyzer.propagate_reg_to_mem
+            implicit_flow = analyzer.propagate_implicit_flow
+            add_hit = hits.append
             
-            for i in range(self._start_idx, min(n, self._start_idx + 200000)):
-                if self.isInterruptionRequested():
+            for i in range(self._start_idx, end):
+                if interrupted():
                     break
                 
-                event = self._parser.events[i]
+                event = events[i]
                 
                 # 同调用限制
-                if self._same_call and getattr(event, 'call_id', 0) != base_call:
+                if same_call and getattr(event, 'call_id', 0) != base_call:
                     continue
                 
-                asm = event.asm.lower()
+                kind = op_class[i]
+                if kind == _ENH_OTHER:
+                    continue
                 propagated = False
                 
                 # 算术/逻辑运算
-                if any(asm.startswith(op) for op in ['add ', 'sub ', 'and ', 'orr ', 'eor ', 'mov ', 'mul ']):
-                    src_regs = list(event.reads.keys())
-                    dst_regs = list(event.writes.keys())
+                if kind == _ENH_ARITH:
+                    src_regs = event.reads_keys
+                    dst_regs = event.writes_keys
                     if dst_regs:
                         dst = dst_regs[0]
-                        is_partial = 'movk' in asm
-                        propagated = analyzer.propagate_reg_to_reg(i, src_regs, dst, is_partial)
+                        # 源与目标都干净时传播什么也不改，直接跳过
+                        if dst in reg_taints or any_tainted(src_regs):
+                            is_partial = 'movk' in event.asm.lower()
+                            propagated = reg_to_reg(i, src_regs, dst, is_partial)
                 
                 # 加载指令
-                elif asm.startswith('ldr'):
+                elif kind == _ENH_LOAD:
                     if event.effaddr is not None and event.writes:
-                        dst_reg = list(event.writes.keys())[0]
+                        dst_reg = event.writes_keys[0]
                         mem_size = getattr(event, 'mem_width', 4) or 4
-                        propagated = analyzer.propagate_mem_to_reg(i, event.effaddr, mem_size, dst_reg)
+                        propagated = mem_to_reg(i, event.effaddr, mem_size, dst_reg)
                 
                 # 存储指令
-                elif asm.startswith('str'):
+                elif kind == _ENH_STORE:
                     if event.effaddr is not None and event.reads:
-                        src_reg = list(event.reads.keys())[0]
+                        src_reg = event.reads_keys[0]
                         mem_size = getattr(event, 'mem_width', 4) or 4
-                        propagated = analyzer.propagate_reg_to_mem(i, src_reg, event.effaddr, mem_size)
+                        propagated = reg_to_mem(i, src_reg, event.effaddr, mem_size)
                 
                 # 条件分支（隐式流）
-                elif any(asm.startswith(op) for op in ['cmp ', 'tst ', 'b.eq', 'b.ne', 'beq', 'bne']):
-                    cond_regs = list(event.reads.keys())
-                    analyzer.propagate_implicit_flow(i, cond_regs)
-                    # 检查是否受隐式污点影响
-                    if any(analyzer.is_reg_tainted(r) for r in cond_regs):
+                elif kind == _ENH_COND:
+                    cond_regs = event.reads_keys
+                    # 条件寄存器全部干净时隐式流不产生标签，也不算命中
+                    if any_tainted(cond_regs):
+                        implicit_flow(i, cond_regs)
                         propagated = True
                 
                 if propagated:
-                    hits.append(i)
+                    add_hit(i)
                     propagation_count += 1
             
             # 获取汇合点
@@ -2263,7 +2209,8 @@ class AdvancedTaintWorker(QtCore.QThread):
                 self._same_call, 
                 max_steps=200000,
                 enable_memory_taint=self._enable_mem_taint,
-                track_constants=self._track_constants
+                track_constants=self._track_constants,
+                should_stop=self.isInterruptionRequested
             )
         except Exception:
             results = {"hits": [], "taint_path": [], "statistics": {}, "target_reached": False}
@@ -2272,39 +2219,65 @@ class AdvancedTaintWorker(QtCore.QThread):
 
 
 
-class _ProvenanceWorker(QtCore.QThread):
+class _ProvenanceSignals(QtCore.QObject):
     finishedWithPath = QtCore.pyqtSignal(list, list, str)
 
-    def __init__(self, parser, reg: str, start_idx: int, side: str) -> None:
-        super().__init__()
+
+class _ProvenanceWorker(PoolTask):
+    """溯源任务：提交到全局线程池调用 parser.build_provenance_graph。
+
+    过期请求由 is_current 回调判定：构图过程中逐节点检查，过期即提前结束且不发结果。
+    """
+
+    _signals_cls = _ProvenanceSignals
+
+    def __init__(self, parser, reg: str, start_idx: int, side: str, req_id: int = 0,
+                 is_current=None) -> None:
+        super().__init__(req_id, is_current)
+        self.finishedWithPath = self.signals.finishedWithPath
         self._parser = parser
         self._reg = (reg or '').lower()
         self._idx = int(start_idx)
         self._side = side
 
     def run(self) -> None:
+        if self._stale():
+            return
         try:
-            nodes, edges = self._parser.build_provenance_graph(self._reg, self._idx, self._side, max_nodes=5000)
+            nodes, edges = self._parser.build_provenance_graph(self._reg, self._idx, self._side, max_nodes=5000,
+                                                               should_stop=self._stale)
         except Exception:
             nodes, edges = [], []
-        if not self.isInterruptionRequested():
+        if not self._stale():
             self.finishedWithPath.emit(nodes, edges, self._reg)
 
 
-class BackwardTaintWorker(QtCore.QThread):
-    """反向污点分析Worker：异步调用parser.taint_backward"""
+class _BackwardTaskSignals(QtCore.QObject):
     finishedWithBackwardResults = QtCore.pyqtSignal(list, str, int)  # (hits, reg, req_id)
 
-    def __init__(self, parser, reg: str, start_idx: int, value: int, same_call: bool, req_id: int) -> None:
-        super().__init__()
+
+class BackwardTaintWorker(PoolTask):
+    """反向污点分析任务：提交到全局线程池异步调用 parser.taint_backward。
+
+    线程由 QThreadPool 复用，不再每次请求新建 QThread；过期请求由 is_current 回调判定，
+    开始前与完成后各检查一次，过期则不发结果。
+    """
+
+    _signals_cls = _BackwardTaskSignals
+
+    def __init__(self, parser, reg: str, start_idx: int, value: int, same_call: bool, req_id: int,
+                 is_current=None) -> None:
+        super().__init__(req_id, is_current)
+        self.finishedWithBackwardResults = self.signals.finishedWithBackwardResults
         self._parser = parser
         self._reg = (reg or '').lower()
         self._start_idx = int(start_idx)
         self._value = int(value)
         self._same_call = same_call
-        self._req_id = req_id
 
     def run(self) -> None:
+        if self._stale():
+            return
         try:
             # 调用反向污点分析
             hits = self._parser.taint_backward(
@@ -2313,11 +2286,11 @@ class BackwardTaintWorker(QtCore.QThread):
                 self._value,
                 same_call_only=self._same_call,
                 max_steps=100000,
-                enable_memory_taint=True
+                enable_memory_taint=True,
+                should_stop=self._stale
             )
         except Exception:
             hits = []
         
-        if not self.isInterruptionRequested():
+        if not self._stale():
             self.finishedWithBackwardResults.emit(hits, self._reg, self._req_id)
-
@@ -1,24 +1,79 @@
+import os
+import time
+
 from PyQt6 import QtCore
 
+# 支持包内导入与脚本直接运行两种方式（主窗口启动时已加载解析器模块，这里不增加额外开销）
+try:
+    from .trace_parser import TraceParser
+except Exception:
+    from trace_parser import TraceParser  # type: ignore
+
+# ParserWorker 进度信号的最小发送间隔（秒）
+_PROGRESS_INTERVAL = 0.05
+# 寄存器快照间隔：按文件大小每 MB 约 10 行，限制在该范围内；取不到大小时用默认值
+_CHECKPOINT_INTERVAL_MIN = 500
+_CHECKPOINT_INTERVAL_MAX = 5000
+_CHECKPOINT_INTERVAL_DEFAULT = 2000
+
+
+def _checkpoint_interval_for(path: str) -> int:
+    """小 trace 用更密的快照换更短的复原回放；大 trace 放宽间隔，控制快照占用的内存。"""
+    try:
+        size_mb = os.path.getsize(path) >> 20
+    except OSError:
+        return _CHECKPOINT_INTERVAL_DEFAULT
+    return max(_CHECKPOINT_INTERVAL_MIN, min(_CHECKPOINT_INTERVAL_MAX, size_mb * 10))
+
+
+class PoolTask(QtCore.QRunnable):
+    """提交到全局线程池的请求任务基类：持有请求号、is_current 回调与信号对象。
+
+    子类通过 _signals_cls 指定信号类；信号对象在构造时（主线程）创建，跨线程 emit 自动走队列连接。
+    新请求使旧请求号过期，子类在开始前、耗时循环中（作为 should_stop）与发信号前调用 _stale()。"""
+
+    _signals_cls = QtCore.QObject
+
+    def __init__(self, req_id: int = 0, is_current=None) -> None:
+        super().__init__()
+        self.signals = self._signals_cls()
+        self._req_id = req_id
+        self._is_current = is_current
+
+    def _stale(self) -> bool:
+        try:
+            return self._is_current is not None and not self._is_current(self._req_id)
+        except Exception:
+            return False
+
+
+class _RegsSignals(QtCore.QObject):
+    finishedWithIndex = QtCore.pyqtSignal(dict, dict, int, int)  # (before, after, ev_idx, req_id)
+
+
+class RegsWorker(PoolTask):
+    """后台复原寄存器，防止 UI 卡顿。
 
-class RegsWorker(QtCore.QThread):
-    """后台复原寄存器，防止 UI 卡顿。"""
+    提交到全局线程池执行，频繁跳转时复用池中线程而不是每次新建 QThread。
+    结果附带 req_id；is_current 回调判定请求已过期时不再复原或发信号。"""
 
-    finishedWithIndex = QtCore.pyqtSignal(dict, dict, int)
+    _signals_cls = _RegsSignals
 
-    def __init__(self, parser: 'TraceParser', ev_idx: int, parent=None) -> None:
-        super().__init__(parent)
+    def __init__(self, parser: 'TraceParser', ev_idx: int, req_id: int = 0, is_current=None) -> None:
+        super().__init__(req_id, is_current)
+        self.finishedWithIndex = self.signals.finishedWithIndex
         self._parser = parser
         self._ev_idx = ev_idx
 
     def run(self) -> None:
+        if self._stale():
+            return
         try:
-            before = self._parser.reconstruct_regs_at(self._ev_idx - 1) if self._ev_idx > 0 else {}
-            after = self._parser.reconstruct_regs_at(self._ev_idx)
+            before, after = self._parser.reconstruct_regs_pair_at(self._ev_idx)
         except Exception:
             before, after = {}, {}
-        if not self.isInterruptionRequested():
-            self.finishedWithIndex.emit(before, after, self._ev_idx)
+        if not self._stale():
+            self.finishedWithIndex.emit(before, after, self._ev_idx, self._req_id)
 
 
 class ParserWorker(QtCore.QThread):
@@ -26,29 +81,40 @@ class ParserWorker(QtCore.QThread):
 
     finished = QtCore.pyqtSignal(object, str)
     progress = QtCore.pyqtSignal(int)
+    # (区段名, 首事件索引, 末事件索引)：每解析完一段事件报告一次
+    sectionReady = QtCore.pyqtSignal(str, int, int)
 
     def __init__(self, path: str) -> None:
         super().__init__()
         self._path = path
 
     def run(self) -> None:
-        # 局部导入避免主线程启动开销
-        try:
-            from .trace_parser import TraceParser  # type: ignore
-        except Exception:
-            from trace_parser import TraceParser  # type: ignore
-        parser = TraceParser(checkpoint_interval=2000)
+        parser = TraceParser(checkpoint_interval=_checkpoint_interval_for(self._path))
         
         # 定义安全的进度回调（捕获所有异常）
+        # 按时间节流：相同百分比不重复发，两次发送至少间隔 _PROGRESS_INTERVAL 秒，100% 总是发出
+        last_p = -1
+        last_ts = 0.0
+
         def safe_progress_cb(p: int) -> None:
+            nonlocal last_p, last_ts
             try:
-                if not self.isInterruptionRequested():
-                    self.progress.emit(p)
+                if p == last_p or self.isInterruptionRequested():
+                    return
+                now = time.monotonic()
+                if p < 100 and now - last_ts < _PROGRESS_INTERVAL:
+                    return
+                last_p, last_ts = p, now
+                self.progress.emit(p)
             except Exception:
                 pass  # 静默忽略进度报告错误
         
+        def section_cb(first: int, last: int) -> None:
+            if not self.isInterruptionRequested():
+                self.sectionReady.emit('events', first, last)
+
         try:
-            parser.parse_file(self._path, progress_cb=safe_progress_cb)
+            parser.parse_file(self._path, progress_cb=safe_progress_cb, section_cb=section_cb)
         except Exception as e:
             # 解析失败时也尝试emit进度100%（表示结束）
             import traceback